@@ -1,16 +1,45 @@
 # app.py (top portion unchanged)
+from config.settings import SERVER_MODE
+
+# Greenlet serving: patch blocking stdlib I/O and hook gRPC into the gevent hub before anything else loads
+if SERVER_MODE == "gevent":
+    try:
+        from gevent import monkey
+        monkey.patch_all()
+    except ImportError as e:
+        print("[SERVER] gevent not installed, falling back to threading:", e)
+        SERVER_MODE = "threading"
+    else:
+        try:
+            import grpc.experimental.gevent as grpc_gevent
+            grpc_gevent.init_gevent()
+        except ImportError as e:
+            print("[SERVER] grpc gevent support unavailable; STT/TTS calls will block the hub:", e)
+
 import os
 import sys
 import socket
-from flask import Flask, send_from_directory
+from flask import Flask, send_from_directory, abort, jsonify
 from flask_cors import CORS
 
 # add socketio
-from flask_socketio import SocketIO
+from extensions import socketio
 
-from routes.interview_routes import interview_bp
+from routes.interview_routes import interview_bp, recover_session
 from routes.coding_routes import coding_bp
 from routes.debug_routes import debug_bp
+from routes.history_routes import history_bp
+from routes.health_routes import health_bp
+from services import clients
+from services.static_assets import assets
+from services import socket_broker
+from services.health_service import health_monitor
+from services.transcript_journal import transcript_journal
+from models.interview_state import interview_state
+from config.settings import (
+    WARMUP_CLIENTS, STATIC_FINGERPRINT, ASSET_EXPORT_DIR, HEALTH_PROBES, MAX_REQUEST_MB, TRANSCRIPT_JOURNAL,
+    JOURNAL_RECOVER_HOURS,
+)
 # after registering blueprints, import websocket routes to register handlers
 # ensure this import is after socketio is created if you prefer; here it's fine
 import routes.ws_routes  # registers socketio handlers
@@ -20,36 +49,81 @@ import routes.ws_routes  # registers socketio handlers
 app = Flask(__name__, static_url_path="", static_folder="static")
 CORS(app)
 app.config["SEND_FILE_MAX_AGE_DEFAULT"] = 0
+# Werkzeug refuses larger bodies from Content-Length (or while streaming) instead of buffering them
+app.config["MAX_CONTENT_LENGTH"] = int(MAX_REQUEST_MB * 1024 * 1024)
+
+@app.errorhandler(413)
+def request_too_large(e):
+    return jsonify({"ok": False, "stage": "upload", "error": f"Request too large (max {MAX_REQUEST_MB:g} MB)"}), 413
 
 # Register blueprints
 app.register_blueprint(interview_bp)
 app.register_blueprint(coding_bp)
 app.register_blueprint(debug_bp)
+app.register_blueprint(history_bp)
+app.register_blueprint(health_bp)
 
 # --- SocketIO setup ---
-# Use message_queue/async_mode settings for production as needed.
-# For local dev, eventlet works fine if installed.
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode="threading")
+# SERVER_MODE=gevent serves each request/socket on a greenlet instead of an OS thread.
+# SOCKETIO_MESSAGE_QUEUE fans emits out through a broker so any process can reach any room.
+socketio.init_app(app, cors_allowed_origins="*", async_mode=SERVER_MODE, **socket_broker.init_options())
+
+# Provider SDKs/clients load lazily; warm them in parallel without blocking startup
+if WARMUP_CLIENTS == "1":
+    clients.warmup_async()
+
+# Provider probes run on their own schedule; /readyz only reads their results
+if HEALTH_PROBES == "1":
+    health_monitor.start()
+
+# Journal turns off the request path; pick up an interview a restart interrupted
+if TRANSCRIPT_JOURNAL == "1":
+    interview_state.journal = transcript_journal
+    pruned = transcript_journal.prune(JOURNAL_RECOVER_HOURS * 3600)
+    if pruned:
+        print(f"[JOURNAL] pruned {pruned} finished or stale session(s)")
+    transcript_journal.start()
+    recover_session()
+
+# Content-hashed, precompressed copies of static/; the original paths keep working
+if STATIC_FINGERPRINT == "1":
+    assets.build()
+    if ASSET_EXPORT_DIR:
+        assets.export(ASSET_EXPORT_DIR)
+
+def _page(name):
+    if STATIC_FINGERPRINT == "1":
+        resp = assets.respond(name)
+        if resp is not None:
+            return resp
+    return send_from_directory("static", name)
+
+@app.route("/assets/<path:name>")
+def fingerprinted_asset(name):
+    resp = assets.respond("/assets/" + name)
+    if resp is None:
+        abort(404)
+    return resp
 
 @app.route("/")
 def root():
-    return send_from_directory("static", "home.html")
+    return _page("home.html")
 
 @app.route("/setup")
 def setup_page():
-    return send_from_directory("static", "setup.html")
+    return _page("setup.html")
 
 @app.route("/interview")
 def interview_page():
-    return send_from_directory("static", "interview.html")
+    return _page("interview.html")
 
 @app.route("/results")
 def results_page():
-    return send_from_directory("static", "results.html")
+    return _page("results.html")
 
 @app.route("/permissions")
 def permissions_page():
-    return send_from_directory("static", "permissions.html")
+    return _page("permissions.html")
 
 
 if __name__ == "__main__":
@@ -86,4 +160,7 @@ if __name__ == "__main__":
         return base
 
     port = _pick_port(8000)
-    socketio.run(app, host="0.0.0.0", port=port, debug=False)
+    # Current Flask-SocketIO refuses the Werkzeug server in threading mode without this opt-in;
+    # other modes forward unknown kwargs to their own server (gevent would take it as an SSL option)
+    run_opts = {"allow_unsafe_werkzeug": True} if SERVER_MODE == "threading" else {}
+    socketio.run(app, host="0.0.0.0", port=port, debug=False, **run_opts)
@@ -11,20 +11,115 @@ if env_path.exists():
 PROJECT_ID = os.getenv("GOOGLE_CLOUD_PROJECT", "aids-476019")
 LOCATION = os.getenv("GOOGLE_CLOUD_LOCATION", "us-central1")
 GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.5-flash-lite")
+GEMINI_FEEDBACK_MODEL = os.getenv("GEMINI_FEEDBACK_MODEL", GEMINI_MODEL)
 USE_VERTEX = os.getenv("USE_VERTEX_AI", "0")
+GENAI_PROVIDER = os.getenv("GENAI_PROVIDER", "google")  # "local": deterministic stand-in, no network
+LOCAL_MODEL_LATENCY_MS = int(os.getenv("LOCAL_MODEL_LATENCY_MS", "50"))  # simulated per-call latency
+SPEECH_PROVIDER = os.getenv("SPEECH_PROVIDER", "google")  # "local": canned STT / silent TTS, no network
+LOCAL_SPEECH_LATENCY_MS = int(os.getenv("LOCAL_SPEECH_LATENCY_MS", "150"))  # simulated per-call STT/TTS latency
 
 # Speech Configuration
 LANG_STT = "en-IN"
 LANG_TTS = os.getenv("GOOGLE_TTS_LANGUAGE", "en-US")
 VOICE_NAME = os.getenv("VOICE_NAME", "en-US-Studio-Q")
+TTS_AUDIO_FORMAT = os.getenv("TTS_AUDIO_FORMAT", "mp3")  # used when the client advertises nothing it plays: "mp3" or "opus"
+TTS_OPUS_SAMPLE_RATE = int(os.getenv("TTS_OPUS_SAMPLE_RATE", "24000"))  # Hz; 0 = voice default
+TTS_MP3_SAMPLE_RATE = int(os.getenv("TTS_MP3_SAMPLE_RATE", "0"))
+
+# Upload Limits
+MAX_REQUEST_MB = float(os.getenv("MAX_REQUEST_MB", "16"))  # any request body; larger Content-Length gets 413 before reading
+MAX_AUDIO_UPLOAD_MB = float(os.getenv("MAX_AUDIO_UPLOAD_MB", "6"))  # one voice_turn recording
+
+# Serving Configuration
+SERVER_MODE = os.getenv("SERVER_MODE", "threading")  # "gevent": greenlet per request/socket (pip install gevent gevent-websocket)
+SOCKETIO_MESSAGE_QUEUE = os.getenv("SOCKETIO_MESSAGE_QUEUE", "")  # "" in-process; "redis://host:6379/0"; "sqlite:///path/socketio.db"
+SOCKETIO_POLL_MS = int(os.getenv("SOCKETIO_POLL_MS", "50"))  # sqlite broker poll interval
+
+# Startup Configuration
+WARMUP_CLIENTS = os.getenv("WARMUP_CLIENTS", "1")  # "1": build provider clients in the background at startup
+CLIENT_KEEPALIVE_SEC = int(os.getenv("CLIENT_KEEPALIVE_SEC", "60"))  # ping idle connections this often; 0 = off
+GRPC_KEEPALIVE_MS = int(os.getenv("GRPC_KEEPALIVE_MS", "60000"))  # HTTP/2 keepalive ping interval on STT/TTS channels
+CLIENT_CONNECT_TIMEOUT_SEC = float(os.getenv("CLIENT_CONNECT_TIMEOUT_SEC", "5"))
+
+# Static Assets
+STATIC_FINGERPRINT = os.getenv("STATIC_FINGERPRINT", "1")  # "1": hashed, precompressed, immutable /assets/ URLs
+ASSET_EXPORT_DIR = os.getenv("ASSET_EXPORT_DIR", "")  # also write them here for a proxy/CDN to serve
 
 # Coding Window Configuration
 CODING_EXPIRES_AFTER_SEC = 5 * 60  # 5 minutes
+CODE_EVAL_WORKERS = int(os.getenv("CODE_EVAL_WORKERS", "4"))  # concurrent sandboxed runs
+CODE_EVAL_CPU_SEC = int(os.getenv("CODE_EVAL_CPU_SEC", "2"))
+CODE_EVAL_MEM_MB = int(os.getenv("CODE_EVAL_MEM_MB", "256"))
+CODE_EVAL_WALL_SEC = float(os.getenv("CODE_EVAL_WALL_SEC", "5"))
+CODE_EVAL_MAX_TESTS = int(os.getenv("CODE_EVAL_MAX_TESTS", "10"))
+CODE_EVAL_WAIT_SEC = float(os.getenv("CODE_EVAL_WAIT_SEC", "0"))  # max request-thread wait for the run (0: result arrives later)
+CODE_EVAL_UID = int(os.getenv("CODE_EVAL_UID", "65534"))  # submissions run as this uid when the server is root
+
+# Context Retrieval Configuration
+CONTEXT_TOP_K = int(os.getenv("CONTEXT_TOP_K", "4"))  # resume/JD sections per prompt
+
+# Question Bank Configuration
+OPENING_FROM_BANK = os.getenv("OPENING_FROM_BANK", "1")  # "1": opening question skips the model
+QBANK_PRESYNTH = os.getenv("QBANK_PRESYNTH", "1")  # "1": pre-render bank audio when context is set
+TTS_CACHE_MAX_ITEMS = int(os.getenv("TTS_CACHE_MAX_ITEMS", "256"))
+
+# Filler Audio Configuration
+FILLER_AUDIO = os.getenv("FILLER_AUDIO", "1")  # "1": send an acknowledgement clip while the reply computes
+FILLER_DELAY_MS = int(os.getenv("FILLER_DELAY_MS", "700"))  # skip the filler if the reply is ready sooner
+FILLER_NO_REPEAT = int(os.getenv("FILLER_NO_REPEAT", "3"))  # recent phrases not reused
+
+# Feedback Configuration
+ASSESS_WORKERS = int(os.getenv("ASSESS_WORKERS", "2"))  # background per-answer scoring threads
+ASSESS_REDUCE_WAIT_SEC = float(os.getenv("ASSESS_REDUCE_WAIT_SEC", "8"))  # max wait for pending scores at finish
+
+# Feedback Storage
+DATA_DIR = os.getenv("DATA_DIR", str(Path(__file__).parent.parent / "data"))
+FEEDBACK_DB_PATH = os.getenv("FEEDBACK_DB_PATH", os.path.join(DATA_DIR, "feedback.db"))
+FEEDBACK_CACHE_MAX_ENTRIES = int(os.getenv("FEEDBACK_CACHE_MAX_ENTRIES", "200"))  # memoized reports kept
+
+# Transcript Journal
+TRANSCRIPT_JOURNAL = os.getenv("TRANSCRIPT_JOURNAL", "1")  # "1": journal turns and resume unfinished sessions at startup
+JOURNAL_DIR = os.getenv("JOURNAL_DIR", os.path.join(DATA_DIR, "journal"))
+JOURNAL_FSYNC_MS = float(os.getenv("JOURNAL_FSYNC_MS", "200"))  # fsync batches at most this often
+JOURNAL_RECOVER_HOURS = float(os.getenv("JOURNAL_RECOVER_HOURS", "6"))  # older unfinished sessions are not resumed
+
+# Model Routing Configuration
+# Per call class, models in preference order, e.g. "followup=gemini-2.5-flash-lite,gemini-2.5-flash;feedback=gemini-2.5-flash"
+MODEL_ROUTES = os.getenv("MODEL_ROUTES", "")
+GEMINI_FALLBACK_MODELS = os.getenv("GEMINI_FALLBACK_MODELS", "")  # appended to every class, comma-separated
+ROUTER_SLO_MS = os.getenv("ROUTER_SLO_MS", "opening=2500,followup=2500,coding=3000,assessment=8000,feedback=12000")
+ROUTER_EWMA_ALPHA = float(os.getenv("ROUTER_EWMA_ALPHA", "0.2"))
+ROUTER_MAX_ERROR_RATE = float(os.getenv("ROUTER_MAX_ERROR_RATE", "0.3"))  # error EWMA above this demotes a model
+ROUTER_PROBE_SEC = float(os.getenv("ROUTER_PROBE_SEC", "30"))  # retry a demoted preferred model this often
+ROUTER_LOG_PATH = os.getenv("ROUTER_LOG_PATH", "")  # JSONL export of routing decisions ("" = in-memory only)
+
+# Token Budget Configuration
+# Prompt token budgets per call class; low-priority prompt sections are trimmed past them (0 = unlimited)
+TOKEN_BUDGETS = os.getenv("TOKEN_BUDGETS", "opening=2500,followup=3000,coding=3500,assessment=1500,feedback=6000")
+
+# Health Probes
+HEALTH_PROBES = os.getenv("HEALTH_PROBES", "1")  # "1": probe providers in the background for /readyz
+HEALTH_PROBE_SEC = float(os.getenv("HEALTH_PROBE_SEC", "30"))
+HEALTH_PROBE_TIMEOUT_SEC = float(os.getenv("HEALTH_PROBE_TIMEOUT_SEC", "5"))
+HEALTH_REQUIRED = os.getenv("HEALTH_REQUIRED", "genai,stt,tts")  # providers that must be up for /readyz
+
+# Admission Control
+ADMISSION_CONTROL = os.getenv("ADMISSION_CONTROL", "1")  # "1": per-provider bulkheads and turn admission
+STAGE_WORKERS = os.getenv("STAGE_WORKERS", "stt=8,llm=8,tts=8,llm_batch=8")  # concurrent provider calls per stage
+STAGE_QUEUE_MAX = int(os.getenv("STAGE_QUEUE_MAX", "16"))  # callers allowed to wait per stage; more are refused
+STAGE_MAX_WAIT_MS = int(os.getenv("STAGE_MAX_WAIT_MS", "8000"))  # a call gives up after waiting this long for a slot
+ADMISSION_MAX_WAIT_MS = int(os.getenv("ADMISSION_MAX_WAIT_MS", "4000"))  # turns estimated to queue longer get a retry hint
+
+# Debug Profiling
+DEBUG_PROFILING = os.getenv("DEBUG_PROFILING", "0")  # "1": enable /api/debug/profile and /api/debug/memory
+PROFILE_MAX_SEC = float(os.getenv("PROFILE_MAX_SEC", "60"))  # longest allowed sampling run
 
 # API Configuration
 API_KEY = os.getenv("GOOGLE_GENAI_API_KEY") or os.getenv("GOOGLE_API_KEY")
 
 def validate_config():
     """Validate required configuration."""
+    if GENAI_PROVIDER == "local":
+        return
     if USE_VERTEX != "1" and not API_KEY:
         raise RuntimeError("Set GOOGLE_GENAI_API_KEY/GOOGLE_API_KEY or set USE_VERTEX_AI=1 with ADC.")
@@ -0,0 +1,5 @@
+"""Flask extensions shared by app.py and the route/service modules."""
+from flask_socketio import SocketIO
+
+# Bound to the app in app.py (socketio.init_app); importable without importing app
+socketio = SocketIO()
@@ -1,9 +1,41 @@
+import threading
 import time
+import uuid
+
+from config.settings import CONTEXT_TOP_K
+from utils.cancellation import CancelToken
+
+class Conversation(list):
+    """Turn list that mirrors append/pop/in-place edits to the owning state's journal."""
+    
+    def __init__(self, state, turns=()):
+        super().__init__(turns)
+        self._state = state
+    
+    def append(self, turn):
+        super().append(turn)
+        self._state.record("turn", turn=dict(turn))
+    
+    def pop(self, index=-1):
+        index = index if index >= 0 else len(self) + index
+        turn = super().pop(index)
+        self._state.record("drop", index=index)
+        return turn
+    
+    def touch(self, turn):
+        """Journal a turn that was changed in place after being appended."""
+        for i in range(len(self) - 1, -1, -1):
+            if self[i] is turn:
+                self._state.record("edit", index=i, turn=dict(turn))
+                return
 
 class InterviewState:
     """Manages global interview state."""
     
-    def __init__(self):
+    def __init__(self, journal=None):
+        # Crash-recovery journal (services.transcript_journal); None disables it
+        self.journal = journal
+        
         # Interview timing
         self.started_at = None
         self.duration_sec = 0
@@ -17,25 +49,69 @@ class InterviewState:
         self.coding_submission = None
         
         # Conversation
+        self.session_id = uuid.uuid4().hex
         self.conversation = []
         self.context = ""
+        self.context_index = None
         self.last_question = None
         self.probed_topics = set()
+        self.assessment_futures = []
+        self.coverage = None
+        self.role = ""
+        self.role_category = None
+        self.bank_asked = set()
         
         # Audio tracking
         self.turn_counter = 0
         self.last_audio_sha1 = None
+        
+        # In-flight turn (cancelled when superseded)
+        self._turn_lock = threading.Lock()
+        self._turn_token = None
+        self._turn_seq = 0
+    
+    @property
+    def conversation(self) -> Conversation:
+        return self._conversation
+    
+    @conversation.setter
+    def conversation(self, turns):
+        # Wholesale replacement (new session, recovery) is not journaled
+        self._conversation = Conversation(self, turns)
+    
+    @property
+    def finished(self) -> bool:
+        return self._finished
+    
+    @finished.setter
+    def finished(self, value: bool):
+        changed = bool(value) and not getattr(self, "_finished", False)
+        self._finished = bool(value)
+        if changed:
+            self.record("finished")
+    
+    def record(self, kind: str, **fields):
+        """Hand an event for this session to the journal; enqueue only, never blocks."""
+        if self.journal is not None:
+            self.journal.record(self.session_id, kind, fields)
+    
+    def record_timer(self):
+        """Journal the timer fields (start/pause/resume, and after recovery)."""
+        self.record("timer", started_at=self.started_at, duration_sec=self.duration_sec,
+                    paused_at=self.paused_at, paused_total=self.paused_total)
     
     def pause_timer(self):
         """Pause the main interview timer."""
         if self.started_at and self.paused_at is None:
             self.paused_at = int(time.time())
+            self.record_timer()
     
     def resume_timer(self):
         """Resume the main interview timer."""
         if self.paused_at is not None:
             self.paused_total += int(time.time()) - self.paused_at
             self.paused_at = None
+            self.record_timer()
     
     def start_timer(self, minutes: int):
         """Start or restart the interview timer."""
@@ -44,6 +120,7 @@ class InterviewState:
         self.finished = False
         self.paused_at = None
         self.paused_total = 0
+        self.record_timer()
     
     def remaining_seconds(self):
         """Calculate remaining interview time."""
@@ -61,9 +138,33 @@ class InterviewState:
         rem = self.remaining_seconds()
         return rem is not None and rem <= 0
     
+    def relevant_context(self, top_k: int = CONTEXT_TOP_K, turns: int = 4) -> str:
+        """Resume/JD sections most relevant to the last few turns."""
+        if self.context_index is None:
+            return self.context
+        query = " ".join(t.get("text") or "" for t in self.conversation[-turns:])
+        return self.context_index.render(query, top_k)
+    
+    def begin_turn(self) -> CancelToken:
+        """Cancel any in-flight turn of this session and hand out a token for the new one."""
+        with self._turn_lock:
+            if self._turn_token is not None:
+                self._turn_token.cancel("superseded")
+            self._turn_seq += 1
+            self._turn_token = CancelToken(self.session_id, self._turn_seq)
+            return self._turn_token
+    
+    def cancel_turn(self, reason: str = "cancelled"):
+        """Abort the in-flight turn, if any (finish, new session)."""
+        with self._turn_lock:
+            if self._turn_token is not None:
+                self._turn_token.cancel(reason)
+                self._turn_token = None
+    
     def reset(self):
         """Reset all state."""
-        self.__init__()
+        self.cancel_turn("reset")
+        self.__init__(self.journal)
 
 # Global state instance
 interview_state = InterviewState()
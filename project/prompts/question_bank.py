@@ -0,0 +1,113 @@
+"""Local interview question bank used for instant, model-free questions."""
+
+OPENING_QUESTIONS = [
+    "{greeting} — thanks for joining. Could you briefly introduce yourself and your background?",
+    "{greeting}, and welcome. To start, could you tell me a little about yourself and what you're working on now?",
+    "{greeting} — great to meet you. Could you walk me through your background in a minute or two?",
+]
+
+GENERAL_QUESTIONS = [
+    "Could you tell me about your most recent project?",
+    "Could you walk me through a recent project you're proud of and your specific role in it?",
+    "What was the biggest technical challenge you faced recently, and how did you handle it?",
+    "Can you describe a time you had to learn a new tool or technology quickly?",
+    "How do you usually approach breaking down a large, ambiguous task?",
+    "Tell me about a decision you made that involved a real trade-off. What did you choose and why?",
+    "Can you describe a time something you built failed or broke, and what you learned from it?",
+    "How do you make sure the work you deliver is correct and well tested?",
+    "What's a piece of feedback you received recently, and how did you act on it?",
+    "How do you prioritize when several urgent tasks land at the same time?",
+]
+
+# Keyed by category name in static/job_categories.json.
+CATEGORY_QUESTIONS = {
+    "Software Development": [
+        "How would you design an API that needs to stay fast as traffic grows tenfold?",
+        "Can you walk me through how you debug a production issue you can't reproduce locally?",
+        "How do you decide when a piece of code needs refactoring versus leaving it alone?",
+        "What does your code review process look like, both as an author and a reviewer?",
+        "How have you handled database schema changes without downtime?",
+        "What's your approach to making a slow endpoint or page faster?",
+    ],
+    "Data Science & Analytics": [
+        "How do you validate that a model will generalize beyond your training data?",
+        "Can you describe how you handled missing or messy data in a recent project?",
+        "How do you choose an evaluation metric for a new modeling problem?",
+        "Tell me about a time your analysis changed a business decision. What did you find?",
+        "How do you explain a model's results to a non-technical stakeholder?",
+        "How would you detect and respond to data drift in a deployed model?",
+    ],
+    "Engineering": [
+        "Can you walk me through how you verify a design meets its safety and performance requirements?",
+        "Tell me about a project where you had to work within tight budget or material constraints?",
+        "How do you approach root-cause analysis when a component fails in testing?",
+        "Which simulation or analysis tools do you rely on, and how do you validate their results?",
+        "How do you balance cost, schedule and quality when they pull in different directions?",
+    ],
+    "Business & Finance": [
+        "Can you walk me through how you built a financial model for a recent decision?",
+        "How do you sanity-check numbers before presenting them to leadership?",
+        "Tell me about a time your analysis uncovered a risk others had missed?",
+        "How do you translate business requirements into measurable success metrics?",
+        "What's your approach when stakeholders disagree on priorities?",
+    ],
+    "Healthcare & Life Sciences": [
+        "How do you make sure patient safety and compliance are maintained in your daily work?",
+        "Tell me about a time you had to make a decision with incomplete clinical or research data?",
+        "How do you stay current with new guidelines and research in your field?",
+        "Can you describe how you communicate complex findings to patients or non-specialists?",
+        "How have you handled a disagreement with a colleague about a care or research decision?",
+    ],
+    "Marketing & Sales": [
+        "Can you walk me through a campaign you ran and how you measured its success?",
+        "How do you decide which channels deserve more budget?",
+        "Tell me about a deal or campaign that didn't go as planned. What did you change?",
+        "How do you research and understand a new target audience?",
+        "How do you handle a prospect's toughest objection?",
+    ],
+    "Design & Creative": [
+        "Can you walk me through your design process on a recent project, from brief to delivery?",
+        "How do you validate a design decision with real users?",
+        "Tell me about a time you received critical feedback on your work. How did you respond?",
+        "How do you balance user needs against business or technical constraints?",
+        "How do you keep a design system consistent as a product grows?",
+    ],
+    "Other": [
+        "How do you plan and track a project so that it lands on time?",
+        "Tell me about a time you had to align people with competing goals?",
+        "How do you communicate progress and risks to stakeholders?",
+        "Can you describe a process you improved and how you measured the improvement?",
+        "How do you handle a situation where requirements change midway through a project?",
+    ],
+}
+
+SKILL_QUESTIONS = {
+    "python": ["How have you structured a larger Python codebase so it stays maintainable?"],
+    "java": ["How have you dealt with performance or memory issues in a Java service?"],
+    "javascript": ["How do you manage asynchronous code and error handling in JavaScript?"],
+    "react": ["How do you manage state and avoid unnecessary re-renders in a React app?"],
+    "sql": ["How do you approach optimizing a slow SQL query?"],
+    "docker": ["How have you used Docker to keep development and production environments consistent?"],
+    "kubernetes": ["How have you handled scaling or rollouts for services running on Kubernetes?"],
+    "aws": ["Which AWS services have you relied on most, and how did you keep costs under control?"],
+    "kafka": ["How did you handle ordering, retries or consumer lag when working with Kafka?"],
+    "redis": ["What did you use Redis for, and how did you handle cache invalidation?"],
+    "machine learning": ["How do you take a machine learning model from experiment to production?"],
+    "pytorch": ["How have you debugged a PyTorch model that wasn't training as expected?"],
+    "system design": ["How would you design a URL shortener that handles millions of requests per day?"],
+    "ci/cd": ["How have you set up CI/CD so that releases are safe and fast?"],
+}
+
+SKILL_TEMPLATES = [
+    "Your background mentions {skill}. Could you walk me through how you've used it in a real project?",
+    "I noticed {skill} in your profile. What's the most challenging thing you've built with it?",
+    "How would you rate your depth in {skill}, and can you give an example that shows it?",
+]
+
+CODING_QUESTIONS = [
+    "Thanks for the submission. What's the time and space complexity of your approach?",
+    "Thanks for that. Which edge cases would you test first, and why?",
+    "Nice work. How would your solution change if the input were ten times larger?",
+    "Thanks. What alternative approach did you consider, and why did you choose this one?",
+    "Got it. If you had more time, what would you improve in this code?",
+]
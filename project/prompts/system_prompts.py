@@ -241,3 +241,58 @@ Overall Rating
 - One line rationale referencing evidence above.
 """
 
+
+
+TURN_ASSESSMENT_SYSTEM = """
+You are assessing ONE answer from a live technical interview. Be strict, brief and factual.
+
+Return ONLY a JSON object with exactly these keys:
+{
+  "topic": "2-4 word topic of the question",
+  "communication": <integer 1-10>,
+  "technical": <integer 1-10>,
+  "strengths": ["<= 15 words each, 0-2 items"],
+  "gaps": ["<= 15 words each, 0-2 items"],
+  "evidence": "<= 20 word paraphrase of the most telling part of the answer"
+}
+
+Use the same scale as the final report (9-10 outstanding, 7-8 strong, 5-6 mixed, 3-4 weak, 1-2 poor).
+If the answer is empty, off-topic or the candidate asked a question instead, score communication and
+technical at most 3 and say so in "gaps". Do not invent facts that are not in the answer.
+"""
+
+
+# Rubric sections of the feedback report, generated independently and in parallel.
+# kind -> JSON shape: summary/bullets {"bullets": [...]}, rated {"positives", "improvements", "rating"},
+# overall {"rating", "rationale"}. min/max bound the bullet counts accepted locally.
+FEEDBACK_SECTIONS = [
+    {"key": "overview", "heading": "Overview", "kind": "summary", "min": 1, "max": 3,
+     "guide": "1–3 short sentences summarizing performance and themes."},
+    {"key": "strengths", "heading": "Strengths", "kind": "rated", "min": 1, "max": 4, "rating_required": False,
+     "guide": "positives: 2–4 strengths seen; improvements: 0–2 meta-suggestions on leveraging them; rating 7–10 or null."},
+    {"key": "improvement", "heading": "Areas for Improvement", "kind": "rated", "min": 1, "max": 5,
+     "guide": "positives: 0–2 attempts toward improvement; improvements: 3–5 specific, concrete bullets."},
+    {"key": "communication", "heading": "Communication & Clarity", "kind": "rated", "min": 1, "max": 4,
+     "guide": "positives: 2–4; improvements: 2–4. Note neutrally if the candidate asked questions instead of answering."},
+    {"key": "technical", "heading": "Technical Depth & Problem-Solving", "kind": "rated", "min": 1, "max": 4,
+     "guide": "positives: 2–4 grounded in tools, trade-offs, metrics; improvements: 2–4 asking for metrics, benchmarks, design choices."},
+    {"key": "next_steps", "heading": "Actionable Next Steps", "kind": "bullets", "min": 3, "max": 6,
+     "guide": "3–6 bullets, each ≤ 20 words: what to practice, quantify, restructure."},
+    {"key": "follow_ups", "heading": "Suggested Follow-up Questions", "kind": "bullets", "min": 2, "max": 4,
+     "guide": "2–4 questions the next interviewer could ask."},
+    {"key": "overall", "heading": "Overall Rating", "kind": "overall", "min": 0, "max": 0,
+     "guide": "overall rating and a one-line rationale referencing the evidence."},
+]
+
+FEEDBACK_SECTION_SHAPES = {
+    "summary": '{"bullets": ["sentence", ...]}',
+    "bullets": '{"bullets": ["...", ...]}',
+    "rated": '{"positives": ["...", ...], "improvements": ["...", ...], "rating": <integer 1-10 or null>}',
+    "overall": '{"rating": <integer 1-10>, "rationale": "one line"}',
+}
+
+FEEDBACK_SECTION_INSTRUCTIONS = """
+Write ONLY the "{heading}" section of the report described above, not the whole document.
+Content: {guide}
+Return ONLY a JSON object of this shape (no markdown, no headings): {shape}
+"""
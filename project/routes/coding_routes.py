@@ -1,14 +1,35 @@
 """Coding window API routes."""
 import time
+from concurrent.futures import TimeoutError as FutureTimeout
 from flask import Blueprint, request, jsonify
 
 from models.interview_state import interview_state
 from services.speech_service import SpeechService
 from services.ai_service import AIService
-from config.settings import CODING_EXPIRES_AFTER_SEC
+from services.question_bank import QuestionBank
+from services.code_eval_service import CodeEvalService, summarize
+from services.token_service import Section, build_prompt
+from utils.cancellation import Cancelled
+from extensions import socketio
+from config.settings import CODING_EXPIRES_AFTER_SEC, CODE_EVAL_WAIT_SEC
 
 coding_bp = Blueprint('coding', __name__)
 
+def _coding_fallback() -> str:
+    return QuestionBank.pick(interview_state, "coding")
+
+def _coding_prompt(instructions: str, *extra: Section) -> str:
+    """Instructions + context + recent turns (+ extra sections), within the "coding" token budget."""
+    recent = chr(10).join(f"{'Interviewer' if t['role']=='assistant' else 'Candidate'}: {t['text']}"
+                          for t in interview_state.conversation[-6:])
+    sections = [
+        Section("instructions", instructions, trim="keep"),
+        Section("context", interview_state.relevant_context() if interview_state.context else "(No context)",
+                priority=1, trim="head", header="\nContext:"),
+        Section("conversation", recent, priority=2, trim="tail", header="\nRecent conversation (last few turns):"),
+    ]
+    return build_prompt(sections + list(extra), "coding")
+
 @coding_bp.route('/api/start_coding', methods=['POST'])
 def start_coding():
     """Start the coding window."""
@@ -33,50 +54,91 @@ def submit_code():
     data = request.get_json(silent=True) or {}
     code = (data.get("code") or "").strip()
     lang = data.get("lang", "text")
-    interview_state.coding_submission = {"code": code, "lang": lang, "time": int(time.time())}
+    tests = [t for t in (data.get("tests") or []) if isinstance(t, dict)] or None
+    client_id = data.get("client_id")
+    submission = {"code": code, "lang": lang, "time": int(time.time())}
+    interview_state.coding_submission = submission
+    token = interview_state.begin_turn()
     
     # close coding window & resume main timer
     interview_state.coding_active = False
     interview_state.coding_end_at = None
     interview_state.resume_timer()
     
-    # Make the submission visible to feedback
-    interview_state.conversation.append({"role": "user", "text": f"[Coding submission attached: {len(code)} chars]"})
+    # Static analysis is inline; sandboxed runs go to the eval pool and, unless already done
+    # (or CODE_EVAL_WAIT_SEC allows a short wait), land in the transcript when they finish
+    features, future = CodeEvalService.submit(code, lang, tests)
+    execution = None
+    if future is not None and (future.done() or CODE_EVAL_WAIT_SEC > 0):
+        try:
+            execution = future.result(timeout=CODE_EVAL_WAIT_SEC)
+        except FutureTimeout:
+            pass
+        except Exception as e:
+            print("[SUBMIT_CODE] eval error:", e)
+    submission["analysis"] = summarize(features, execution)
+    
+    # Make the submission (and its analysis) visible to feedback
+    turn = {"role": "user", "text": f"[Coding submission attached: {len(code)} chars; {submission['analysis']}]"}
+    interview_state.conversation.append(turn)
+    if future is not None and execution is None:
+        def _late_result(f):
+            try:
+                result = f.result()
+                submission["analysis"] = summarize(features, result)
+                turn["text"] = f"[Coding submission attached: {len(code)} chars; {submission['analysis']}]"
+                interview_state.conversation.touch(turn)
+                if client_id:
+                    socketio.emit("code_eval_result", {"execution": result, "analysis": submission["analysis"]},
+                                  to=client_id)
+            except Exception as e:
+                print("[SUBMIT_CODE] eval error:", e)
+        future.add_done_callback(_late_result)
+    
+    def _cancelled():
+        # Submission is kept; the follow-up belonged to a superseded turn
+        return jsonify({"ok": True, "message": "Code received.", "cancelled": True,
+                        "analysis": features, "execution": execution}), 200
     
     # Generate brief acknowledgement + reflective follow-up
     try:
-        snippet = code[:800]
-        prompt = f"""
+        snippet = code[:600]
+        prompt = _coding_prompt("""
 You are an interviewing engineer. The candidate just submitted code.
 
 Goal (STRICT):
 1) Give a short, positive acknowledgement (max 1 sentence).
-2) Look at the code and *briefly* mention the approach you see (e.g., "I see you're using a hash map..." or "...using two pointers.").
+2) Using the analysis summary and the code, *briefly* mention the approach you see (e.g., "I see you're using a hash map..." or "...using two pointers.").
 3) Ask ONE reflective follow-up about *that* approach (e.g., "Why did you choose that?" or "What's the complexity of this method?").
-4) Do NOT provide a solution or say if it's "correct". Keep the total response under 50 words.
-
-Context:
-{interview_state.context if interview_state.context else "(No context)"}
-
-Recent conversation (last few turns):
-{chr(10).join(f"{'Interviewer' if t['role']=='assistant' else 'Candidate'}: {t['text']}" for t in interview_state.conversation[-6:])}
-
-Candidate submission (truncated):
-"""
-        assistant_text = AIService.generate_content(prompt + snippet, temperature=0.4, max_tokens=120)
+4) Do NOT provide a solution or say if it's "correct". Keep the total response under 50 words.""",
+            Section("analysis", submission["analysis"], priority=3, trim="keep",
+                    header="\nAnalysis summary (static analysis + sandboxed run):"),
+            Section("code", snippet, priority=3, trim="head", header="\nCandidate submission (truncated):"),
+        )
+        assistant_text = AIService.generate_content(prompt, temperature=0.4, max_tokens=120,
+                                                    fallback=_coding_fallback, cancel=token, call_class="coding")
         if not assistant_text:
             assistant_text = "Nice work — most of your approach looks sensible. Briefly explain your complexity and any edge cases you considered."
+    except Cancelled:
+        return _cancelled()
     except Exception as e:
         print("[SUBMIT_CODE] LLM error:", e)
         assistant_text = "Nice work — most of your approach looks sensible. Why did you choose this approach over alternatives?"
     
     # record and TTS
-    interview_state.conversation.append({"role": "assistant", "text": assistant_text})
+    if token.cancelled:
+        return _cancelled()
+    reply_turn = {"role": "assistant", "text": assistant_text}
+    interview_state.conversation.append(reply_turn)
     interview_state.last_question = assistant_text
     
     audio_url = None
     try:
-        audio_url = SpeechService.synthesize_speech(assistant_text)
+        audio_url = SpeechService.synthesize_speech(assistant_text, cancel=token)
+    except Cancelled:
+        if interview_state.conversation and interview_state.conversation[-1] is reply_turn:
+            interview_state.conversation.pop()
+        return _cancelled()
     except Exception as e:
         print("[SUBMIT_CODE] TTS error:", e)
     
@@ -84,7 +146,9 @@ Candidate submission (truncated):
         "ok": True,
         "message": "Code received.",
         "assistant_text": assistant_text,
-        "assistant_audio": audio_url
+        "assistant_audio": audio_url,
+        "analysis": features,
+        "execution": execution
     }), 200
 
 @coding_bp.route('/api/coding_status', methods=['GET'])
@@ -101,21 +165,15 @@ def coding_status():
             
             # LLM: brief encouragement + reflective follow-up
             try:
-                prompt = f"""
+                prompt = _coding_prompt("""
 You are an interviewing engineer. The 5-minute coding window ended (timeout).
 
 Goal (STRICT):
 1) Short, kind acknowledgement (max 1 sentence).
 2) Ask ONE reflective follow-up (max 1 sentence) about complexity/edge cases/improvements.
-3) No solutions. < 60 words total.
-
-Context:
-{interview_state.context if interview_state.context else "(No context)"}
-
-Recent conversation (last few turns):
-{chr(10).join(f"{'Interviewer' if t['role']=='assistant' else 'Candidate'}: {t['text']}" for t in interview_state.conversation[-6:])}
-"""
-                follow = AIService.generate_content(prompt, temperature=0.4, max_tokens=90)
+3) No solutions. < 60 words total.""")
+                follow = AIService.generate_content(prompt, temperature=0.4, max_tokens=90, fallback=_coding_fallback,
+                                                    call_class="coding")
                 if not follow:
                     follow = "Time's up — thanks for attempting it. In brief, what's the complexity and which edge cases would you test?"
             except Exception as e:
@@ -1,20 +1,26 @@
 """Debug and testing routes."""
+import time
 import traceback
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify
 
-from services.ai_service import AIService, genai_client, GEMINI_MODEL, USE_VERTEX
-from google.genai import types
+from services import clients
+from services.ai_service import GEMINI_MODEL, USE_VERTEX
+from services.model_router import model_router
+from services.token_service import ledger
+from services.profiler_service import ProfilerService
+from services.turn_executor import turn_executor
+from config.settings import DEBUG_PROFILING
 
 debug_bp = Blueprint('debug', __name__)
 
 @debug_bp.route('/api/debug_gemini', methods=['GET'])
 def debug_gemini():
-    """Test Gemini connection."""
+    """Test Gemini connection with a real (billed) generation; health checks should poll /readyz."""
     try:
-        resp = genai_client.models.generate_content(
+        resp = clients.genai.get().models.generate_content(
             model=GEMINI_MODEL,
             contents="Say OK.",
-            config=types.GenerateContentConfig(temperature=0.1, max_output_tokens=10),
+            config=clients.genai_sdk.get().types.GenerateContentConfig(temperature=0.1, max_output_tokens=10),
         )
         txt = (getattr(resp, "text", "") or "").strip()
         return jsonify({
@@ -26,4 +32,73 @@ def debug_gemini():
     except Exception as e:
         return jsonify({"ok": False, "model": GEMINI_MODEL, "error": str(e)}), 500
 
+@debug_bp.route('/api/debug_router', methods=['GET'])
+def debug_router():
+    """Model routing health (latency/error EWMAs vs SLOs) and recent decisions."""
+    try:
+        recent = int(request.args.get("recent", 100))
+    except ValueError:
+        recent = 100
+    return jsonify({"ok": True, **model_router.snapshot(recent)}), 200
+
+@debug_bp.route('/api/token_usage', methods=['GET'])
+def token_usage():
+    """Prompt/output token totals for the current session, recent sessions and each route."""
+    return jsonify({"ok": True, **ledger.snapshot()}), 200
+
+@debug_bp.route('/api/debug_clients', methods=['GET'])
+def debug_clients():
+    """Provider client build times and connection health; ?ping=1 pings every client now."""
+    if request.args.get("ping") == "1":
+        for c in clients.ALL:
+            c.ping()
+    return jsonify({"ok": True, "clients": clients.status()}), 200
+
+@debug_bp.route('/api/debug_stages', methods=['GET'])
+def debug_stages():
+    """Per-provider bulkhead occupancy, measured service times and admission refusals."""
+    return jsonify({"ok": True, **turn_executor.status()}), 200
+
+def _profiling_disabled():
+    return jsonify({"ok": False, "error": "Profiling endpoints are disabled (set DEBUG_PROFILING=1)"}), 404
+
+@debug_bp.route('/api/debug/profile', methods=['GET'])
+def debug_profile():
+    """Sample every thread's stack for ?seconds=N (default 10) at ?interval_ms (default 10).
+    Returns collapsed stacks (flamegraph.pl/speedscope input), or ?format=json for the top functions.
+    """
+    if DEBUG_PROFILING != "1":
+        return _profiling_disabled()
+    try:
+        seconds = float(request.args.get("seconds", 10))
+        interval_ms = float(request.args.get("interval_ms", 10))
+    except ValueError:
+        return jsonify({"ok": False, "error": "seconds and interval_ms must be numbers"}), 400
+    stacks = ProfilerService.sample(seconds, interval_ms)
+    if stacks is None:
+        return jsonify({"ok": False, "error": "A profile is already running"}), 409
+    if request.args.get("format") == "json":
+        return jsonify({"ok": True, "samples": sum(stacks.values()),
+                        "top": ProfilerService.top_functions(stacks)}), 200
+    name = f"profile-{int(time.time())}.collapsed"
+    return Response(ProfilerService.collapsed(stacks), mimetype="text/plain",
+                    headers={"Content-Disposition": f"attachment; filename={name}"})
+
+@debug_bp.route('/api/debug/memory', methods=['GET'])
+def debug_memory():
+    """Per-session sizes and cache bytes; tracemalloc top allocations once started (?start=1, ?stop=1)."""
+    if DEBUG_PROFILING != "1":
+        return _profiling_disabled()
+    try:
+        limit = int(request.args.get("limit", 25))
+    except ValueError:
+        limit = 25
+    if request.args.get("stop") == "1":
+        ProfilerService.stop_tracemalloc()
+    return jsonify({
+        "ok": True,
+        "session": ProfilerService.session_memory(),
+        "tracemalloc": ProfilerService.tracemalloc_top(limit, start=request.args.get("start") == "1"),
+    }), 200
+
 # Gap analysis endpoints removed
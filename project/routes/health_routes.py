@@ -0,0 +1,24 @@
+"""Liveness and readiness endpoints for load balancers; answered from memory, no provider calls."""
+import time
+from flask import Blueprint, request, jsonify
+
+from services.health_service import health_monitor
+from config.settings import HEALTH_PROBES
+
+health_bp = Blueprint('health', __name__)
+
+@health_bp.route('/healthz', methods=['GET'])
+def healthz():
+    """The process is up and serving requests."""
+    return jsonify({"ok": True, "uptime_sec": int(time.time() - health_monitor.started_at)}), 200
+
+@health_bp.route('/readyz', methods=['GET'])
+def readyz():
+    """503 until every HEALTH_REQUIRED provider's latest background probe succeeded; ?history=1 adds recent probes."""
+    if HEALTH_PROBES != "1":
+        return jsonify({"ok": True, "ready": True, "probes": "disabled"}), 200
+    state = health_monitor.readiness()
+    if request.args.get("history") == "1":
+        for name, provider in state["providers"].items():
+            provider["history"] = health_monitor.recent(name)
+    return jsonify({"ok": state["ready"], **state}), 200 if state["ready"] else 503
@@ -0,0 +1,29 @@
+"""Feedback history API routes."""
+from flask import Blueprint, request, jsonify
+
+from services.feedback_store import feedback_store
+
+history_bp = Blueprint('history', __name__)
+
+@history_bp.route('/api/feedback_history', methods=['GET'])
+def list_feedback():
+    """Paginated feedback summaries, newest first; ?q= runs a full-text search."""
+    try:
+        page = int(request.args.get("page", 1))
+        per_page = int(request.args.get("per_page", 20))
+    except ValueError:
+        return jsonify({"ok": False, "error": "page and per_page must be integers"}), 400
+    try:
+        result = feedback_store.list(page, per_page, (request.args.get("q") or "").strip() or None)
+        return jsonify({"ok": True, **result}), 200
+    except Exception as e:
+        print("[HISTORY] list error:", e)
+        return jsonify({"ok": False, "error": str(e)}), 500
+
+@history_bp.route('/api/feedback_history/<int:feedback_id>', methods=['GET'])
+def get_feedback(feedback_id):
+    """Full stored feedback record."""
+    item = feedback_store.get(feedback_id)
+    if item is None:
+        return jsonify({"ok": False, "error": "Not found"}), 404
+    return jsonify({"ok": True, "feedback": item}), 200
@@ -1,29 +1,138 @@
 """Main interview API routes."""
-import os
 import time
 import hashlib
 from flask import Blueprint, request, jsonify
+from werkzeug.exceptions import RequestEntityTooLarge
 import re
+import uuid
 
 from models.interview_state import interview_state
-from services.speech_service import SpeechService
+from services.speech_service import SpeechService, request_audio_format
 from services.ai_service import AIService
-from services.feedback_service import FeedbackService
+from services.feedback_service import FeedbackService, PROMPT_VERSION
+from services.context_index import ContextIndex
+from services.coverage_service import CoverageTracker
+from services.question_bank import QuestionBank
+from services.assessment_service import AssessmentService
+from services.feedback_store import feedback_store
+from services.filler_service import FillerService
+from services.transcript_journal import transcript_journal
+from services.turn_executor import turn_executor, Saturated, TurnExecutor, TURN_STAGES, QUESTION_STAGES
+from services.token_service import Section, build_prompt
+from utils.helpers import SingleFlight, UploadTooLarge, read_bounded
+from utils.cancellation import Cancelled
 from prompts.system_prompts import SYSTEM_PROMPT
-from config.settings import GEMINI_MODEL
+from config.settings import (
+    GEMINI_MODEL, OPENING_FROM_BANK, QBANK_PRESYNTH, ASSESS_REDUCE_WAIT_SEC, MAX_AUDIO_UPLOAD_MB, JOURNAL_RECOVER_HOURS,
+)
 
 interview_bp = Blueprint('interview', __name__)
 
-def build_conversation_prompt(prompt_text: str) -> str:
-    """Build full conversation prompt."""
-    messages = [SYSTEM_PROMPT]
-    if interview_state.context:
-        messages.append(f"\n{interview_state.context}\n")
-    messages.append("=== CONVERSATION ===")
-    for turn in interview_state.conversation[-6:]:
-        messages.append(f"{turn['role'].upper()}: {turn['text']}")
-    messages.append(f"\n{prompt_text}")
-    return "\n".join(messages)
+MAX_AUDIO_BYTES = int(MAX_AUDIO_UPLOAD_MB * 1024 * 1024)
+_FORM_OVERHEAD = 64 * 1024  # multipart boundaries, headers and the client_id field
+
+def _load_context(resume: str, job: str, role: str):
+    """Per-session derived state from the resume/JD; shared by new sessions and journal recovery."""
+    interview_state.context = f"=== RESUME ===\n{resume.strip()}\n\n=== JOB DESCRIPTION ===\n{job.strip()}"
+    interview_state.context_index = ContextIndex.build(resume, job)
+    interview_state.coverage = CoverageTracker.build(resume, job)
+    interview_state.probed_topics = set()
+    interview_state.role = role
+    interview_state.role_category = QuestionBank.resolve_category(role, job)
+    interview_state.bank_asked = set()
+    interview_state.assessment_futures = []
+    interview_state.conversation = []
+
+def _set_context(resume: str, job: str, role: str = ""):
+    """Store the resume/JD and build the per-session section index."""
+    interview_state.cancel_turn("new session")
+    interview_state.session_id = uuid.uuid4().hex
+    _load_context(resume, job, role)
+    interview_state.record("session", resume=resume, job=job, role=role)
+    if QBANK_PRESYNTH == "1":
+        QuestionBank.presynthesize_async(interview_state.role_category, None, request_audio_format(),
+                                         interview_state.coverage.vocabulary)
+    FillerService.prewarm_async()
+
+def recover_session() -> bool:
+    """Rebuild the newest unfinished journaled session (startup after a crash or restart)."""
+    for sid in transcript_journal.in_flight(JOURNAL_RECOVER_HOURS * 3600):
+        state = transcript_journal.replay(sid)
+        if state is None or state["finished"]:
+            continue
+        session = state["session"]
+        interview_state.session_id = sid
+        _load_context(session.get("resume") or "", session.get("job") or "", session.get("role") or "")
+        interview_state.conversation = state["turns"]
+        interview_state.last_question = next(
+            (t.get("text") for t in reversed(state["turns"]) if t.get("role") == "assistant"), None)
+        _sync_coverage()
+        timer = state["timer"]
+        downtime = 0
+        if timer and timer.get("started_at"):
+            interview_state.started_at = timer["started_at"]
+            interview_state.duration_sec = timer.get("duration_sec") or 0
+            interview_state.paused_at = timer.get("paused_at")
+            interview_state.paused_total = timer.get("paused_total") or 0
+            if interview_state.paused_at is None:
+                # Time the server was down doesn't count against the candidate
+                downtime = max(0, int(time.time() - (state["last_ts"] or time.time())))
+                interview_state.paused_total += downtime
+            interview_state.record_timer()
+        print(f"[JOURNAL] resumed session {sid}: {len(state['turns'])} turns, {downtime}s downtime")
+        return True
+    return False
+
+def _sync_coverage():
+    """Fold new turns into the coverage tracker (populates probed_topics)."""
+    if interview_state.coverage is not None:
+        interview_state.coverage.sync(interview_state.conversation, interview_state.probed_topics)
+    return interview_state.coverage
+
+def _fallback_question() -> str:
+    """Instant role/skill-aware question from the local bank (no model call)."""
+    _sync_coverage()
+    return QuestionBank.pick(interview_state)
+
+def _drop_turns(turns: list):
+    """Undo the appends made by a turn that was cancelled before it completed, newest first."""
+    conversation = interview_state.conversation
+    for turn in reversed(turns):
+        for i in range(len(conversation) - 1, -1, -1):
+            if conversation[i] is turn:
+                conversation.pop(i)
+                break
+
+def _audio_too_large():
+    return jsonify({"ok": False, "stage": "upload",
+                    "error": f"Recording too large (max {MAX_AUDIO_UPLOAD_MB:g} MB)"}), 413
+
+def _queued_response(payload: dict):
+    """503 + Retry-After: the turn was not started; the client retries the same request later."""
+    print(f"[ADMISSION] turn refused: {payload['bottleneck']} busy, retry in {payload['retry_after_ms']} ms")
+    return jsonify(payload), 503, {"Retry-After": TurnExecutor.retry_after_header(payload)}
+
+def _cancelled_response(token):
+    print(f"[TURN] #{token.turn} dropped ({token.reason})")
+    return jsonify({"ok": False, "stage": "cancelled", "cancelled": True, "reason": token.reason}), 200
+
+def build_conversation_prompt(prompt_text: str, call_class: str = "followup") -> str:
+    """Build full conversation prompt within the call class token budget.
+    Over budget, the coverage hint goes first, then resume/JD sections, then the oldest turns.
+    """
+    coverage = _sync_coverage()
+    sections = [
+        Section("system", SYSTEM_PROMPT, trim="keep"),
+        Section("context", f"\n{interview_state.relevant_context()}\n" if interview_state.context else "",
+                priority=1, trim="head"),
+        Section("coverage", f"=== TOPIC COVERAGE ===\n{coverage.hint()}\n"
+                if coverage is not None and coverage.vocabulary else "", priority=0),
+        Section("conversation", "\n".join(f"{turn['role'].upper()}: {turn['text']}"
+                                          for turn in interview_state.conversation[-6:]),
+                priority=2, trim="tail", header="=== CONVERSATION ==="),
+        Section("instruction", f"\n{prompt_text}", trim="keep"),
+    ]
+    return build_prompt(sections, call_class)
 
 @interview_bp.route('/api/set_context', methods=['POST'])
 def set_context():
@@ -31,8 +140,7 @@ def set_context():
     data = request.get_json(silent=True) or {}
     resume = data.get("resume", "")
     job = data.get("job", "")
-    interview_state.context = f"=== RESUME ===\n{resume.strip()}\n\n=== JOB DESCRIPTION ===\n{job.strip()}"
-    interview_state.conversation = []
+    _set_context(resume, job, data.get("role") or "")
     return jsonify({"ok": True, "message": "Context set."})
 
 @interview_bp.route('/api/upload_documents', methods=['POST'])
@@ -60,14 +168,15 @@ def upload_documents():
             except Exception:
                 job_text = f"[Uploaded job description: {getattr(f, 'filename', 'unknown')} ({len(raw)} bytes)]"
 
-        interview_state.context = f"=== RESUME ===\n{resume_text.strip()}\n\n=== JOB DESCRIPTION ===\n{job_text.strip()}"
-        interview_state.conversation = []
+        _set_context(resume_text, job_text, request.form.get("role", ""))
 
         return jsonify({
             "ok": True,
             "resume_bytes": len(resume_text.encode('utf-8', errors='ignore')) if resume_text else 0,
             "job_bytes": len(job_text.encode('utf-8', errors='ignore')) if job_text else 0
         }), 200
+    except RequestEntityTooLarge:
+        raise  # answered by the app's 413 handler
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
 
@@ -84,7 +193,13 @@ def start_interview():
 
 @interview_bp.route('/api/next_question', methods=['POST'])
 def next_question():
-    """Get the next interview question."""
+    """Get the next interview question.
+    Refused with a queued state (503) when the providers are backed up; the current turn is left alone.
+    """
+    busy = turn_executor.admit(QUESTION_STAGES)
+    if busy:
+        return _queued_response(busy)
+    token = interview_state.begin_turn()
     try:
         prompt = ("Start the interview with a warm greeting and your first question. Be brief."
                   if len(interview_state.conversation) == 0 else
@@ -93,37 +208,50 @@ def next_question():
         if interview_state.time_up():
             interview_state.finished = True
             wrap = "Time is up. Thanks for the conversation — I'll prepare your feedback now."
-            interview_state.conversation.append({"role": "assistant", "text": wrap})
             try:
-                audio_url = SpeechService.synthesize_speech(wrap)
+                audio_url = SpeechService.synthesize_speech(wrap, cancel=token)
             except Exception:
                 audio_url = None
+            token.raise_if_cancelled()
+            interview_state.conversation.append({"role": "assistant", "text": wrap})
             return jsonify({"ok": True, "question": wrap, "audio": audio_url, "finished": True}), 200
         
-        full_prompt = build_conversation_prompt(prompt)
-        question = (AIService.generate_content(full_prompt, max_tokens=400) or "").strip()
+        if len(interview_state.conversation) == 0 and OPENING_FROM_BANK == "1":
+            question = QuestionBank.opening(interview_state)
+        else:
+            call_class = "opening" if len(interview_state.conversation) == 0 else "followup"
+            full_prompt = build_conversation_prompt(prompt, call_class)
+            question = (AIService.generate_content(full_prompt, max_tokens=400, fallback=_fallback_question,
+                                                   cancel=token, call_class=call_class) or "").strip()
         if not question:
-            question = "Could you tell me about your most recent project?"
+            question = _fallback_question()
         bad_short = (len(question.split()) < 5) or (re.match(r"^(thanks|sorry|okay|that'?s|fine)[^a-z]*\??$", question.lower().strip()) is not None)
         if bad_short:
             try:
                 strict_prompt = build_conversation_prompt(
                     "Ask the next relevant interview question. One sentence only. Avoid filler words. End with '?'"
                 )
-                q2 = AIService.generate_content(strict_prompt, temperature=0.3, max_tokens=400)
-                question = (q2 or question or "Could you tell me about your most recent project?").strip()
+                q2 = AIService.generate_content(strict_prompt, temperature=0.3, max_tokens=400, fallback=_fallback_question,
+                                                cancel=token)
+                question = (q2 or question or _fallback_question()).strip()
             except Exception:
                 pass
         if (len(question.split()) < 5) or (re.match(r"^(thanks|sorry|okay|that'?s|fine)[^a-z]*\??$", question.lower().strip()) is not None):
-            question = "Could you tell me about your most recent project?"
+            question = _fallback_question()
         if "?" not in question:
             question = question.rstrip(".! ") + "?"
         
-        interview_state.conversation.append({"role": "assistant", "text": question})
+        token.raise_if_cancelled()
+        turn = {"role": "assistant", "text": question}
+        interview_state.conversation.append(turn)
         interview_state.last_question = question
         
         try:
-            audio_url = SpeechService.synthesize_speech(question)
+            try:
+                audio_url = SpeechService.synthesize_speech(question, cancel=token)
+            except Cancelled:
+                _drop_turns([turn])
+                raise
             interview_state.turn_counter += 1
             audio_id = None
             if audio_url:
@@ -141,28 +269,49 @@ def next_question():
             print("[TTS] /api/next_question:", e)
             return jsonify({"ok": True, "question": question, "audio": None, "warn": str(e)}), 200
     
+    except Cancelled:
+        return _cancelled_response(token)
     except Exception as e:
         print(f"!!! ERROR in /api/next_question: {e}")
         return jsonify({"ok": False, "error": str(e)}), 500
 
 @interview_bp.route('/api/voice_turn', methods=['POST'])
 def voice_turn():
-    """Handle voice input from candidate."""
+    """Handle voice input from candidate.
+    Starting a turn cancels the previous one; a superseded turn adds nothing to the conversation.
+    Recordings over MAX_AUDIO_UPLOAD_MB are refused (413) without superseding the current turn.
+    When the providers are backed up the turn is refused with a queued state (503 + retry_after_ms),
+    also without superseding; the client resends the same recording.
+    """
+    if (request.content_length or 0) > MAX_AUDIO_BYTES + _FORM_OVERHEAD:
+        return _audio_too_large()
+    if "audio" not in request.files:
+        return jsonify({"ok": False, "stage": "upload", "error": "No audio file"}), 400
+    blob = request.files["audio"]
+    try:
+        # One bounded read from werkzeug's spooled part; transcoding reuses these bytes without copying
+        audio_bytes = read_bounded(blob.stream, MAX_AUDIO_BYTES)
+    except UploadTooLarge:
+        return _audio_too_large()
+    if not audio_bytes:
+        return jsonify({"ok": False, "stage": "upload", "error": "Empty audio upload"}), 400
+    busy = turn_executor.admit(TURN_STAGES)
+    if busy:
+        return _queued_response(busy)
+
+    token = interview_state.begin_turn()
+    filler = None
+    added, assessment = [], None  # undone if the turn is cancelled before it completes
     try:
-        if "audio" not in request.files:
-            return jsonify({"ok": False, "stage": "upload", "error": "No audio file"}), 400
-        
-        blob = request.files["audio"]
-        audio_bytes = blob.read() or b""
         print(f"[VOICE_TURN] upload bytes={len(audio_bytes)} name={getattr(blob, 'filename', '')}")
-        if not audio_bytes:
-            return jsonify({"ok": False, "stage": "upload", "error": "Empty audio upload"}), 400
         print("[VOICE_TURN] sha1=", hashlib.sha1(audio_bytes).hexdigest()[:12])
         
         # STT
         try:
             hint = getattr(blob, 'filename', None) or getattr(blob, 'mimetype', None) or None
-            user_text = SpeechService.transcribe_audio(audio_bytes, filename_hint=hint)
+            user_text = SpeechService.transcribe_audio(audio_bytes, filename_hint=hint, cancel=token)
+        except Saturated:
+            raise
         except Exception as e:
             print("[STT] exception:", e)
             user_text = ""
@@ -177,21 +326,28 @@ def voice_turn():
             if toks and single_letters >= max(4, int(0.6 * len(toks))):
                 user_text = ""
         
-        interview_state.conversation.append({"role": "user", "text": user_text})
+        token.raise_if_cancelled()
+        added.append({"role": "user", "text": user_text})
+        interview_state.conversation.append(added[-1])
+        assessment = AssessmentService.schedule(interview_state, interview_state.last_question, user_text)
         
         # Gap analysis removed
         
         if interview_state.time_up():
             interview_state.finished = True
             wrap = "Time is up. Thank you — I'll generate your feedback now."
-            interview_state.conversation.append({"role": "assistant", "text": wrap})
             try:
-                audio_url = SpeechService.synthesize_speech(wrap)
+                audio_url = SpeechService.synthesize_speech(wrap, cancel=token)
             except Exception:
                 audio_url = None
+            token.raise_if_cancelled()
+            interview_state.conversation.append({"role": "assistant", "text": wrap})
             return jsonify({"ok": True, "user_text": user_text, "assistant_text": wrap,
                             "assistant_audio": audio_url, "finished": True}), 200
         
+        # Transcript is final: mask the LLM + TTS wait unless the reply beats FILLER_DELAY_MS
+        filler = FillerService.schedule(request.form.get("client_id"), token, user_text)
+        
         try:
             lt = (user_text or "").strip().lower()
             force_next = (len(user_text) < 3) or ("next question" in lt) or ("go to next" in lt) or ("move on" in lt) or ("skip" in lt) or ("ask next" in lt)
@@ -199,12 +355,14 @@ def voice_turn():
                 prompt = build_conversation_prompt(
                     "Ask the next relevant interview question. One sentence only. End with '?'"
                 )
-                assistant_text = AIService.generate_content(prompt, temperature=0.3, max_tokens=400)
+                assistant_text = AIService.generate_content(prompt, temperature=0.3, max_tokens=400,
+                                                            fallback=_fallback_question, cancel=token)
             else:
                 prompt = build_conversation_prompt(
                     "Respond briefly to the candidate's answer and ask your next question. One sentence only."
                 )
-                assistant_text = AIService.generate_content(prompt, max_tokens=300)
+                assistant_text = AIService.generate_content(prompt, max_tokens=300, fallback=_fallback_question,
+                                                            cancel=token)
         except Exception as e:
             print("[LLM] exception:", e)
             return jsonify({"ok": False, "stage": "llm", "error": str(e)}), 500
@@ -215,28 +373,32 @@ def voice_turn():
                 prompt2 = build_conversation_prompt(
                     "Ask the next relevant interview question. One sentence only. End with '?'"
                 )
-                q = AIService.generate_content(prompt2, temperature=0.3, max_tokens=400)
-                assistant_text = (q or assistant_text or "Could you tell me about your most recent project?").strip()
+                q = AIService.generate_content(prompt2, temperature=0.3, max_tokens=400, fallback=_fallback_question,
+                                               cancel=token)
+                assistant_text = (q or assistant_text or _fallback_question()).strip()
             except Exception:
                 if not assistant_text:
-                    assistant_text = "Could you tell me about your most recent project?"
+                    assistant_text = _fallback_question()
         bad_short = (len(assistant_text.split()) < 5) or (re.match(r"^(thanks|sorry|okay|that'?s|fine)[^a-z]*\??$", assistant_text.lower().strip()) is not None)
         if bad_short:
             try:
                 prompt3 = build_conversation_prompt(
                     "Ask a clear, specific interview question. One sentence only. Avoid filler words. End with '?'"
                 )
-                q2 = AIService.generate_content(prompt3, temperature=0.3, max_tokens=400)
-                assistant_text = (q2 or assistant_text or "Could you tell me about your most recent project?").strip()
+                q2 = AIService.generate_content(prompt3, temperature=0.3, max_tokens=400, fallback=_fallback_question,
+                                                cancel=token)
+                assistant_text = (q2 or assistant_text or _fallback_question()).strip()
             except Exception:
                 pass
         # Final guard: if still too short or filler, force a safe question
         if (len(assistant_text.split()) < 5) or (re.match(r"^(thanks|sorry|okay|that'?s|fine)[^a-z]*\??$", assistant_text.lower().strip()) is not None):
-            assistant_text = "Could you tell me about your most recent project?"
+            assistant_text = _fallback_question()
         if "?" not in assistant_text:
             assistant_text = assistant_text.rstrip(".! ") + "?"
         
-        interview_state.conversation.append({"role": "assistant", "text": assistant_text})
+        token.raise_if_cancelled()
+        added.append({"role": "assistant", "text": assistant_text})
+        interview_state.conversation.append(added[-1])
         try:
             interview_state.last_question = assistant_text
         except Exception:
@@ -244,13 +406,17 @@ def voice_turn():
         print("[LLM] reply:", repr(assistant_text))
         
         try:
-            audio_url = SpeechService.synthesize_speech(assistant_text)
+            audio_url = SpeechService.synthesize_speech(assistant_text, cancel=token)
             interview_state.turn_counter += 1
             audio_id = None
             if audio_url:
                 m = hashlib.sha1(audio_url.encode("utf-8")).hexdigest()
                 interview_state.last_audio_sha1 = m
                 audio_id = m
+        except Saturated as e:
+            # Transcript and reply are already recorded; answer with text rather than fail the turn
+            print("[TTS] skipped:", e)
+            audio_url, audio_id = None, None
         except Exception as e:
             print("[TTS] exception:", e)
             return jsonify({"ok": False, "stage": "tts", "error": str(e)}), 500
@@ -264,14 +430,25 @@ def voice_turn():
             "audio_id": audio_id
         }), 200
     
+    except Cancelled:
+        _drop_turns(added)
+        AssessmentService.discard(interview_state, assessment)
+        return _cancelled_response(token)
+    except Saturated as e:
+        # Nothing was recorded yet (STT is the first stage)
+        return _queued_response(TurnExecutor.queued(e.stage, e.wait_ms))
     except Exception as e:
         print("[VOICE_TURN] unhandled:", e)
         return jsonify({"ok": False, "stage": "unknown", "error": str(e)}), 500
+    finally:
+        if filler is not None:
+            filler.cancel()
 
 @interview_bp.route('/api/finish', methods=['POST'])
 def finish():
-    """Mark interview as finished."""
+    """Mark interview as finished and abort any in-flight turn."""
     interview_state.finished = True
+    interview_state.cancel_turn("finished")
     return jsonify({"ok": True, "message": "Interview marked finished."}), 200
 
 @interview_bp.route('/api/status', methods=['GET'])
@@ -288,62 +465,83 @@ def status():
         "coding_remaining": coding_remaining
     }), 200
 
-@interview_bp.route('/api/feedback', methods=['POST'])
-def feedback():
-    """Generate interview feedback."""
+_feedback_flight = SingleFlight()
+
+def _feedback_payload(key: str, conversation: list) -> dict:
+    """Cached report for ``key``, else generate, store, synthesize and memoize it."""
+    cached = None
     try:
-        feedback_text = FeedbackService.generate_feedback(
-            interview_state.conversation,
-            interview_state.context
-        ).strip()
-        
-        try:
-            os.makedirs("static/feedback", exist_ok=True)
-            dt_str = time.strftime("%Y-%m-%d_%H-%M-%S", time.localtime())
-            fname = f"feedback_{dt_str}.txt"
-            fpath = os.path.join("static/feedback", fname)
-            with open(fpath, "w", encoding="utf-8") as f:
-                f.write(feedback_text)
-            saved = f"/feedback/{fname}"
-        except Exception as e:
-            print("[FEEDBACK] save error:", e)
-            saved = None
-        
-        spoken_summary = None
+        cached = feedback_store.cache_get(key)
+    except Exception as e:
+        print("[FEEDBACK] cache read error:", e)
+    if cached:
+        return {
+            "feedback": cached["report"],
+            "saved_path": f"/api/feedback_history/{cached['id']}",
+            "feedback_id": cached["id"],
+            "spoken_summary": cached["spoken_summary"],
+            "scores": cached["scores"],
+            "sections": cached["sections"],
+            "cached": True,
+        }
+    
+    report = FeedbackService.generate_report(
+        conversation,
+        interview_state.context,
+        AssessmentService.collect(interview_state, ASSESS_REDUCE_WAIT_SEC)
+    )
+    feedback_text = report["text"].strip()
+    
+    feedback_id = None
+    try:
+        feedback_id = feedback_store.save(
+            feedback_text,
+            session_id=interview_state.session_id,
+            context=interview_state.context,
+            transcript=conversation,
+            scores=report["scores"],
+            sections=report["sections"],
+            prompt_version=PROMPT_VERSION,
+        )
+        saved = f"/api/feedback_history/{feedback_id}"
+    except Exception as e:
+        print("[FEEDBACK] save error:", e)
+        saved = None
+    
+    spoken_summary = None
+    try:
+        overview = report["sections"].get("overview")
+        short_readout = (" ".join(overview["bullets"]) if overview else feedback_text)[:600]
+        spoken_summary = SpeechService.synthesize_speech(short_readout)
+    except Exception as e:
+        print("[FEEDBACK] TTS error:", e)
+    
+    # Only memoize complete reports (every section generated), so a failed section is retried next time
+    if feedback_id is not None and report["sections"] and all(report["sections"].values()):
         try:
-            short_readout = feedback_text.split("\n\n", 1)[0][:600]
-            spoken_summary = SpeechService.synthesize_speech(short_readout)
+            feedback_store.cache_put(key, feedback_id, spoken_summary)
         except Exception as e:
-            print("[FEEDBACK] TTS error:", e)
-        
-        import re
-        def _extract_rating(text, heading, pattern):
-            try:
-                m = re.search(pattern, text, flags=re.IGNORECASE|re.DOTALL)
-                if m:
-                    v = int(m.group(1))
-                    if 0 <= v <= 10:
-                        return v
-            except Exception:
-                pass
-            return None
-        comm = _extract_rating(feedback_text, "Communication & Clarity", r"Communication\s*&\s*Clarity[\s\S]*?Rating:\s*(\d+)/10")
-        tech = _extract_rating(feedback_text, "Technical Depth & Problem-Solving", r"Technical\s*Depth\s*&\s*Problem\s*-\s*Solving[\s\S]*?Rating:\s*(\d+)/10")
-        overall = _extract_rating(feedback_text, "Overall Rating", r"Overall\s*Rating[\s\S]*?Overall:\s*(\d+)/10")
-        scores = {
-            "communication": comm,
-            "technical": tech,
-            "problem_solving": tech,
-            "job_fit": overall,
-            "overall": overall,
-        }
-        return jsonify({
-            "ok": True,
-            "feedback": feedback_text,
-            "saved_path": saved,
-            "spoken_summary": spoken_summary,
-            "scores": scores
-        }), 200
+            print("[FEEDBACK] cache write error:", e)
+    
+    return {
+        "feedback": feedback_text,
+        "saved_path": saved,
+        "feedback_id": feedback_id,
+        "spoken_summary": spoken_summary,
+        "scores": report["scores"],
+        "sections": report["sections"],
+        "cached": False,
+    }
+
+@interview_bp.route('/api/feedback', methods=['POST'])
+def feedback():
+    """Generate interview feedback (memoized per transcript hash)."""
+    try:
+        conversation = list(interview_state.conversation)
+        key = FeedbackService.cache_key(conversation, interview_state.context)
+        payload, shared = _feedback_flight.do(key, lambda: _feedback_payload(key, conversation))
+        interview_state.record("end", feedback_id=payload.get("feedback_id"))
+        return jsonify({"ok": True, **payload, "cached": payload["cached"] or shared}), 200
     except Exception as e:
         print("[/api/feedback] error:", e)
         return jsonify({"ok": False, "error": str(e)}), 500
@@ -360,6 +558,7 @@ def set_voice():
         from config import settings
         settings.VOICE_NAME = str(voice)
         print(f"[VOICE] set VOICE_NAME = {voice}")
+        FillerService.prewarm_async(settings.VOICE_NAME)
         return jsonify({"ok": True, "voice": voice}), 200
     except Exception as e:
         return jsonify({"ok": False, "error": str(e)}), 500
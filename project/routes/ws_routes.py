@@ -1,7 +1,7 @@
 # routes/ws_routes.py
 from flask import current_app
 from flask_socketio import emit, join_room, leave_room
-from app import socketio  # import the socketio instance we created in app.py
+from extensions import socketio  # shared instance, bound to the app in app.py
 import logging
 
 logger = logging.getLogger(__name__)
@@ -0,0 +1,354 @@
+"""Concurrent-candidate load generator and capacity report.
+
+Each simulated candidate follows the browser flow in static/js/api.js:
+upload documents, start the interview, then alternate next_question and
+voice_turn (with a recorded clip), submit code, finish and fetch feedback,
+pausing between steps like a person would. Concurrency is ramped level by
+level. For each level the report gives completed sessions/min and turns/min,
+latency
+percentiles per endpoint and error rates. It also gives the knee: the last
+level where adding candidates still bought throughput without breaking the
+latency or error limits.
+
+Interview state is one process-wide object, so simultaneous candidates share it
+and a new voice_turn supersedes the one in flight. Those replies are counted
+as "cancelled", separately from errors. Turns the server refuses under load
+(503 with a queued state) are counted as "queued" and resent after the
+advertised retry_after_ms, as the browser does.
+
+Usage (from the project/ directory):
+    python scripts/load_test.py --spawn [--levels 1,2,4,8,16] [--stage-sec 300] [--think-scale 0.2]
+    python scripts/load_test.py --url http://127.0.0.1:8000 [--audio recording.webm] [--json report.json]
+
+--spawn starts app.py on a free port with GENAI_PROVIDER=local and
+SPEECH_PROVIDER=local, so no credentials or network are needed. Its DATA_DIR is a fresh temporary
+directory, so the run never writes journals, audio or feedback into data/.
+
+--stage-sec defaults to twice the think time of one session at the chosen
+--think-scale, so every candidate can finish at least one interview per level.
+The knee is judged on finished turns/min, which still moves when sessions are
+long relative to the stage.
+"""
+import argparse
+import http.client
+import io
+import json
+import os
+import random
+import socket
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import wave
+from urllib.parse import urlparse
+
+HERE = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+
+RESUME = ("Backend engineer, 4 years. Python, Flask, PostgreSQL, Kafka, Docker. "
+          "Built an event pipeline handling 20k msgs/sec; led migration to Kubernetes.")
+JOB = "Senior Python engineer: distributed systems, data pipelines, cloud deployment, code reviews."
+CODE = "def two_sum(nums, target):\n    seen = {}\n    for i, n in enumerate(nums):\n" \
+       "        if target - n in seen:\n            return [seen[target - n], i]\n        seen[n] = i\n"
+
+# Mean think times (seconds) before each step, scaled by --think-scale
+THINK = {"read": 5.0, "answer": 12.0, "code": 60.0}
+MAX_QUEUED_RETRIES = 5  # same cap as static/js/interview.js
+
+KNEE_GAIN = 0.10      # a level must add >= 10% throughput over the previous one
+KNEE_P95_FACTOR = 3.0  # ... keep voice_turn p95 within 3x the single-candidate p95
+KNEE_MAX_ERRORS = 0.01  # ... and keep the error rate under 1%
+
+
+def _percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))]
+
+
+def _silence_wav(seconds: float = 2.0, rate: int = 16000) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(b"\x00\x00" * int(rate * seconds))
+    return buf.getvalue()
+
+
+def _multipart(fields: dict, files: dict):
+    boundary = uuid.uuid4().hex
+    out = io.BytesIO()
+    for name, value in fields.items():
+        out.write(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n'.encode())
+    for name, (filename, data, ctype) in files.items():
+        out.write(f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{filename}"\r\n'
+                  f'Content-Type: {ctype}\r\n\r\n'.encode())
+        out.write(data)
+        out.write(b"\r\n")
+    out.write(f"--{boundary}--\r\n".encode())
+    return out.getvalue(), f"multipart/form-data; boundary={boundary}"
+
+
+class Stats:
+    """Per-endpoint latencies and outcomes for one concurrency level."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.endpoints = {}
+        self.sessions = 0
+        self.turns = 0
+
+    def add(self, endpoint: str, ms: float, outcome: str):
+        with self._lock:
+            e = self.endpoints.setdefault(endpoint, {"ms": [], "ok": 0, "error": 0, "cancelled": 0,
+                                                      "queued": 0})
+            if outcome in ("ok", "error"):  # cancelled/queued replies are cut short; would flatter the percentiles
+                e["ms"].append(ms)
+            e[outcome] += 1
+
+    def turn_done(self):
+        with self._lock:
+            self.turns += 1
+
+    def session_done(self):
+        with self._lock:
+            self.sessions += 1
+
+    def summary(self, seconds: float) -> dict:
+        with self._lock:
+            endpoints = {}
+            for name, e in sorted(self.endpoints.items()):
+                n = e["ok"] + e["error"] + e["cancelled"] + e["queued"]
+                endpoints[name] = {"requests": n, "error_rate": round(e["error"] / n, 4) if n else 0.0,
+                                   "cancelled": e["cancelled"], "queued": e["queued"],
+                                   "p50_ms": round(_percentile(e["ms"], 50)), "p95_ms": round(_percentile(e["ms"], 95)),
+                                   "p99_ms": round(_percentile(e["ms"], 99))}
+            total = sum(v["requests"] for v in endpoints.values())
+            errors = sum(e["error"] for e in self.endpoints.values())
+            return {"sessions": self.sessions, "sessions_per_min": round(self.sessions * 60.0 / seconds, 2),
+                    "turns": self.turns, "turns_per_min": round(self.turns * 60.0 / seconds, 2),
+                    "requests_per_sec": round(total / seconds, 2),
+                    "error_rate": round(errors / total, 4) if total else 0.0, "endpoints": endpoints}
+
+
+class Candidate:
+    """One simulated browser session."""
+
+    def __init__(self, host: str, port: int, stats: Stats, audio: bytes, audio_name: str, args):
+        self.conn = http.client.HTTPConnection(host, port, timeout=args.timeout)
+        self.stats = stats
+        self.audio = audio
+        self.audio_name = audio_name
+        self.args = args
+        self.client_id = uuid.uuid4().hex[:12]
+
+    def think(self, kind: str, deadline: float):
+        mean = THINK[kind] * self.args.think_scale
+        pause = random.uniform(0.5 * mean, 1.5 * mean)
+        time.sleep(max(0.0, min(pause, deadline - time.time())))
+
+    def call(self, endpoint: str, body: bytes = None, ctype: str = "application/json", method: str = "POST"):
+        t0 = time.time()
+        outcome, data = "error", {}
+        try:
+            headers = {"Content-Type": ctype} if body is not None else {}
+            self.conn.request(method, endpoint, body=body, headers=headers)
+            resp = self.conn.getresponse()
+            raw = resp.read()
+            try:
+                data = json.loads(raw or b"{}")
+            except ValueError:
+                data = {}
+            if data.get("cancelled"):
+                outcome = "cancelled"
+            elif data.get("queued"):
+                outcome = "queued"
+            elif resp.status < 400 and data.get("ok", True) is not False:
+                outcome = "ok"
+        except (OSError, http.client.HTTPException):
+            self.conn.close()
+        self.stats.add(endpoint, (time.time() - t0) * 1000.0, outcome)
+        return data
+
+    def turn(self, endpoint: str, body: bytes = None, ctype: str = "application/json"):
+        """A turn request, resent after retry_after_ms (plus jitter) while the server says it is queued."""
+        for _ in range(MAX_QUEUED_RETRIES):
+            data = self.call(endpoint, body, ctype)
+            if not data.get("queued"):
+                return data
+            wait = max(500, data.get("retry_after_ms") or 1000) / 1000.0
+            time.sleep(wait * random.uniform(1.0, 1.25))
+        return self.call(endpoint, body, ctype)
+
+    def post_json(self, endpoint: str, payload: dict):
+        return self.call(endpoint, json.dumps(payload).encode())
+
+    def run(self, deadline: float):
+        """One full interview; returns False if the stage ended before it completed."""
+        body, ctype = _multipart({"role": "Backend Engineer"},
+                                 {"resume": ("resume.txt", RESUME.encode(), "text/plain"),
+                                  "job": ("job.txt", JOB.encode(), "text/plain")})
+        self.call("/api/upload_documents", body, ctype)
+        self.post_json("/api/start_interview", {"minutes": 15})
+        for turn in range(self.args.turns):
+            if time.time() >= deadline:
+                return False
+            self.think("read", deadline)
+            self.turn("/api/next_question")
+            self.think("answer", deadline)
+            body, ctype = _multipart({"client_id": self.client_id},
+                                     {"audio": (self.audio_name, self.audio, "application/octet-stream")})
+            if self.turn("/api/voice_turn", body, ctype).get("ok"):
+                self.stats.turn_done()
+        if time.time() >= deadline:
+            return False
+        self.call("/api/start_coding")
+        self.think("code", deadline)
+        self.post_json("/api/submit_code", {"code": CODE, "lang": "python"})
+        self.post_json("/api/finish", {})
+        self.call("/api/feedback")
+        self.stats.session_done()
+        return True
+
+
+def session_think_sec(args) -> float:
+    """Mean think time of one full session at the chosen --turns and --think-scale."""
+    return ((THINK["read"] + THINK["answer"]) * args.turns + THINK["code"]) * args.think_scale
+
+
+def run_level(host: str, port: int, n: int, args, audio: bytes, audio_name: str) -> dict:
+    stats = Stats()
+    deadline = time.time() + args.stage_sec
+    t0 = time.time()
+
+    def _worker():
+        while time.time() < deadline:
+            if not Candidate(host, port, stats, audio, audio_name, args).run(deadline):
+                break
+
+    threads = [threading.Thread(target=_worker, daemon=True) for _ in range(n)]
+    for t in threads:
+        t.start()
+        time.sleep(min(1.0, args.stage_sec / 10.0) / n)  # stagger arrivals over ~1 s
+    for t in threads:
+        t.join()
+    return {"concurrency": n, **stats.summary(time.time() - t0)}
+
+
+def find_knee(levels: list) -> dict:
+    """Highest level that still added throughput within the latency and error limits."""
+    if not levels:
+        return {}
+    base_p95 = levels[0]["endpoints"].get("/api/voice_turn", {}).get("p95_ms") or 0
+    knee = levels[0]
+    for prev, cur in zip(levels, levels[1:]):
+        gain = (cur["turns_per_min"] - prev["turns_per_min"]) / max(prev["turns_per_min"], 1e-9)
+        p95 = cur["endpoints"].get("/api/voice_turn", {}).get("p95_ms") or 0
+        if gain < KNEE_GAIN or cur["error_rate"] > KNEE_MAX_ERRORS or (base_p95 and p95 > KNEE_P95_FACTOR * base_p95):
+            break
+        knee = cur
+    cores = os.cpu_count() or 1
+    return {"concurrency": knee["concurrency"], "sessions_per_min": knee["sessions_per_min"],
+            "turns_per_min": knee["turns_per_min"],
+            "cores": cores, "sessions_per_core": round(knee["concurrency"] / cores, 2)}
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server():
+    """app.py on a free port against the local model and speech stand-ins, with a throwaway DATA_DIR."""
+    port = _free_port()
+    data_dir = tempfile.mkdtemp(prefix="load_test_")
+    env = dict(os.environ, GENAI_PROVIDER="local", SPEECH_PROVIDER="local", FILLER_AUDIO="0", PORT=str(port),
+               DATA_DIR=data_dir, FEEDBACK_DB_PATH=os.path.join(data_dir, "feedback.db"),
+               JOURNAL_DIR=os.path.join(data_dir, "journal"))
+    proc = subprocess.Popen([sys.executable, "app.py"], cwd=HERE, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        if proc.poll() is not None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+            raise SystemExit("server exited during startup")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.2):
+                return proc, port, data_dir
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    shutil.rmtree(data_dir, ignore_errors=True)
+    raise SystemExit("server did not start listening")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ramp simulated candidates and report capacity.")
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--spawn", action="store_true", help="start app.py with local stand-ins")
+    parser.add_argument("--levels", default="1,2,4,8,16", help="comma-separated concurrent candidates")
+    parser.add_argument("--stage-sec", type=float, help="duration of each level (default: 2x one session's think time)")
+    parser.add_argument("--turns", type=int, default=4, help="question/answer turns per session")
+    parser.add_argument("--think-scale", type=float, default=1.0, help="multiply think times (0 = none)")
+    parser.add_argument("--audio", help="recorded answer to upload (default: 2 s of silent WAV)")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--json", help="also write the report here")
+    args = parser.parse_args()
+    if args.stage_sec is None:
+        args.stage_sec = max(60.0, 2 * session_think_sec(args))
+    elif args.stage_sec < session_think_sec(args):
+        print(f"[LOAD] warning: --stage-sec {args.stage_sec:g} is shorter than one session's think time "
+              f"(~{session_think_sec(args):.0f} s); few or no sessions will finish")
+
+    if args.audio:
+        with open(args.audio, "rb") as f:
+            audio, audio_name = f.read(), os.path.basename(args.audio)
+    else:
+        audio, audio_name = _silence_wav(), "turn.wav"
+
+    proc = data_dir = None
+    if args.spawn:
+        proc, port, data_dir = spawn_server()
+        host = "127.0.0.1"
+    else:
+        u = urlparse(args.url)
+        host, port = u.hostname, u.port or 80
+    try:
+        levels = []
+        for n in (int(x) for x in args.levels.split(",") if x.strip()):
+            level = run_level(host, port, n, args, audio, audio_name)
+            levels.append(level)
+            vt = level["endpoints"].get("/api/voice_turn", {})
+            print(f"[LOAD] c={n:<4} sessions/min={level['sessions_per_min']:<7} req/s={level['requests_per_sec']:<7} "
+                  f"errors={level['error_rate']:.2%} voice_turn p50/p95={vt.get('p50_ms', 0)}/{vt.get('p95_ms', 0)} ms "
+                  f"cancelled={vt.get('cancelled', 0)} queued={vt.get('queued', 0)} turns/min={level['turns_per_min']}")
+            if not level["sessions"]:
+                print(f"[LOAD] warning: no session finished at c={n} in {args.stage_sec:g} s; "
+                      f"raise --stage-sec or lower --think-scale (sessions/min reads 0 here)")
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+        if data_dir is not None:
+            shutil.rmtree(data_dir, ignore_errors=True)
+
+    report = {"levels": levels, "knee": find_knee(levels)}
+    print("\nPer-endpoint latency at each level (p50/p95/p99 ms, error rate):")
+    for level in levels:
+        print(f"  concurrency {level['concurrency']}:")
+        for name, e in level["endpoints"].items():
+            print(f"    {name:<24} {e['p50_ms']:>6}/{e['p95_ms']:>6}/{e['p99_ms']:>6}  "
+                  f"err={e['error_rate']:.2%}  n={e['requests']}")
+    print("\nKnee:", json.dumps(report["knee"]))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
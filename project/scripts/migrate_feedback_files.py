@@ -0,0 +1,25 @@
+"""Import legacy static/feedback/feedback_*.txt reports into the feedback store.
+
+Usage (from the project/ directory):
+    python scripts/migrate_feedback_files.py [feedback_dir]
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.feedback_store import feedback_store  # noqa: E402
+
+
+def main() -> None:
+    here = os.path.dirname(__file__)
+    feedback_dir = sys.argv[1] if len(sys.argv) > 1 else os.path.normpath(os.path.join(here, "..", "static", "feedback"))
+    if not os.path.isdir(feedback_dir):
+        print(f"Feedback directory not found: {feedback_dir}")
+        return
+    added = feedback_store.migrate_directory(feedback_dir)
+    print(f"Done. {added} report(s) imported into {feedback_store.path}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Import-time profile of the app, with a startup budget to check against.
+
+Imports app.py in a fresh interpreter under ``-X importtime`` with client
+warmup off, prints the slowest imports, then times the first responses
+from / and /setup. Exits non-zero when the import takes longer than --budget-ms.
+
+Usage (from the project/ directory):
+    python scripts/profile_startup.py [--budget-ms 1500] [--top 15]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+HERE = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+
+_FIRST_REQUEST = r"""
+import json, time
+t0 = time.perf_counter()
+import app
+t1 = time.perf_counter()
+client = app.app.test_client()
+out = {"import_ms": round((t1 - t0) * 1000, 1)}
+for path in ("/", "/setup"):
+    t = time.perf_counter()
+    status = client.get(path).status_code
+    out[path] = {"status": status, "ms": round((time.perf_counter() - t) * 1000, 1)}
+print(json.dumps(out))
+"""
+
+
+def _env() -> dict:
+    env = dict(os.environ)
+    # No client warm-up, provider probes or journal writer: time the import itself, not background work
+    env.update(WARMUP_CLIENTS="0", HEALTH_PROBES="0", TRANSCRIPT_JOURNAL="0")
+    return env
+
+
+def import_profile(top: int) -> tuple:
+    """(top, rows) from -X importtime: the ``top`` slowest top-level imports and every import row,
+    each as (cumulative_us, module).
+    """
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", "import app"], cwd=HERE, env=_env(),
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr.strip().splitlines()[-1] if proc.stderr else "import failed")
+    rows = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        rows.append((int(cumulative), module.rstrip()))
+    # Top-level entries (no indentation) carry the whole cost of their subtree
+    return sorted((r for r in rows if not r[1].startswith("  ")), reverse=True)[:top], rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile app import time and first-response latency.")
+    parser.add_argument("--budget-ms", type=float, default=1500, help="fail if importing app takes longer")
+    parser.add_argument("--top", type=int, default=15)
+    args = parser.parse_args()
+
+    top, rows = import_profile(args.top)
+    print("Slowest top-level imports (cumulative ms):")
+    for us, module in top:
+        print(f"  {us / 1000:8.1f}  {module.strip()}")
+    heavy = sorted({m.strip().split(".")[0] for _, m in rows if m.strip().split(".")[0] in ("google", "pydub", "grpc")})
+    if heavy:
+        print("Heavy SDKs imported at startup:", ", ".join(heavy))
+
+    proc = subprocess.run([sys.executable, "-c", _FIRST_REQUEST], cwd=HERE, env=_env(), capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise SystemExit(proc.stderr.strip().splitlines()[-1] if proc.stderr else "first request failed")
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    print("Startup:", json.dumps(timings))
+    if timings["import_ms"] > args.budget_ms:
+        raise SystemExit(f"import took {timings['import_ms']} ms (budget {args.budget_ms} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Re-run feedback generation for stored interviews (e.g. after FEEDBACK_SYSTEM changes).
+
+Every stored report whose prompt version differs from the current rubric is
+regenerated from its saved transcript and context, then written back in place.
+Each report is committed as soon as it finishes, so the database itself is the
+checkpoint: an interrupted run picks up where it stopped when started again.
+Reports with a failed section are left untouched and retried on the next run.
+
+Usage (from the project/ directory):
+    python scripts/rescore_feedback.py [--workers 2] [--rpm 60] [--limit N] [--db PATH] [--stats FILE]
+
+Set GENAI_PROVIDER=local to run against the deterministic stand-in model.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+sys.path.insert(0, os.path.normpath(os.path.join(os.path.dirname(__file__), "..")))
+
+from services.ai_service import AIService  # noqa: E402
+from services.feedback_service import FeedbackService, PROMPT_VERSION  # noqa: E402
+from services.feedback_store import FeedbackStore, feedback_store  # noqa: E402
+
+
+def _percentile(values, pct: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(round(pct / 100.0 * (len(values) - 1))))]
+
+
+def rescore_one(store: FeedbackStore, feedback_id: int) -> dict:
+    """Regenerate one report; returns {"id", "ok", "ms"}."""
+    t0 = time.time()
+    item = store.get(feedback_id)
+    report = FeedbackService.generate_report(item["transcript"], item["context"])
+    ok = bool(report["sections"]) and all(report["sections"].values())
+    if ok:
+        store.update_report(feedback_id, report["text"], report["scores"], report["sections"], PROMPT_VERSION)
+    return {"id": feedback_id, "ok": ok, "ms": int((time.time() - t0) * 1000)}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Re-score stored interviews with the current feedback rubric.")
+    parser.add_argument("--workers", type=int, default=2, help="interviews scored concurrently")
+    parser.add_argument("--rpm", type=int, default=int(os.getenv("RESCORE_RPM", "60")),
+                        help="max model calls per minute across all workers (0 = unlimited)")
+    parser.add_argument("--limit", type=int, default=None, help="stop after this many interviews")
+    parser.add_argument("--db", default=None, help="feedback database (default: FEEDBACK_DB_PATH)")
+    parser.add_argument("--stats", default=None, help="write the final stats as JSON to this file")
+    args = parser.parse_args()
+
+    store = FeedbackStore(args.db) if args.db else feedback_store
+    AIService.throttle(args.rpm)
+    pending = store.pending_rescore(PROMPT_VERSION, args.limit)
+    print(f"[RESCORE] {len(pending)} interview(s) to score with prompt version {PROMPT_VERSION}, "
+          f"workers={args.workers}, rpm={args.rpm or 'unlimited'}")
+
+    latencies, failed = [], []
+    t0 = time.time()
+    pool = ThreadPoolExecutor(max_workers=max(1, args.workers), thread_name_prefix="rescore")
+    try:
+        futures = {pool.submit(rescore_one, store, fid): fid for fid in pending}
+        for n, fut in enumerate(as_completed(futures), 1):
+            fid = futures[fut]
+            try:
+                res = fut.result()
+            except Exception as e:
+                print(f"[RESCORE] #{fid} error:", e)
+                res = {"id": fid, "ok": False, "ms": 0}
+            if res["ok"]:
+                latencies.append(res["ms"])
+            else:
+                failed.append(fid)
+            if n % 10 == 0 or n == len(pending):
+                rate = n / max(1e-6, time.time() - t0) * 60
+                print(f"[RESCORE] {n}/{len(pending)} done ({rate:.1f}/min, {len(failed)} failed)")
+    except KeyboardInterrupt:
+        print("[RESCORE] interrupted; finished reports are saved, rerun to resume")
+        pool.shutdown(wait=True, cancel_futures=True)
+    finally:
+        pool.shutdown(wait=True)
+
+    elapsed = time.time() - t0
+    stats = {
+        "prompt_version": PROMPT_VERSION,
+        "scored": len(latencies),
+        "failed_ids": failed,
+        "elapsed_sec": round(elapsed, 2),
+        "per_min": round(len(latencies) / elapsed * 60, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {"p50": _percentile(latencies, 50), "p95": _percentile(latencies, 95),
+                       "max": max(latencies, default=0)},
+    }
+    print("[RESCORE] " + json.dumps(stats))
+    if args.stats:
+        with open(args.stats, "w", encoding="utf-8") as f:
+            json.dump(stats, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,29 +1,52 @@
 """Gemini AI service for interview interactions."""
 import os
 import time
-from google import genai
-from google.genai import types
-from google.genai.errors import ClientError
-from google.genai.types import HttpOptions
 
-from config.settings import PROJECT_ID, LOCATION, GEMINI_MODEL, USE_VERTEX, API_KEY, validate_config
+from utils.helpers import RateLimiter
+from utils.cancellation import check
+from services.model_router import model_router
+from services.token_service import ledger
+from services.turn_executor import turn_executor, BATCH_STAGE
+from services import clients
+from config.settings import USE_VERTEX
 
-validate_config()
-
-# Initialize Gemini client
-if USE_VERTEX == "1":
-    genai_client = genai.Client(
-        vertexai=True,
-        project=PROJECT_ID,
-        location=LOCATION,
-        http_options=HttpOptions(api_version="v1"),
-    )
-    print("[GENAI] Using Vertex AI (v1) via ADC")
-else:
-    genai_client = genai.Client(api_key=API_KEY)
-    print("[GENAI] Using AI Studio API key (v1beta)")
+# Gemini client and SDK are built on first use (or by clients.warmup_async at startup)
 
 _last_calls = []  # Rate limiting tracker
+_complete_limiter = None  # Optional blocking limiter for complete() (batch jobs)
+_complete_retries = 0
+
+
+def _sleep(seconds: float, cancel=None):
+    """Retry backoff; returns early (raising Cancelled) when the turn is cancelled."""
+    if cancel is not None:
+        cancel.sleep(seconds)
+    else:
+        time.sleep(seconds)
+
+
+def _is_rate_limited(e: Exception) -> bool:
+    return "RESOURCE_EXHAUSTED" in str(e) or getattr(e, "status_code", None) == 429
+
+
+def _routed_call(call_class: str, model: str, reason: str, contents, config, cancel=None):
+    """One provider call whose latency/outcome feeds the model router.
+    Runs in a slot of the "llm" bulkhead ("llm_batch" for feedback/assessment);
+    raises Saturated if none frees up in time. Background calls have no one waiting on
+    a turn, so they may queue for up to their class's SLO rather than STAGE_MAX_WAIT_MS.
+    """
+    stage = turn_executor.llm_stage(call_class)
+    max_wait_ms = model_router.slos.get(call_class) if stage == BATCH_STAGE else None
+    with turn_executor.stage(stage, cancel, max_wait_ms):
+        t0 = time.time()
+        try:
+            resp = clients.genai.get().models.generate_content(model=model, contents=contents, config=config)
+        except Exception:
+            model_router.record(call_class, model, (time.time() - t0) * 1000, False, reason)
+            raise
+    model_router.record(call_class, model, (time.time() - t0) * 1000, True, reason)
+    ledger.record(call_class, contents, resp)
+    return resp
 
 class AIService:
     """Handles AI model interactions."""
@@ -47,6 +70,10 @@ class AIService:
         try:
             print(">>> GEMINI DEBUG >>>")
             print("text len:", len(getattr(resp, "text", "") or ""))
+            um = getattr(resp, "usage_metadata", None)
+            if um is not None:
+                print("tokens prompt/output/total:", getattr(um, "prompt_token_count", None),
+                      getattr(um, "candidates_token_count", None), getattr(um, "total_token_count", None))
             for i, c in enumerate(getattr(resp, "candidates", []) or []):
                 fr = getattr(c, "finish_reason", None)
                 print(f"candidate[{i}].finish_reason:", fr)
@@ -58,9 +85,51 @@ class AIService:
             pass
     
     @staticmethod
-    def generate_content(prompt: str, temperature: float = 0.7, max_tokens: int = 1000) -> str:
-        """Generate content using Gemini."""
+    def throttle(max_per_min: int, retries: int = 3):
+        """Make complete() wait for a slot under ``max_per_min`` and retry 429s with backoff.
+        For offline batch work; the live turn path keeps its non-blocking check.
+        """
+        global _complete_limiter, _complete_retries
+        _complete_limiter = RateLimiter(max_per_min, 60.0) if max_per_min > 0 else None
+        _complete_retries = retries
+    
+    @staticmethod
+    def complete(prompt: str, model: str = None, temperature: float = 0.3, max_tokens: int = 1000,
+                 json_mode: bool = False, cancel=None, call_class: str = "feedback") -> str:
+        """Single model call for background/batch work: no turn rate limit, no canned fallback.
+        The model is routed by ``call_class`` unless given explicitly.
+        Raises on provider errors so callers can decide how to degrade, and
+        Cancelled once ``cancel`` is set (the late result is dropped).
+        """
+        sdk = clients.genai_sdk.get()
+        config = sdk.types.GenerateContentConfig(temperature=temperature, max_output_tokens=max_tokens)
+        if json_mode:
+            config.response_mime_type = "application/json"
+        for attempt in range(_complete_retries + 1):
+            if _complete_limiter is not None:
+                _complete_limiter.acquire()
+            check(cancel)
+            chosen, reason = (model, "explicit") if model else model_router.choose(call_class)
+            try:
+                resp = _routed_call(call_class, chosen, reason, prompt, config, cancel)
+                check(cancel)
+                return (getattr(resp, "text", "") or "").strip()
+            except sdk.ClientError as e:
+                if attempt == _complete_retries or not _is_rate_limited(e):
+                    raise
+                _sleep(min(30.0, 2.0 ** attempt), cancel)
+    
+    @staticmethod
+    def generate_content(prompt: str, temperature: float = 0.7, max_tokens: int = 1000, fallback=None,
+                         cancel=None, call_class: str = "followup") -> str:
+        """Generate content using Gemini, on the model the router picks for ``call_class``.
+        When rate-limited or on failure, returns ``fallback()`` if given, else a canned line.
+        Raises Cancelled as soon as ``cancel`` is set: no further retries, result dropped.
+        """
+        check(cancel)
         if not AIService._allow_call(2):
+            if fallback:
+                return fallback()
             return "Quick pause to avoid rate limits. Could you summarize your last point in one sentence?"
         
         attempts = [
@@ -69,25 +138,32 @@ class AIService:
                  contents=prompt + "\n\nAnswer in one short, safe sentence only."),
         ]
         
+        sdk = clients.genai_sdk.get()
         last_error = None
+        failed = set()
         for a in attempts:
+            check(cancel)
+            # A retry goes to another candidate when the first one errored
+            model, reason = model_router.choose(call_class, exclude=failed)
             try:
-                resp = genai_client.models.generate_content(
-                    model=GEMINI_MODEL,
-                    contents=a["contents"],
-                    config=types.GenerateContentConfig(
+                resp = _routed_call(
+                    call_class, model, reason, a["contents"],
+                    sdk.types.GenerateContentConfig(
                         temperature=a["temperature"],
                         max_output_tokens=a["max_output_tokens"],
                     ),
+                    cancel,
                 )
+                check(cancel)
                 AIService._debug_response(resp)
                 txt = (getattr(resp, "text", "") or "").strip()
                 if txt:
                     return txt
-            except ClientError as e:
+            except sdk.ClientError as e:
                 last_error = e
-                if "RESOURCE_EXHAUSTED" in str(e) or getattr(e, "status_code", None) == 429:
-                    time.sleep(0.9)
+                failed.add(model)
+                if _is_rate_limited(e):
+                    _sleep(0.9, cancel)
                     continue
                 break
             except Exception as e:
@@ -96,4 +172,6 @@ class AIService:
         
         if last_error:
             print("[LLM] error:", repr(last_error))
+        if fallback:
+            return fallback()
         return "Thanks. What was the biggest technical challenge you faced, and how did you handle it?"
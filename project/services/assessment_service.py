@@ -0,0 +1,110 @@
+"""Incremental per-answer assessment (the map stage of feedback)."""
+import json
+import re
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import List, Optional
+
+from config.settings import ASSESS_WORKERS
+from prompts.system_prompts import TURN_ASSESSMENT_SYSTEM
+from services.ai_service import AIService
+from services.token_service import Section, build_prompt
+
+_executor = ThreadPoolExecutor(max_workers=ASSESS_WORKERS, thread_name_prefix="assess")
+
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+
+
+def _clip(text, words: int) -> str:
+    return " ".join(str(text or "").split()[:words])
+
+
+def _score(v) -> Optional[int]:
+    try:
+        v = int(round(float(v)))
+    except (TypeError, ValueError):
+        return None
+    return v if 1 <= v <= 10 else None
+
+
+def parse_record(raw: str) -> Optional[dict]:
+    """Validate the model's JSON into a compact record; None if unusable."""
+    m = _JSON_RE.search(raw or "")
+    if not m:
+        return None
+    try:
+        data = json.loads(m.group(0))
+    except ValueError:
+        return None
+    if not isinstance(data, dict):
+        return None
+    rec = {
+        "topic": _clip(data.get("topic"), 5),
+        "communication": _score(data.get("communication")),
+        "technical": _score(data.get("technical")),
+        "strengths": [_clip(x, 15) for x in (data.get("strengths") or []) if x][:2],
+        "gaps": [_clip(x, 15) for x in (data.get("gaps") or []) if x][:2],
+        "evidence": _clip(data.get("evidence"), 20),
+    }
+    if rec["communication"] is None and rec["technical"] is None:
+        return None
+    return rec
+
+
+def format_record(rec: dict) -> str:
+    """One compact line per answer for the reduce prompt."""
+    parts = [f"Q{rec['turn']} [{rec.get('topic') or 'general'}]",
+             f"comm={rec.get('communication') or '?'}", f"tech={rec.get('technical') or '?'}"]
+    if rec.get("strengths"):
+        parts.append("+ " + "; ".join(rec["strengths"]))
+    if rec.get("gaps"):
+        parts.append("- " + "; ".join(rec["gaps"]))
+    if rec.get("evidence"):
+        parts.append(f'evidence: "{rec["evidence"]}"')
+    return " | ".join(parts)
+
+
+class AssessmentService:
+    """Scores each answered question in the background as the interview runs."""
+
+    @staticmethod
+    def _assess(question: str, answer: str, turn: int) -> Optional[dict]:
+        prompt = build_prompt([
+            Section("system", f"{TURN_ASSESSMENT_SYSTEM}\n", trim="keep"),
+            Section("question", f"QUESTION: {question}", trim="keep"),
+            Section("answer", f"ANSWER: {answer or '(no answer captured)'}\n", priority=1, trim="head"),
+        ], "assessment")
+        try:
+            rec = parse_record(AIService.complete(prompt, temperature=0.1, max_tokens=200,
+                                                  json_mode=True, call_class="assessment"))
+        except Exception as e:
+            print("[ASSESS] error:", e)
+            return None
+        if rec is not None:
+            rec["turn"] = turn
+        return rec
+
+    @staticmethod
+    def schedule(state, question: Optional[str], answer: str):
+        """Queue assessment of the answer just appended to ``state.conversation``; returns its future."""
+        if not question:
+            return None
+        turn = len(state.conversation) - 1
+        future = _executor.submit(AssessmentService._assess, question, answer, turn)
+        state.assessment_futures.append(future)
+        return future
+
+    @staticmethod
+    def discard(state, future):
+        """Forget an assessment whose answer was dropped (cancelled turn); a running one is ignored."""
+        if future is not None and future in state.assessment_futures:
+            state.assessment_futures.remove(future)
+            future.cancel()
+
+    @staticmethod
+    def collect(state, timeout: float) -> List[dict]:
+        """Wait (bounded) for in-flight assessments and return finished records in turn order."""
+        futures = list(state.assessment_futures)
+        if futures:
+            wait(futures, timeout=timeout)
+        records = [f.result() for f in futures if f.done() and not f.exception()]
+        return sorted((r for r in records if r), key=lambda r: r["turn"])
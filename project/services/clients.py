@@ -0,0 +1,270 @@
+"""Provider clients, built lazily on first use or by a background warmup.
+
+Nothing here imports google-cloud/google-genai at module import time, so the
+app can bind its port and serve static pages before any SDK is loaded.
+Warmup also opens the connections (TLS + auth) and a keeper thread keeps
+them alive, so the first turn runs on the same warm channels as the tenth.
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+
+from config.settings import (
+    PROJECT_ID, LOCATION, USE_VERTEX, API_KEY, GENAI_PROVIDER, SPEECH_PROVIDER, GEMINI_MODEL, validate_config,
+    CLIENT_KEEPALIVE_SEC, GRPC_KEEPALIVE_MS, CLIENT_CONNECT_TIMEOUT_SEC,
+)
+
+_SCOPES = ["https://www.googleapis.com/auth/cloud-platform"]
+
+
+class LazyClient:
+    """Builds its client once, on the first get(); concurrent callers wait for that one build.
+
+    ``ping(value)`` (optional) opens or re-opens the client's connection; the
+    keeper calls it when the client has been idle for CLIENT_KEEPALIVE_SEC.
+    """
+
+    def __init__(self, name: str, factory, ping=None):
+        self.name = name
+        self._factory = factory
+        self._ping = ping
+        self._lock = threading.Lock()
+        self._value = None
+        self.build_ms = None
+        self.last_used = 0.0
+        self.healthy = True
+
+    @property
+    def ready(self) -> bool:
+        return self._value is not None
+
+    def get(self):
+        if self._value is None:
+            with self._lock:
+                if self._value is None:
+                    t0 = time.time()
+                    value = self._factory()
+                    self.build_ms = int((time.time() - t0) * 1000)
+                    print(f"[CLIENTS] {self.name} ready in {self.build_ms} ms")
+                    self._value = value
+        self.last_used = time.time()
+        return self._value
+
+    def ping(self) -> bool:
+        """Open/refresh the connection; False (and logged once) while it can't reconnect."""
+        if self._ping is None or self._value is None:
+            return True
+        try:
+            self._ping(self._value)
+        except Exception as e:
+            if self.healthy:
+                print(f"[CLIENTS] {self.name} connection lost, reconnecting in background:", e)
+            self.healthy = False
+            return False
+        if not self.healthy:
+            print(f"[CLIENTS] {self.name} reconnected")
+        self.healthy = True
+        self.last_used = time.time()
+        return True
+
+    def status(self) -> dict:
+        return {"ready": self.ready, "build_ms": self.build_ms, "healthy": self.healthy,
+                "idle_sec": int(time.time() - self.last_used) if self.last_used else None}
+
+
+def _load_credentials():
+    """ADC credentials with a token already fetched; STT and TTS share them."""
+    import google.auth
+    from google.auth.transport.requests import Request
+    creds, _ = google.auth.default(scopes=_SCOPES)
+    creds.refresh(Request())
+    return creds
+
+
+def _refresh_credentials():
+    """Refresh the shared token ahead of expiry instead of inside the next call."""
+    if not credentials.ready:
+        return
+    creds = credentials.get()
+    if creds.valid:
+        return
+    try:
+        from google.auth.transport.requests import Request
+        creds.refresh(Request())
+    except Exception as e:
+        print("[CLIENTS] credentials refresh error:", e)
+
+
+def _grpc_options() -> list:
+    return [
+        ("grpc.keepalive_time_ms", GRPC_KEEPALIVE_MS),
+        ("grpc.keepalive_timeout_ms", 10000),
+        ("grpc.keepalive_permit_without_calls", 1),
+        ("grpc.http2.max_pings_without_data", 0),
+    ]
+
+
+def _grpc_client(client_cls, transport_cls):
+    """Client on one long-lived keepalive channel (gRPC multiplexes concurrent calls over it)."""
+    try:
+        channel = transport_cls.create_channel(credentials=credentials.get(), scopes=_SCOPES,
+                                               options=_grpc_options())
+        return client_cls(transport=transport_cls(channel=channel))
+    except Exception as e:
+        print(f"[CLIENTS] {client_cls.__name__}: keepalive channel unavailable, using default transport:", e)
+        return client_cls()
+
+
+def _ping_grpc(client):
+    """Connect the channel (or reconnect it after an idle drop); no RPC is sent."""
+    if not client:
+        return
+    import grpc
+    channel = getattr(client.transport, "grpc_channel", None)
+    if channel is not None:
+        grpc.channel_ready_future(channel).result(timeout=CLIENT_CONNECT_TIMEOUT_SEC)
+
+
+def _genai_sdk():
+    """Module namespace: Client, types, ClientError (real SDK or the local stand-in)."""
+    if GENAI_PROVIDER == "local":
+        from services import local_model
+        return SimpleNamespace(Client=local_model.Client, types=local_model.types,
+                               ClientError=local_model.ClientError, HttpOptions=None)
+    from google import genai
+    from google.genai import types
+    from google.genai.errors import ClientError
+    return SimpleNamespace(Client=genai.Client, types=types, ClientError=ClientError,
+                           HttpOptions=types.HttpOptions)
+
+
+def _http_options(sdk, api_version: str):
+    """HttpOptions whose connection pool outlives the keeper's ping interval (older SDKs: defaults)."""
+    try:
+        import httpx
+        keep = max(CLIENT_KEEPALIVE_SEC * 2, 30)
+        return sdk.HttpOptions(api_version=api_version,
+                               client_args={"limits": httpx.Limits(keepalive_expiry=keep)})
+    except Exception:
+        return sdk.HttpOptions(api_version=api_version)
+
+
+def _build_genai():
+    validate_config()
+    sdk = genai_sdk.get()
+    if GENAI_PROVIDER == "local":
+        print("[GENAI] Using local stand-in model")
+        return sdk.Client()
+    if USE_VERTEX == "1":
+        client = sdk.Client(
+            vertexai=True,
+            project=PROJECT_ID,
+            location=LOCATION,
+            http_options=_http_options(sdk, "v1"),
+        )
+        print("[GENAI] Using Vertex AI (v1) via ADC")
+        return client
+    print("[GENAI] Using AI Studio API key (v1beta)")
+    return sdk.Client(api_key=API_KEY, http_options=_http_options(sdk, "v1beta"))
+
+
+def _ping_genai(client):
+    """Model metadata lookup: opens TLS and fetches auth without spending generation quota."""
+    if GENAI_PROVIDER != "local":
+        client.models.get(model=GEMINI_MODEL)
+
+
+def _build_stt():
+    """SpeechClient, or False under SPEECH_PROVIDER=local (speech_service uses its stand-in)."""
+    if SPEECH_PROVIDER == "local":
+        return False
+    from google.cloud import speech_v2
+    from google.cloud.speech_v2.services.speech.transports import SpeechGrpcTransport
+    return _grpc_client(speech_v2.SpeechClient, SpeechGrpcTransport)
+
+
+def _build_tts():
+    if SPEECH_PROVIDER == "local":
+        return False
+    from google.cloud import texttospeech
+    from google.cloud.texttospeech_v1.services.text_to_speech.transports import TextToSpeechGrpcTransport
+    return _grpc_client(texttospeech.TextToSpeechClient, TextToSpeechGrpcTransport)
+
+
+def _load_pydub():
+    """AudioSegment class, or False when pydub isn't installed."""
+    try:
+        from pydub import AudioSegment
+        return AudioSegment
+    except Exception:
+        return False
+
+
+credentials = LazyClient("credentials", _load_credentials)
+genai_sdk = LazyClient("genai-sdk", _genai_sdk)
+genai = LazyClient("genai", _build_genai, ping=_ping_genai)
+stt = LazyClient("stt", _build_stt, ping=_ping_grpc)
+tts = LazyClient("tts", _build_tts, ping=_ping_grpc)
+pydub = LazyClient("pydub", _load_pydub)
+
+ALL = (genai, stt, tts, pydub)
+
+_keeper = None
+_keeper_lock = threading.Lock()
+
+
+def warmup() -> dict:
+    """Build every client and open its connection, in parallel; returns {name: ms or error string}."""
+    def _one(c):
+        t0 = time.time()
+        try:
+            c.get()
+        except Exception as e:
+            print(f"[CLIENTS] {c.name} warmup failed:", e)
+            return c.name, f"error: {e}"
+        c.ping()
+        return c.name, int((time.time() - t0) * 1000)
+    with ThreadPoolExecutor(max_workers=len(ALL), thread_name_prefix="warmup") as pool:
+        return dict(pool.map(_one, ALL))
+
+
+def keepalive_once():
+    """One keeper pass: refresh the token if due, ping clients idle for CLIENT_KEEPALIVE_SEC."""
+    _refresh_credentials()
+    now = time.time()
+    for c in ALL:
+        if c.ready and (not c.healthy or now - c.last_used >= CLIENT_KEEPALIVE_SEC):
+            c.ping()
+
+
+def _keep_alive():
+    while True:
+        time.sleep(CLIENT_KEEPALIVE_SEC)
+        try:
+            keepalive_once()
+        except Exception as e:
+            print("[CLIENTS] keepalive error:", e)
+
+
+def start_keeper():
+    """Start the keepalive/reconnect thread once (no-op when CLIENT_KEEPALIVE_SEC is 0)."""
+    global _keeper
+    if CLIENT_KEEPALIVE_SEC <= 0:
+        return
+    with _keeper_lock:
+        if _keeper is None:
+            _keeper = threading.Thread(target=_keep_alive, name="client-keepalive", daemon=True)
+            _keeper.start()
+
+
+def warmup_async():
+    """Warm up off the serving path, then keep the connections alive."""
+    def _run():
+        warmup()
+        start_keeper()
+    threading.Thread(target=_run, name="client-warmup", daemon=True).start()
+
+
+def status() -> dict:
+    return {c.name: c.status() for c in (credentials,) + ALL}
@@ -0,0 +1,360 @@
+"""Static analysis and sandboxed execution of coding submissions."""
+import ast
+import builtins
+import os
+import re
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+
+from config.settings import (
+    CODE_EVAL_WORKERS, CODE_EVAL_CPU_SEC, CODE_EVAL_MEM_MB, CODE_EVAL_WALL_SEC, CODE_EVAL_MAX_TESTS,
+    CODE_EVAL_UID,
+)
+
+try:
+    import resource  # POSIX only; execution is disabled without it
+except ImportError:
+    resource = None
+
+MAX_OUTPUT_CHARS = 4096
+
+# Built-in exception names; the child reports a failure as 10 + index, never as text.
+# The range stays below the shell's 125-127 (exec failures) and 128+ (signals).
+_EXCEPTION_NAMES = sorted(n for n, v in vars(builtins).items()
+                          if isinstance(v, type) and issubclass(v, BaseException))
+_EXIT_EXCEPTION_BASE = 10
+_EXIT_SANDBOX_SETUP = 120
+
+# Runs inside the child interpreter: apply rlimits to itself, then exec the submission.
+# Output never leaves the server except as pass/fail; errors leave only as an exit code.
+_BOOTSTRAP = r"""
+import builtins, os, resource, sys
+cpu, mem, path = int(sys.argv[1]), int(sys.argv[2]), sys.argv[3]
+resource.setrlimit(resource.RLIMIT_CPU, (cpu, cpu + 1))
+resource.setrlimit(resource.RLIMIT_AS, (mem, mem))
+resource.setrlimit(resource.RLIMIT_FSIZE, (1 << 20, 1 << 20))
+resource.setrlimit(resource.RLIMIT_NPROC, (0, 0))
+names = sorted(n for n, v in vars(builtins).items() if isinstance(v, type) and issubclass(v, BaseException))
+src = open(path, encoding="utf-8").read()
+sys.argv = ["submission.py"]
+try:
+    exec(compile(src, "submission.py", "exec"), {"__name__": "__main__"})
+except SystemExit as e:
+    sys.stdout.flush()
+    os._exit(0 if e.code in (None, 0) else 1)
+except BaseException as e:
+    t = type(e)
+    while t.__name__ not in names or getattr(builtins, t.__name__) is not t:
+        t = t.__base__
+    sys.stdout.flush()
+    os._exit(%d + names.index(t.__name__))
+""" % _EXIT_EXCEPTION_BASE
+
+# Runs as root of fresh mount/pid/net namespaces: build a read-only tmpfs root holding only
+# the system and Python install directories plus the submission, then chroot into it and
+# exec the interpreter with every capability dropped (and, when the server is root, as CODE_EVAL_UID).
+_SANDBOX_SH = r"""
+root=$1; src=$2; shift 2
+mount -t tmpfs -o size=4m,mode=755 sandbox "$root" || exit %(fail)d
+mkdir -p "$root/dev" "$root/sandbox" || exit %(fail)d
+for n in null zero urandom; do
+    : > "$root/dev/$n" && mount --bind "/dev/$n" "$root/dev/$n" || exit %(fail)d
+done
+mount --bind "$src" "$root/sandbox" && mount -o remount,bind,ro "$root/sandbox" || exit %(fail)d
+for d in "$@"; do
+    if [ -L "$d" ]; then
+        mkdir -p "$root$(dirname "$d")" && ln -s "$(readlink "$d")" "$root$d" || exit %(fail)d
+    elif [ -d "$d" ]; then
+        mkdir -p "$root$d" && mount --rbind "$d" "$root$d" && mount -o remount,bind,ro "$root$d" || exit %(fail)d
+    fi
+done
+mount -o remount,bind,ro "$root" || exit %(fail)d
+cd "$root" || exit %(fail)d
+# Not exec: the interpreter must not be the pid namespace's init, which ignores SIGXCPU and friends
+%(chroot)s "$root" %(setpriv)s %(privs)s -- %(python)s
+exit $?
+"""
+
+# Host directories visible (read-only) inside the sandbox
+_SYSTEM_DIRS = ["/usr", "/bin", "/lib", "/lib64", "/lib32", "/sbin"]
+
+_DS_CALLS = {
+    "dict": "dict", "set": "set", "list": "list", "tuple": "tuple", "frozenset": "set",
+    "deque": "deque", "defaultdict": "dict", "Counter": "counter", "OrderedDict": "dict",
+    "heappush": "heap", "heapify": "heap", "heappop": "heap", "bisect_left": "binary search",
+    "bisect_right": "binary search", "bisect": "binary search", "sorted": "sorting", "sort": "sorting",
+    "lru_cache": "memoization", "cache": "memoization",
+}
+
+_SIGNAL_ERRORS = {-24: "CPU time limit exceeded", -9: "killed (resource limit)", -11: "segmentation fault",
+                  -25: "output file size limit exceeded"}
+
+_executor = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=CODE_EVAL_WORKERS, thread_name_prefix="code-eval")
+    return _executor
+
+
+def detect_language(code: str, lang: Optional[str]) -> str:
+    """Normalize the client's language hint; sniff Python when none was given."""
+    lang = (lang or "text").strip().lower()
+    if lang in ("py", "python", "python3"):
+        return "python"
+    if lang not in ("", "text", "plain", "auto"):
+        return lang
+    if re.search(r"^\s*(def |class |import |from \S+ import |print\()", code, re.MULTILINE):
+        try:
+            ast.parse(code)
+            return "python"
+        except SyntaxError:
+            pass
+    return "text"
+
+
+class _FeatureVisitor(ast.NodeVisitor):
+    def __init__(self):
+        self.loop_depth = 0
+        self.max_loop_depth = 0
+        self.functions = []
+        self.recursive = set()
+        self.structures = set()
+        self.imports = set()
+        self._func_stack = []
+
+    def _loop(self, node):
+        self.loop_depth += 1
+        self.max_loop_depth = max(self.max_loop_depth, self.loop_depth)
+        self.generic_visit(node)
+        self.loop_depth -= 1
+
+    visit_For = visit_While = visit_AsyncFor = _loop
+
+    def visit_comprehension_node(self, node, kind):
+        self.structures.add(kind)
+        depth = len(node.generators)
+        self.max_loop_depth = max(self.max_loop_depth, self.loop_depth + depth)
+        self.generic_visit(node)
+
+    def visit_ListComp(self, node):
+        self.visit_comprehension_node(node, "list")
+
+    def visit_SetComp(self, node):
+        self.visit_comprehension_node(node, "set")
+
+    def visit_DictComp(self, node):
+        self.visit_comprehension_node(node, "dict")
+
+    def visit_GeneratorExp(self, node):
+        self.visit_comprehension_node(node, "generator")
+
+    def visit_FunctionDef(self, node):
+        self.functions.append(node.name)
+        self._func_stack.append(node.name)
+        saved, self.loop_depth = self.loop_depth, 0
+        self.generic_visit(node)
+        self.loop_depth = saved
+        self._func_stack.pop()
+
+    visit_AsyncFunctionDef = visit_FunctionDef
+
+    def visit_Call(self, node):
+        name = node.func.id if isinstance(node.func, ast.Name) else getattr(node.func, "attr", None)
+        if name and self._func_stack and name == self._func_stack[-1]:
+            self.recursive.add(name)
+        if name in _DS_CALLS:
+            self.structures.add(_DS_CALLS[name])
+        self.generic_visit(node)
+
+    def visit_List(self, node):
+        self.structures.add("list")
+        self.generic_visit(node)
+
+    def visit_Dict(self, node):
+        self.structures.add("dict")
+        self.generic_visit(node)
+
+    def visit_Set(self, node):
+        self.structures.add("set")
+        self.generic_visit(node)
+
+    def visit_Import(self, node):
+        self.imports.update(a.name.split(".")[0] for a in node.names)
+
+    def visit_ImportFrom(self, node):
+        if node.module:
+            self.imports.add(node.module.split(".")[0])
+        self.generic_visit(node)
+
+
+def analyze(code: str, lang: str) -> dict:
+    """Cheap static features; AST-based for Python, keyword counts otherwise."""
+    features = {"lang": lang, "lines": len([l for l in code.splitlines() if l.strip()])}
+    if lang != "python":
+        features["loops"] = len(re.findall(r"\b(for|while)\b", code))
+        return features
+    try:
+        tree = ast.parse(code)
+    except SyntaxError as e:
+        features["syntax_error"] = f"line {e.lineno}: {e.msg}"
+        return features
+    v = _FeatureVisitor()
+    v.visit(tree)
+    features.update({
+        "functions": v.functions,
+        "max_loop_depth": v.max_loop_depth,
+        "recursion": sorted(v.recursive),
+        "structures": sorted(v.structures),
+        "imports": sorted(v.imports),
+    })
+    return features
+
+
+_SANDBOX_PATH = os.pathsep.join([os.defpath, "/usr/sbin", "/sbin"])
+
+
+def _tool(name: str) -> Optional[str]:
+    return shutil.which(name, path=_SANDBOX_PATH)
+
+
+def sandbox_available() -> bool:
+    return all(_tool(n) for n in ("unshare", "setpriv", "chroot", "sh"))
+
+
+def _sandbox_cmd(workdir: str) -> List[str]:
+    """unshare + chroot + setpriv command line for one run of workdir/src/submission.py."""
+    if os.geteuid() == 0:
+        ns = [_tool("unshare"), "--mount", "--net", "--pid", "--ipc", "--uts", "--fork", "--kill-child"]
+        privs = f"--reuid={CODE_EVAL_UID} --regid={CODE_EVAL_UID} --clear-groups"
+    else:
+        # Unprivileged server: a user namespace maps the server's uid to root for the mounts only
+        ns = [_tool("unshare"), "--user", "--map-root-user", "--mount", "--net", "--pid", "--ipc", "--uts", "--fork",
+              "--kill-child"]
+        privs = ""
+    privs += " --bounding-set=-all --inh-caps=-all --no-new-privs"
+    python = " ".join(shlex.quote(a) for a in [
+        sys.executable, "-I", "-S", "-c", _BOOTSTRAP,
+        str(CODE_EVAL_CPU_SEC), str(CODE_EVAL_MEM_MB * 1024 * 1024), "/sandbox/submission.py",
+    ])
+    script = _SANDBOX_SH % {"fail": _EXIT_SANDBOX_SETUP, "privs": privs, "python": python,
+                            "chroot": _tool("chroot"), "setpriv": _tool("setpriv")}
+    dirs = _SYSTEM_DIRS + sorted({sys.base_prefix, sys.prefix} - {"/usr", "/usr/local", "/"})
+    if not any(sys.base_prefix.startswith(d + "/") for d in _SYSTEM_DIRS) and "/usr" not in dirs:
+        dirs.append("/usr")
+    return ns + [_tool("sh"), "-c", script, "sandbox",
+                 os.path.join(workdir, "root"), os.path.join(workdir, "src")] + dirs
+
+
+def _error_category(returncode: int) -> dict:
+    """Fixed status/error for a failed run; nothing the submission printed is passed through."""
+    if returncode > 128:  # signal deaths come back through sh/unshare as 128 + signal
+        returncode = 128 - returncode
+    if returncode in _SIGNAL_ERRORS:
+        return {"status": "timeout" if returncode == -24 else "error", "error": _SIGNAL_ERRORS[returncode]}
+    if returncode == _EXIT_SANDBOX_SETUP or 125 <= returncode <= 127:
+        return {"status": "skipped", "error": "sandbox unavailable"}
+    idx = returncode - _EXIT_EXCEPTION_BASE
+    if 0 <= idx < len(_EXCEPTION_NAMES):
+        name = _EXCEPTION_NAMES[idx]
+        return {"status": "error", "error": "memory limit exceeded" if name == "MemoryError" else name}
+    return {"status": "error", "error": "non-zero exit"}
+
+
+def _run_case(workdir: str, stdin: str) -> dict:
+    t0 = time.time()
+    try:
+        proc = subprocess.run(_sandbox_cmd(workdir), input=stdin, capture_output=True, text=True, cwd=workdir,
+                              timeout=CODE_EVAL_WALL_SEC, env={"PYTHONIOENCODING": "utf-8", "PATH": _SANDBOX_PATH})
+    except subprocess.TimeoutExpired:
+        return {"status": "timeout", "ms": int((time.time() - t0) * 1000)}
+    out = {"ms": int((time.time() - t0) * 1000), "stdout": proc.stdout[:MAX_OUTPUT_CHARS]}
+    if proc.returncode != 0:
+        out.update(_error_category(proc.returncode))
+    else:
+        out["status"] = "ok"
+    return out
+
+
+def execute(code: str, tests: Optional[List[dict]] = None) -> dict:
+    """Run a Python submission once per test case (or once with empty stdin) in the sandbox:
+    no network, no host filesystem beyond the interpreter, unprivileged, under rlimits.
+    Refuses to run (ran=False) where that sandbox can't be built.
+    """
+    if resource is None:
+        return {"ran": False, "reason": "sandboxed execution needs a POSIX host"}
+    if not sandbox_available():
+        return {"ran": False, "reason": "sandbox unavailable (needs util-linux unshare/setpriv)"}
+    workdir = tempfile.mkdtemp(prefix="code_eval_")
+    try:
+        os.mkdir(os.path.join(workdir, "root"))
+        os.mkdir(os.path.join(workdir, "src"))
+        with open(os.path.join(workdir, "src", "submission.py"), "w", encoding="utf-8") as f:
+            f.write(code)
+        cases = []
+        for t in (tests or [{"input": "", "expected": None}])[:CODE_EVAL_MAX_TESTS]:
+            r = _run_case(workdir, str(t.get("input") or ""))
+            if r["status"] == "skipped":
+                return {"ran": False, "reason": r["error"]}
+            expected = t.get("expected")
+            if expected is not None and r["status"] == "ok":
+                r["status"] = "pass" if r["stdout"].strip() == str(expected).strip() else "fail"
+            r.pop("stdout", None)
+            cases.append(r)
+        result = {"ran": True, "cases": cases}
+        if tests:
+            result["passed"] = sum(1 for c in cases if c["status"] == "pass")
+            result["total"] = len(cases)
+        return result
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def summarize(features: dict, execution: Optional[dict] = None) -> str:
+    """One-line structured summary for prompts and feedback."""
+    parts = [f"lang={features.get('lang')}", f"lines={features.get('lines')}"]
+    if features.get("syntax_error"):
+        parts.append(f"syntax_error=({features['syntax_error']})")
+    if "max_loop_depth" in features:
+        d = features["max_loop_depth"]
+        parts.append(f"loop_depth={d}" + (f" (~O(n^{d}) if loops span the input)" if d > 1 else ""))
+        parts.append("structures=" + (",".join(features["structures"]) or "none"))
+        parts.append("recursion=" + (",".join(features["recursion"]) or "no"))
+        if features.get("imports"):
+            parts.append("imports=" + ",".join(features["imports"]))
+    elif "loops" in features:
+        parts.append(f"loops={features['loops']}")
+    if execution:
+        if not execution.get("ran"):
+            parts.append("execution=skipped")
+        elif "total" in execution:
+            parts.append(f"tests={execution['passed']}/{execution['total']} passed")
+        else:
+            c = execution["cases"][0]
+            parts.append(f"run={c['status']}" + (f" ({c['error']})" if c.get("error") else ""))
+        bad = [c for c in execution.get("cases", []) if c["status"] in ("timeout", "error")]
+        if bad and "total" in execution:
+            parts.append(f"errors={len(bad)} (first: {bad[0].get('error') or bad[0]['status']})")
+    return "; ".join(parts)
+
+
+class CodeEvalService:
+    """Analyzes submissions inline and runs them on a bounded worker pool."""
+
+    @staticmethod
+    def submit(code: str, lang: Optional[str], tests: Optional[List[dict]] = None):
+        """Return (features, future|None); the future resolves to the execution result."""
+        lang = detect_language(code, lang)
+        features = analyze(code, lang)
+        future = None
+        if lang == "python" and code.strip() and "syntax_error" not in features:
+            future = _get_executor().submit(execute, code, tests)
+        return features, future
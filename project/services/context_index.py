@@ -0,0 +1,124 @@
+"""Section-level BM25 index over the resume and job description."""
+import math
+import re
+from collections import Counter, defaultdict
+from typing import List, Optional
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+_HEADING_RE = re.compile(r"^\s*(?:[A-Z][A-Za-z &/\-]{2,40}:?|[A-Z0-9 &/\-]{3,40})\s*$")
+
+_STOPWORDS = frozenset("""
+a an and are as at be been but by can could did do does for from had has have how i if in into is it its
+me my of on or our so than that the their them then there these they this to was we were what when where
+which while who why will with would you your yours about also just like more most very over such
+""".split())
+
+MAX_SECTION_CHARS = 600
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens with stopwords removed (keeps c++, c#, node.js)."""
+    return [t for t in _TOKEN_RE.findall((text or "").lower()) if t not in _STOPWORDS]
+
+
+def split_sections(text: str, source: str, max_chars: int = MAX_SECTION_CHARS) -> List[dict]:
+    """Split a document into heading/paragraph sections of at most ``max_chars``."""
+    sections = []
+    heading = None
+    buf: List[str] = []
+
+    def flush():
+        body = "\n".join(buf).strip()
+        buf.clear()
+        if not body:
+            return
+        while body:
+            chunk = body[:max_chars]
+            if len(body) > max_chars:
+                cut = chunk.rfind("\n")
+                if cut < max_chars // 3:
+                    cut = chunk.rfind(" ")
+                if cut > 0:
+                    chunk = chunk[:cut]
+            body = body[len(chunk):].strip()
+            sections.append({"source": source, "heading": heading, "text": chunk.strip()})
+
+    lines = (text or "").splitlines()
+    candidates = [bool(_HEADING_RE.match(l)) and len(l.split()) <= 5 for l in lines]
+    nonblank = [i for i, l in enumerate(lines) if l.strip()]
+    # A heading must introduce body text; runs like "Jane Doe / Software Engineer" are content.
+    is_heading = {i for i, j in zip(nonblank, nonblank[1:]) if candidates[i] and not candidates[j]}
+
+    for i, line in enumerate(lines):
+        if not line.strip():
+            if sum(len(l) for l in buf) >= max_chars // 2:
+                flush()
+            continue
+        if i in is_heading:
+            flush()
+            heading = line.strip().rstrip(":")
+            continue
+        buf.append(line.rstrip())
+    flush()
+    return sections
+
+
+class ContextIndex:
+    """Okapi BM25 over resume/JD sections, built once per session.
+
+    Per-(term, section) scores are precomputed at build time so a query is
+    just a handful of dict lookups and additions.
+    """
+
+    def __init__(self, sections: List[dict], k1: float = 1.5, b: float = 0.75):
+        self.sections = sections
+        self._postings = defaultdict(list)
+        lengths = []
+        counts = []
+        for s in sections:
+            tf = Counter(tokenize(f"{s['heading'] or ''} {s['text']}"))
+            counts.append(tf)
+            lengths.append(sum(tf.values()))
+        n = len(sections)
+        avgdl = (sum(lengths) / n) if n else 0.0
+        df = Counter(t for tf in counts for t in tf)
+        for i, tf in enumerate(counts):
+            norm = k1 * (1 - b + b * (lengths[i] / avgdl if avgdl else 0.0))
+            for term, f in tf.items():
+                idf = math.log(1 + (n - df[term] + 0.5) / (df[term] + 0.5))
+                self._postings[term].append((i, idf * f * (k1 + 1) / (f + norm)))
+
+    @classmethod
+    def build(cls, resume: str, job: str) -> "ContextIndex":
+        """Index the resume and job description as separate sources."""
+        return cls(split_sections(resume, "resume") + split_sections(job, "job"))
+
+    def search(self, query: str, top_k: int = 4) -> List[int]:
+        """Return indices of the ``top_k`` best-matching sections."""
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            for i, w in self._postings.get(term, ()):
+                scores[i] += w
+        return sorted(scores, key=scores.__getitem__, reverse=True)[:top_k]
+
+    def render(self, query: Optional[str], top_k: int = 4) -> str:
+        """Render the relevant sections in document order under RESUME/JD headers.
+
+        With no matches (e.g. the opening turn) the leading section of each
+        source is used so the model still sees who the candidate is.
+        """
+        picked = set(self.search(query or "", top_k)) if query else set()
+        if not picked:
+            seen = set()
+            for i, s in enumerate(self.sections):
+                if s["source"] not in seen:
+                    seen.add(s["source"])
+                    picked.add(i)
+        blocks = {"resume": [], "job": []}
+        for i in sorted(picked):
+            s = self.sections[i]
+            blocks[s["source"]].append(f"[{s['heading']}]\n{s['text']}" if s["heading"] else s["text"])
+        return (
+            "=== RESUME (relevant sections) ===\n" + ("\n\n".join(blocks["resume"]) or "(none)")
+            + "\n\n=== JOB DESCRIPTION (relevant sections) ===\n" + ("\n\n".join(blocks["job"]) or "(none)")
+        )
@@ -0,0 +1,187 @@
+"""Local skill/topic coverage tracking for interview steering."""
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+# Common technical vocabulary; resume/JD skill lists are added on top of this.
+# Only forms that can't be ordinary English are listed ("golang", not "go"; "rest api", not "rest").
+KNOWN_SKILLS = (
+    "python", "java", "javascript", "typescript", "golang", "rust", "c++", "c#", "kotlin", "swiftui",
+    "ruby", "php", "scala", "sql", "nosql", "html", "css", "react", "angular", "vue", "node.js", "django",
+    "flask", "fastapi", "spring boot", "express.js", ".net", "graphql", "rest api", "grpc", "microservices",
+    "docker", "kubernetes", "terraform", "ansible", "jenkins", "ci/cd", "github actions", "aws", "azure",
+    "gcp", "google cloud", "linux", "kafka", "rabbitmq", "redis", "postgresql", "mysql", "mongodb",
+    "elasticsearch", "spark", "hadoop", "airflow", "snowflake", "bigquery", "tableau", "power bi", "ms excel",
+    "pandas", "numpy", "scikit-learn", "tensorflow", "pytorch", "keras", "machine learning", "deep learning",
+    "nlp", "computer vision", "llm", "transformers", "data structures", "algorithms", "system design",
+    "distributed systems", "caching", "load balancing", "unit testing", "integration testing", "test automation",
+    "agile", "scrum", "git", "statistics", "data visualization", "etl", "api design", "application security",
+    "cybersecurity", "tcp/ip",
+)
+
+# Alternate spellings matched anywhere; each maps to a KNOWN_SKILLS form and is itself unambiguous.
+ALIASES = {
+    "k8s": "kubernetes", "postgres": "postgresql", "nodejs": "node.js", "sklearn": "scikit-learn",
+    "gcp": "google cloud", "cicd": "ci/cd", "reactjs": "react", "expressjs": "express.js",
+    "rest apis": "rest api", "restful": "rest api", "restful api": "rest api", "restful apis": "rest api",
+    "spring framework": "spring boot", "microsoft excel": "ms excel",
+}
+
+# Short names that are only a skill inside an explicit "Skills:" list, never in prose
+LIST_ONLY = {
+    "go": "golang", "rest": "rest api", "express": "express.js", "spring": "spring boot", "excel": "ms excel",
+    "node": "node.js", "js": "javascript", "ts": "typescript", "ml": "machine learning", "dl": "deep learning",
+}
+# Common words with no distinctive form; dropped even from skill lists
+AMBIGUOUS = frozenset({"swift", "security", "testing", "networking"})
+
+_SKILL_LINE_RE = re.compile(r"^\s*(?:technical\s+)?(?:skills|technologies|tech stack|tools)\b[^:\n]*:?(.*)$", re.IGNORECASE)
+_WORD_CHARS = frozenset("abcdefghijklmnopqrstuvwxyz0123456789+#")
+
+MAX_FOLLOWUPS = 3  # consecutive questions on one topic before we ask for a pivot
+
+
+class AhoCorasick:
+    """Multi-pattern matcher that reports whole-word hits in one pass over the text."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[str]] = [[]]
+        for p in patterns:
+            self._add(p)
+        self._build()
+
+    def _add(self, pattern: str):
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(pattern)
+
+    def _build(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[nxt] = self._goto[f].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> List[str]:
+        """Return patterns found in ``text`` (lowercased) on word boundaries."""
+        text = (text or "").lower()
+        hits = []
+        node = 0
+        for i, ch in enumerate(text):
+            while node and ch not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(ch, 0)
+            for p in self._out[node]:
+                start = i - len(p) + 1
+                before = text[start - 1] if start > 0 else " "
+                after = text[i + 1] if i + 1 < len(text) else " "
+                if before not in _WORD_CHARS and after not in _WORD_CHARS:
+                    hits.append(p)
+        return hits
+
+
+def extract_skill_vocabulary(resume: str, job: str) -> List[str]:
+    """Skills named in the resume/JD: explicit skill lists plus known terms found in the text."""
+    vocab = []
+    in_list = False
+    for line in f"{resume}\n{job}".splitlines():
+        m = _SKILL_LINE_RE.match(line)
+        if m:
+            items = m.group(1)
+            in_list = not items.strip()  # bare "Skills" heading: the list follows
+        elif in_list and line.strip():
+            items = line
+        else:
+            in_list = False
+            continue
+        for item in re.split(r"[,;|•·]", items):
+            item = item.strip(" -*\t.()").lower()
+            item = LIST_ONLY.get(item, ALIASES.get(item, item))
+            if 1 < len(item) <= 30 and len(item.split()) <= 3 and item not in AMBIGUOUS:
+                vocab.append(item)
+    known = AhoCorasick(list(KNOWN_SKILLS) + list(ALIASES))
+    vocab.extend(ALIASES.get(h, h) for h in known.find(f"{resume}\n{job}"))
+    return list(dict.fromkeys(vocab))
+
+
+class CoverageTracker:
+    """Tracks which resume/JD topics have been probed and how deeply.
+
+    Built once per session from the skill vocabulary. ``sync`` re-folds the
+    counts over the current conversation so dropped or edited turns are
+    reflected; the matcher only runs on turns whose text it hasn't seen.
+    """
+
+    def __init__(self, vocabulary: List[str]):
+        self.vocabulary = vocabulary
+        self._matcher = AhoCorasick(set(vocabulary) | {a for a, t in ALIASES.items() if t in vocabulary})
+        self.asked: Dict[str, int] = {}
+        self.mentioned: Dict[str, int] = {}
+        self.focus: Optional[str] = None
+        self.focus_followups = 0
+        self._topics: Dict[int, tuple] = {}  # id(turn) -> (turn, text, topics)
+
+    @classmethod
+    def build(cls, resume: str, job: str) -> "CoverageTracker":
+        return cls(extract_skill_vocabulary(resume, job))
+
+    def topics_in(self, text: str) -> List[str]:
+        return list(dict.fromkeys(ALIASES.get(h, h) for h in self._matcher.find(text)))
+
+    def _turn_topics(self, turn: dict) -> List[str]:
+        text = turn.get("text") or ""
+        cached = self._topics.get(id(turn))
+        if cached is None or cached[0] is not turn or cached[1] != text:
+            cached = self._topics[id(turn)] = (turn, text, self.topics_in(text))
+        return cached[2]
+
+    def sync(self, conversation: list, probed_topics: set):
+        """Recount from ``conversation`` and mirror asked topics into ``probed_topics``."""
+        turns = list(conversation)
+        live = {id(t) for t in turns}
+        self._topics = {k: v for k, v in self._topics.items() if k in live}
+        probed_topics.difference_update(self.asked)
+        self.asked, self.mentioned = {}, {}
+        self.focus, self.focus_followups = None, 0
+        for turn in turns:
+            topics = self._turn_topics(turn)
+            if turn.get("role") == "assistant":
+                for t in topics:
+                    self.asked[t] = self.asked.get(t, 0) + 1
+                    probed_topics.add(t)
+                if self.focus and self.focus in topics:
+                    self.focus_followups += 1
+                elif topics:
+                    self.focus, self.focus_followups = topics[0], 1
+            else:
+                for t in topics:
+                    self.mentioned[t] = self.mentioned.get(t, 0) + 1
+
+    def uncovered(self) -> List[str]:
+        return [t for t in self.vocabulary if t not in self.asked]
+
+    def hint(self, limit: int = 8) -> str:
+        """Compact steering line for the prompt."""
+        covered = sorted(self.asked, key=self.asked.get, reverse=True)[:limit]
+        parts = [
+            "Covered: " + (", ".join(f"{t}({self.asked[t]})" for t in covered) or "none yet"),
+            "Not yet covered: " + (", ".join(self.uncovered()[:limit]) or "none"),
+        ]
+        if self.focus and self.focus_followups >= MAX_FOLLOWUPS:
+            parts.append(f"'{self.focus}' has had {self.focus_followups} follow-ups; pivot to an uncovered topic.")
+        return "\n".join(parts)
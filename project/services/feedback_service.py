@@ -1,53 +1,224 @@
 """Feedback generation service."""
-import os
+import hashlib
+import json
 import re
-from google.genai import types
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
-from services.ai_service import genai_client, GEMINI_MODEL
-from prompts.system_prompts import FEEDBACK_SYSTEM
+from services.ai_service import AIService
+from services.model_router import model_router
+from services.token_service import Section, build_prompt, estimate_tokens
+from services.turn_executor import Saturated
+from services.assessment_service import format_record
+from prompts.system_prompts import (
+    FEEDBACK_SYSTEM, FEEDBACK_SECTIONS, FEEDBACK_SECTION_SHAPES, FEEDBACK_SECTION_INSTRUCTIONS,
+)
+
+MAX_REDUCE_CONTEXT_CHARS = 1500
+MAX_BULLET_WORDS = 25
+SATURATED_RETRIES = 3  # a section waiting on a full llm_batch stage is retried, not failed
+
+_JSON_RE = re.compile(r"\{.*\}", re.DOTALL)
+# Changes whenever the rubric or section specs change, invalidating memoized reports
+PROMPT_VERSION = hashlib.sha1(
+    (FEEDBACK_SYSTEM + json.dumps(FEEDBACK_SECTIONS, sort_keys=True) + FEEDBACK_SECTION_INSTRUCTIONS).encode("utf-8")
+).hexdigest()[:12]
+
+# Room left in the feedback budget for the rubric and the longest section instruction
+_EVIDENCE_RESERVE = estimate_tokens(FEEDBACK_SYSTEM) + max(
+    estimate_tokens(FEEDBACK_SECTION_INSTRUCTIONS.format(heading=s["heading"], guide=s["guide"],
+                                                         shape=FEEDBACK_SECTION_SHAPES[s["kind"]]))
+    for s in FEEDBACK_SECTIONS)
+
+_section_pool = ThreadPoolExecutor(max_workers=len(FEEDBACK_SECTIONS), thread_name_prefix="feedback")
 
 class FeedbackService:
     """Handles feedback generation."""
-    
+
     @staticmethod
-    def generate_feedback(conversation: list, context: str) -> str:
-        """Generate interview feedback from conversation."""
-        if not conversation:
-            return "No conversation captured. Please run an interview before requesting feedback."
-        
+    def model_name() -> str:
+        """Preferred feedback model (stable across router demotions, so cache keys stay put)."""
+        return model_router.preferred("feedback")
+
+    @staticmethod
+    def cache_key(conversation: list, context: str) -> str:
+        """Hash of everything that determines the report: transcript, context, model, prompt version."""
+        h = hashlib.sha256()
+        h.update(json.dumps([(t.get("role"), t.get("text")) for t in conversation], ensure_ascii=False).encode("utf-8"))
+        h.update(b"\0" + (context or "").encode("utf-8"))
+        h.update(b"\0" + FeedbackService.model_name().encode("utf-8") + b"\0" + PROMPT_VERSION.encode("utf-8"))
+        return h.hexdigest()
+
+    @staticmethod
+    def _transcript(conversation: list, skip_turns=frozenset()) -> str:
         transcript_lines = []
-        for turn in conversation:
+        for i, turn in enumerate(conversation):
+            if i in skip_turns:
+                continue
             role = "Interviewer" if turn["role"] == "assistant" else "Candidate"
             text = (turn.get("text") or "").strip()
             if text:
                 transcript_lines.append(f"{role}: {text}")
-        transcript = "\n".join(transcript_lines)
-        
+        return "\n".join(transcript_lines)
+
+    @staticmethod
+    def _evidence(conversation: list, context: str, assessments: Optional[List[dict]]) -> str:
+        """Evidence block shared by every section call.
+        With per-answer records only answers without a record go in verbatim.
+        Over the feedback token budget, context is cut first, then the earliest transcript turns.
+        """
+        if not assessments:
+            sections = [
+                Section("context", f"{context if context else '(No resume/JD provided)'}\n",
+                        priority=0, trim="head", header="=== CONTEXT ==="),
+                Section("transcript", FeedbackService._transcript(conversation) + "\n",
+                        priority=1, trim="tail", header="=== TRANSCRIPT (chronological) ==="),
+            ]
+            return build_prompt(sections, "feedback", reserve=_EVIDENCE_RESERVE)
+        assessed = {r["turn"] for r in assessments}
+        # Drop assessed answers and the questions that prompted them
+        skip = assessed | {t - 1 for t in assessed if t > 0 and conversation[t - 1]["role"] == "assistant"}
+        remaining = FeedbackService._transcript(conversation, skip)
+        ctx = context[:MAX_REDUCE_CONTEXT_CHARS] if context else "(No resume/JD provided)"
+        sections = [
+            Section("context", f"{ctx}\n", priority=0, trim="head", header="=== CONTEXT (abridged) ==="),
+            Section("assessments", "\n".join(format_record(r) for r in assessments) + "\n", priority=2, trim="tail",
+                    header="=== PER-ANSWER ASSESSMENTS (chronological; scores are 1-10; ratings should follow them) ==="),
+            Section("transcript", f"{remaining or '(none)'}\n", priority=1, trim="tail",
+                    header="=== UNASSESSED TRANSCRIPT TURNS ==="),
+        ]
+        return build_prompt(sections, "feedback", reserve=_EVIDENCE_RESERVE)
+
+    @staticmethod
+    def _validate_section(spec: dict, raw: str) -> Optional[dict]:
+        """Parse and bound one section's JSON; None if it doesn't fit the shape."""
+        m = _JSON_RE.search(raw or "")
+        if not m:
+            return None
+        try:
+            data = json.loads(m.group(0))
+        except ValueError:
+            return None
+        if not isinstance(data, dict):
+            return None
+
+        def bullets(key, limit):
+            items = data.get(key) or []
+            if not isinstance(items, list):
+                items = [items]
+            out = [" ".join(str(x).split()[:MAX_BULLET_WORDS]) for x in items if str(x).strip()]
+            return out[:limit]
+
+        def rating():
+            try:
+                v = int(round(float(data.get("rating"))))
+            except (TypeError, ValueError):
+                return None
+            return v if 1 <= v <= 10 else None
+
+        kind = spec["kind"]
+        if kind in ("summary", "bullets"):
+            section = {"bullets": bullets("bullets", spec["max"])}
+            return section if len(section["bullets"]) >= spec["min"] else None
+        if kind == "rated":
+            section = {"positives": bullets("positives", spec["max"]),
+                       "improvements": bullets("improvements", spec["max"]), "rating": rating()}
+            if spec.get("rating_required", True) and section["rating"] is None:
+                return None
+            return section if section["positives"] or section["improvements"] else None
+        section = {"rating": rating(), "rationale": " ".join(str(data.get("rationale") or "").split()[:40])}
+        return section if section["rating"] is not None else None
+
+    @staticmethod
+    def _generate_section(spec: dict, evidence: str) -> Optional[dict]:
         prompt = f"""{FEEDBACK_SYSTEM}
 
-=== CONTEXT ===
-{context if context else "(No resume/JD provided)"}
+{evidence}
+{FEEDBACK_SECTION_INSTRUCTIONS.format(heading=spec["heading"], guide=spec["guide"],
+                                      shape=FEEDBACK_SECTION_SHAPES[spec["kind"]])}"""
+        for temperature in (0.3, 0.1):
+            for attempt in range(SATURATED_RETRIES + 1):
+                try:
+                    raw = AIService.complete(prompt, temperature=temperature, max_tokens=350,
+                                             json_mode=True, call_class="feedback")
+                    break
+                except Saturated as e:
+                    if attempt == SATURATED_RETRIES:
+                        print(f"[FEEDBACK] section {spec['key']} error:", e)
+                        return None
+                    print(f"[FEEDBACK] section {spec['key']} queued ({e}); retrying")
+                    time.sleep(min(5.0, max(0.5, e.wait_ms / 1000.0)))
+                except Exception as e:
+                    print(f"[FEEDBACK] section {spec['key']} error:", e)
+                    return None
+            section = FeedbackService._validate_section(spec, raw)
+            if section is not None:
+                return section
+        print(f"[FEEDBACK] section {spec['key']} failed validation")
+        return None
 
-=== TRANSCRIPT (chronological) ===
-{transcript}
+    @staticmethod
+    def render(sections: dict) -> str:
+        """Assemble validated sections into the text report layout of FEEDBACK_SYSTEM."""
+        out = ["AI Feedback", ""]
+        for spec in FEEDBACK_SECTIONS:
+            sec = sections.get(spec["key"])
+            out.append(spec["heading"])
+            if sec is None:
+                out.append("- Not available (generation failed).")
+            elif spec["kind"] in ("summary", "bullets"):
+                out.extend(f"- {b}" for b in sec["bullets"])
+            elif spec["kind"] == "rated":
+                out.append("Positives:")
+                out.extend(f"- {b}" for b in sec["positives"] or ["Not observed in transcript."])
+                out.append("Improvements:")
+                out.extend(f"- {b}" for b in sec["improvements"] or ["Not observed in transcript."])
+                if sec["rating"] is not None:
+                    out.append(f"Rating: {sec['rating']}/10")
+            else:
+                out.append(f"- Overall: {sec['rating']}/10")
+                if sec["rationale"]:
+                    out.append(f"- {sec['rationale']}")
+            out.append("")
+        return "\n".join(out).strip()
 
-Now produce the feedback in the required sections and headings.
-"""
-        
-        model_name = os.getenv("GEMINI_FEEDBACK_MODEL", GEMINI_MODEL)
-        try:
-            resp = genai_client.models.generate_content(
-                model=model_name,
-                contents=prompt,
-                config=types.GenerateContentConfig(temperature=0.3, max_output_tokens=1200),
-            )
-            txt = (getattr(resp, "text", "") or "").strip()
-            # Normalize feedback output header
-            if txt:
-                txt = re.sub(r'^(?:\s*AI\s*Feedback\s*[\r\n]+){1,}', 'AI Feedback\n\n', txt, flags=re.IGNORECASE)
-                if not txt.lower().lstrip().startswith('ai feedback'):
-                    txt = 'AI Feedback\n\n' + txt
-            return txt or "Feedback generation returned empty text."
-        except Exception as e:
-            print("[FEEDBACK] error:", e)
-            return f"Failed to generate feedback: {e}"
+    @staticmethod
+    def scores(sections: dict) -> dict:
+        """Rating fields straight from the structured sections."""
+        def rating(key):
+            sec = sections.get(key)
+            return sec.get("rating") if sec else None
+        tech = rating("technical")
+        overall = rating("overall")
+        return {
+            "communication": rating("communication"),
+            "technical": tech,
+            "problem_solving": tech,
+            "job_fit": overall,
+            "overall": overall,
+        }
+
+    @staticmethod
+    def generate_report(conversation: list, context: str, assessments: Optional[List[dict]] = None) -> dict:
+        """Generate all rubric sections concurrently; returns {"text", "sections", "scores"}.
+        Wall-clock time is that of the slowest section.
+        """
+        if not conversation:
+            return {"text": "No conversation captured. Please run an interview before requesting feedback.",
+                    "sections": {}, "scores": FeedbackService.scores({})}
+
+        evidence = FeedbackService._evidence(conversation, context, assessments)
+        futures = {spec["key"]: _section_pool.submit(FeedbackService._generate_section, spec, evidence)
+                   for spec in FEEDBACK_SECTIONS}
+        sections = {key: f.result() for key, f in futures.items()}
+        if not any(sections.values()):
+            return {"text": "Failed to generate feedback: no section could be generated.",
+                    "sections": {}, "scores": FeedbackService.scores({})}
+        return {"text": FeedbackService.render(sections), "sections": sections,
+                "scores": FeedbackService.scores(sections)}
+
+    @staticmethod
+    def generate_feedback(conversation: list, context: str, assessments: Optional[List[dict]] = None) -> str:
+        """Generate interview feedback text from conversation."""
+        return FeedbackService.generate_report(conversation, context, assessments)["text"]
@@ -0,0 +1,280 @@
+"""SQLite-backed feedback repository with full-text search."""
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import List, Optional
+
+from config.settings import FEEDBACK_DB_PATH, FEEDBACK_CACHE_MAX_ENTRIES
+
+_FILE_EPOCH_RE = re.compile(r"^feedback_(\d+)\.txt$")
+_FILE_DT_RE = re.compile(r"^feedback_(\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2})(?:_\d+)?\.txt$")
+_RATING_RE = re.compile(r"^\s*-?\s*(?:Rating|Overall):\s*(\d+)\s*/\s*10", re.IGNORECASE)
+
+# Report headings -> score keys, for reports that only exist as text (migrated files)
+_SCORE_HEADINGS = {
+    "communication & clarity": "communication",
+    "technical depth & problem-solving": "technical",
+    "overall rating": "overall",
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS feedback (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    session_id TEXT,
+    created_at INTEGER NOT NULL,
+    context_hash TEXT,
+    transcript TEXT,
+    scores TEXT,
+    sections TEXT,
+    report TEXT NOT NULL,
+    source TEXT UNIQUE,
+    context TEXT,
+    prompt_version TEXT,
+    rescored_at INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_created ON feedback(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_feedback_session ON feedback(session_id);
+CREATE TABLE IF NOT EXISTS feedback_cache (
+    key TEXT PRIMARY KEY,
+    feedback_id INTEGER NOT NULL REFERENCES feedback(id),
+    spoken_summary TEXT,
+    last_used INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_feedback_cache_used ON feedback_cache(last_used);
+"""
+
+# Columns added after the first release; ALTERed into older databases on open
+_ADDED_COLUMNS = {"context": "TEXT", "prompt_version": "TEXT", "rescored_at": "INTEGER"}
+
+_FTS_SCHEMA = """
+CREATE VIRTUAL TABLE IF NOT EXISTS feedback_fts USING fts5(
+    report, transcript, content='feedback', content_rowid='id'
+);
+CREATE TRIGGER IF NOT EXISTS feedback_ai AFTER INSERT ON feedback BEGIN
+    INSERT INTO feedback_fts(rowid, report, transcript) VALUES (new.id, new.report, new.transcript);
+END;
+CREATE TRIGGER IF NOT EXISTS feedback_ad AFTER DELETE ON feedback BEGIN
+    INSERT INTO feedback_fts(feedback_fts, rowid, report, transcript)
+    VALUES ('delete', old.id, old.report, old.transcript);
+END;
+CREATE TRIGGER IF NOT EXISTS feedback_au AFTER UPDATE ON feedback BEGIN
+    INSERT INTO feedback_fts(feedback_fts, rowid, report, transcript)
+    VALUES ('delete', old.id, old.report, old.transcript);
+    INSERT INTO feedback_fts(rowid, report, transcript) VALUES (new.id, new.report, new.transcript);
+END;
+"""
+
+
+def context_hash(context: str) -> Optional[str]:
+    return hashlib.sha1(context.encode("utf-8")).hexdigest() if context else None
+
+
+def scores_from_text(report: str) -> dict:
+    """Single line-by-line pass pulling section ratings out of a text report."""
+    scores = {}
+    heading = None
+    for line in (report or "").splitlines():
+        key = line.strip().lower()
+        if key in _SCORE_HEADINGS:
+            heading = _SCORE_HEADINGS[key]
+            continue
+        m = _RATING_RE.match(line)
+        if m and heading and heading not in scores and 0 <= int(m.group(1)) <= 10:
+            scores[heading] = int(m.group(1))
+    return scores
+
+
+def _row_to_dict(row, full: bool = False) -> dict:
+    out = {
+        "id": row["id"],
+        "session_id": row["session_id"],
+        "created_at": row["created_at"],
+        "scores": json.loads(row["scores"]) if row["scores"] else {},
+    }
+    keys = row.keys()
+    if "snippet" in keys:
+        out["snippet"] = row["snippet"]
+    if full:
+        out.update({
+            "context_hash": row["context_hash"],
+            "report": row["report"],
+            "sections": json.loads(row["sections"]) if row["sections"] else {},
+            "transcript": json.loads(row["transcript"]) if row["transcript"] else [],
+            "source": row["source"],
+            "context": row["context"] or "",
+            "prompt_version": row["prompt_version"],
+            "rescored_at": row["rescored_at"],
+        })
+    return out
+
+
+class FeedbackStore:
+    """Indexed storage for generated feedback reports.
+
+    One shared connection (WAL) guarded by a lock; list/search/get are
+    index or FTS lookups, so history stays fast as the archive grows.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = None
+        self.fts = False
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            if self.path != ":memory:":
+                os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            have = {r["name"] for r in conn.execute("PRAGMA table_info(feedback)")}
+            for col, decl in _ADDED_COLUMNS.items():
+                if col not in have:
+                    conn.execute(f"ALTER TABLE feedback ADD COLUMN {col} {decl}")
+            try:
+                conn.executescript(_FTS_SCHEMA)
+                self.fts = True
+            except sqlite3.OperationalError as e:
+                print("[FEEDBACK_STORE] FTS5 unavailable, search falls back to LIKE:", e)
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def save(self, report: str, session_id: Optional[str] = None, context: str = "",
+             transcript: Optional[list] = None, scores: Optional[dict] = None,
+             sections: Optional[dict] = None, created_at: Optional[int] = None,
+             source: Optional[str] = None, prompt_version: Optional[str] = None) -> int:
+        """Insert one report; returns its id."""
+        with self._lock:
+            db = self._db()
+            cur = db.execute(
+                "INSERT INTO feedback (session_id, created_at, context_hash, context, transcript, scores, sections,"
+                " report, source, prompt_version) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (session_id, int(created_at or time.time()), context_hash(context), context or None,
+                 json.dumps(transcript or [], ensure_ascii=False), json.dumps(scores or {}),
+                 json.dumps(sections or {}, ensure_ascii=False), report, source, prompt_version),
+            )
+            db.commit()
+            return cur.lastrowid
+
+    def get(self, feedback_id: int) -> Optional[dict]:
+        with self._lock:
+            row = self._db().execute("SELECT * FROM feedback WHERE id = ?", (feedback_id,)).fetchone()
+        return _row_to_dict(row, full=True) if row else None
+
+    def pending_rescore(self, prompt_version: str, limit: Optional[int] = None) -> List[int]:
+        """Ids of reports with a transcript that were not produced by ``prompt_version``, oldest first."""
+        sql = ("SELECT id FROM feedback WHERE transcript IS NOT NULL AND transcript != '[]'"
+               " AND (prompt_version IS NULL OR prompt_version != ?) ORDER BY id")
+        args = [prompt_version]
+        if limit:
+            sql += " LIMIT ?"
+            args.append(int(limit))
+        with self._lock:
+            return [r["id"] for r in self._db().execute(sql, args).fetchall()]
+
+    def update_report(self, feedback_id: int, report: str, scores: dict, sections: dict, prompt_version: str):
+        """Replace a report in place (re-scoring); drops memoized entries that point at it."""
+        with self._lock:
+            db = self._db()
+            db.execute(
+                "UPDATE feedback SET report = ?, scores = ?, sections = ?, prompt_version = ?, rescored_at = ?"
+                " WHERE id = ?",
+                (report, json.dumps(scores or {}), json.dumps(sections or {}, ensure_ascii=False),
+                 prompt_version, int(time.time()), feedback_id))
+            db.execute("DELETE FROM feedback_cache WHERE feedback_id = ?", (feedback_id,))
+            db.commit()
+
+    def cache_get(self, key: str) -> Optional[dict]:
+        """Memoized report for a transcript hash (touches its LRU timestamp)."""
+        with self._lock:
+            db = self._db()
+            row = db.execute(
+                "SELECT c.spoken_summary, f.* FROM feedback_cache c JOIN feedback f ON f.id = c.feedback_id"
+                " WHERE c.key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            db.execute("UPDATE feedback_cache SET last_used = ? WHERE key = ?", (int(time.time()), key))
+            db.commit()
+        item = _row_to_dict(row, full=True)
+        item["spoken_summary"] = row["spoken_summary"]
+        return item
+
+    def cache_put(self, key: str, feedback_id: int, spoken_summary: Optional[str]):
+        """Remember a generated report; keeps only the most recently used entries."""
+        with self._lock:
+            db = self._db()
+            db.execute("INSERT OR REPLACE INTO feedback_cache (key, feedback_id, spoken_summary, last_used)"
+                       " VALUES (?, ?, ?, ?)", (key, feedback_id, spoken_summary, int(time.time())))
+            db.execute("DELETE FROM feedback_cache WHERE key NOT IN"
+                       " (SELECT key FROM feedback_cache ORDER BY last_used DESC LIMIT ?)",
+                       (FEEDBACK_CACHE_MAX_ENTRIES,))
+            db.commit()
+
+    def list(self, page: int = 1, per_page: int = 20, query: Optional[str] = None) -> dict:
+        """Newest-first page of summaries; ``query`` runs a full-text search instead."""
+        page = max(1, int(page))
+        per_page = max(1, min(100, int(per_page)))
+        offset = (page - 1) * per_page
+        cols = "f.id, f.session_id, f.created_at, f.scores"
+        with self._lock:
+            db = self._db()
+            if query and self.fts:
+                match = " ".join('"' + t.replace('"', '""') + '"' for t in query.split())
+                total = db.execute("SELECT COUNT(*) FROM feedback_fts WHERE feedback_fts MATCH ?", (match,)).fetchone()[0]
+                rows = db.execute(
+                    f"SELECT {cols}, snippet(feedback_fts, 0, '[', ']', '…', 12) AS snippet"
+                    " FROM feedback_fts JOIN feedback f ON f.id = feedback_fts.rowid"
+                    " WHERE feedback_fts MATCH ? ORDER BY rank LIMIT ? OFFSET ?",
+                    (match, per_page, offset)).fetchall()
+            elif query:
+                like = f"%{query}%"
+                total = db.execute("SELECT COUNT(*) FROM feedback WHERE report LIKE ? OR transcript LIKE ?",
+                                   (like, like)).fetchone()[0]
+                rows = db.execute(f"SELECT {cols} FROM feedback f WHERE report LIKE ? OR transcript LIKE ?"
+                                  " ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                                  (like, like, per_page, offset)).fetchall()
+            else:
+                total = db.execute("SELECT COUNT(*) FROM feedback").fetchone()[0]
+                rows = db.execute(f"SELECT {cols} FROM feedback f ORDER BY created_at DESC LIMIT ? OFFSET ?",
+                                  (per_page, offset)).fetchall()
+        return {"items": [_row_to_dict(r) for r in rows], "total": total, "page": page, "per_page": per_page}
+
+    def migrate_directory(self, directory: str) -> int:
+        """Import legacy feedback_*.txt files in one scandir pass and one transaction.
+        Files already imported (same source name) are skipped; returns rows added.
+        """
+        if not os.path.isdir(directory):
+            return 0
+        batch = []
+        with os.scandir(directory) as it:
+            for entry in it:
+                if not entry.is_file():
+                    continue
+                m_epoch = _FILE_EPOCH_RE.match(entry.name)
+                m_dt = _FILE_DT_RE.match(entry.name)
+                if m_epoch:
+                    created = int(m_epoch.group(1))
+                elif m_dt:
+                    created = int(time.mktime(time.strptime(m_dt.group(1), "%Y-%m-%d_%H-%M-%S")))
+                else:
+                    continue
+                with open(entry.path, "r", encoding="utf-8", errors="replace") as f:
+                    report = f.read()
+                batch.append((created, json.dumps(scores_from_text(report)), report, f"file:{entry.name}"))
+        with self._lock:
+            db = self._db()
+            before = db.execute("SELECT COUNT(*) FROM feedback").fetchone()[0]
+            db.executemany(
+                "INSERT OR IGNORE INTO feedback (created_at, scores, report, source) VALUES (?, ?, ?, ?)", batch)
+            db.commit()
+            return db.execute("SELECT COUNT(*) FROM feedback").fetchone()[0] - before
+
+
+feedback_store = FeedbackStore(FEEDBACK_DB_PATH)
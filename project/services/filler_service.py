@@ -0,0 +1,107 @@
+"""Latency-masking acknowledgement clips sent while the real reply is computed."""
+import random
+import threading
+from collections import deque
+from typing import Optional, Tuple
+
+from config import settings
+from config.settings import FILLER_AUDIO, FILLER_DELAY_MS, FILLER_NO_REPEAT
+from extensions import socketio
+
+# Context-neutral: must fit any answer, including a weak or off-topic one
+FILLER_PHRASES = [
+    "Mm, okay.",
+    "Got it.",
+    "Okay.",
+    "Right.",
+    "I see.",
+    "Alright.",
+    "Mm-hm.",
+    "Okay, thanks.",
+]
+
+_clips = {}  # (voice, audio format) -> {phrase: data URI}
+_warming = set()
+_lock = threading.Lock()
+_recent = deque(maxlen=max(0, min(FILLER_NO_REPEAT, len(FILLER_PHRASES) - 1)))
+
+
+class FillerService:
+    """Pre-renders a small phrase set per voice and emits one clip per slow turn over Socket.IO."""
+
+    @staticmethod
+    def prewarm(voice_name: Optional[str] = None, audio_format: Optional[str] = None) -> int:
+        """Render any missing phrases for ``voice_name`` in ``audio_format``; returns clips available."""
+        from services.speech_service import SpeechService
+        key = (voice_name or settings.VOICE_NAME, audio_format or settings.TTS_AUDIO_FORMAT)
+        with _lock:
+            if key in _warming:
+                return len(_clips.get(key, {}))
+            _warming.add(key)
+            ready = dict(_clips.get(key, {}))
+        try:
+            for phrase in FILLER_PHRASES:
+                if phrase in ready:
+                    continue
+                try:
+                    ready[phrase] = SpeechService.synthesize_speech(phrase, voice_name=key[0], audio_format=key[1])
+                except Exception as e:
+                    print("[FILLER] prewarm error:", e)
+                    break
+                with _lock:
+                    _clips[key] = dict(ready)
+            return len(ready)
+        finally:
+            with _lock:
+                _warming.discard(key)
+
+    @staticmethod
+    def prewarm_async(voice_name: Optional[str] = None, audio_format: Optional[str] = None):
+        """Background prewarm; called from a request, the format defaults to what that client plays."""
+        if FILLER_AUDIO == "1":
+            from services.speech_service import request_audio_format
+            threading.Thread(target=FillerService.prewarm,
+                             args=(voice_name or settings.VOICE_NAME, audio_format or request_audio_format()),
+                             daemon=True).start()
+
+    @staticmethod
+    def pick(voice_name: Optional[str] = None, audio_format: Optional[str] = None) -> Optional[Tuple[str, str]]:
+        """A ready (phrase, audio) not among the last FILLER_NO_REPEAT used; None if nothing is rendered yet."""
+        voice = voice_name or settings.VOICE_NAME
+        audio_format = audio_format or settings.TTS_AUDIO_FORMAT
+        with _lock:
+            ready = _clips.get((voice, audio_format)) or {}
+            choices = [p for p in ready if p not in _recent] or list(ready)
+            if not choices:
+                phrase = None
+            else:
+                phrase = random.choice(choices)
+                _recent.append(phrase)
+        if phrase is None:
+            # Never synthesize on the hot path; get the set ready for the next turn instead
+            FillerService.prewarm_async(voice, audio_format)
+            return None
+        return phrase, ready[phrase]
+
+    @staticmethod
+    def schedule(client_id: Optional[str], token, user_text: str) -> Optional[threading.Timer]:
+        """Emit a filler to ``client_id`` unless the turn finishes (timer.cancel()) within FILLER_DELAY_MS."""
+        if FILLER_AUDIO != "1" or not client_id or not (user_text or "").strip():
+            return None
+        from services.speech_service import request_audio_format
+        voice = settings.VOICE_NAME
+        audio_format = request_audio_format()  # read now: the timer fires outside the request
+
+        def _fire():
+            if token.cancelled:
+                return
+            choice = FillerService.pick(voice, audio_format)
+            if choice is None:
+                return
+            phrase, audio = choice
+            socketio.emit("filler_audio", {"audio": audio, "text": phrase, "turn": token.turn}, to=client_id)
+
+        timer = threading.Timer(FILLER_DELAY_MS / 1000.0, _fire)
+        timer.daemon = True
+        timer.start()
+        return timer
@@ -0,0 +1,135 @@
+"""Background provider health probes, served from memory by /healthz and /readyz."""
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+from config import settings
+from config.settings import (
+    PROJECT_ID, LANG_TTS, GEMINI_MODEL, HEALTH_PROBE_SEC, HEALTH_PROBE_TIMEOUT_SEC, HEALTH_REQUIRED,
+)
+from services import clients
+
+HISTORY = 50  # probe results kept per provider
+STALE_AFTER = 3  # probe intervals without a result before a provider counts as down
+
+
+def _probe_genai():
+    """Model metadata lookup: authenticated round trip, no generation billed."""
+    if settings.GENAI_PROVIDER == "local":
+        return
+    # HttpOptions.timeout is in milliseconds; without it a hung connection would hold a pool worker
+    clients.genai.get().models.get(model=GEMINI_MODEL,
+                                   config={"http_options": {"timeout": int(HEALTH_PROBE_TIMEOUT_SEC * 1000)}})
+
+
+def _probe_stt():
+    if settings.SPEECH_PROVIDER == "local":
+        return
+    clients.stt.get().list_recognizers(
+        request={"parent": f"projects/{PROJECT_ID}/locations/global", "page_size": 1},
+        timeout=HEALTH_PROBE_TIMEOUT_SEC,
+    )
+
+
+def _probe_tts():
+    if settings.SPEECH_PROVIDER == "local":
+        return
+    clients.tts.get().list_voices(language_code=LANG_TTS, timeout=HEALTH_PROBE_TIMEOUT_SEC)
+
+
+PROBES = {"genai": _probe_genai, "stt": _probe_stt, "tts": _probe_tts}
+
+
+class HealthMonitor:
+    """Runs every probe each HEALTH_PROBE_SEC and keeps the latest results and a short history."""
+
+    def __init__(self, probes: dict, interval: float, required):
+        self.probes = probes
+        self.interval = interval
+        self.required = [p for p in required if p in probes]
+        self.history = {name: deque(maxlen=HISTORY) for name in probes}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=len(probes), thread_name_prefix="health")
+        self._running = {}  # name -> future of its latest probe
+        self._thread = None
+
+    def _run_one(self, name: str) -> dict:
+        t0 = time.time()
+        try:
+            self.probes[name]()
+            return {"ts": round(t0, 3), "ok": True, "ms": int((time.time() - t0) * 1000)}
+        except Exception as e:
+            return {"ts": round(t0, 3), "ok": False, "ms": int((time.time() - t0) * 1000), "error": str(e)[:200]}
+
+    def probe_all(self):
+        """One round, all providers in parallel; a probe that outlives the timeout counts as failed.
+        A provider whose previous probe is still hung is not probed again (it counts as failed), so
+        stuck calls can't pile up in the pool and starve the other providers.
+        """
+        t0 = time.time()
+        futures = {}
+        for name in self.probes:
+            prev = self._running.get(name)
+            if prev is None or prev.done():
+                futures[name] = self._running[name] = self._pool.submit(self._run_one, name)
+            else:
+                futures[name] = None
+        deadline = t0 + HEALTH_PROBE_TIMEOUT_SEC
+        for name, fut in futures.items():
+            try:
+                if fut is None:
+                    result = {"ts": round(t0, 3), "ok": False, "ms": 0, "error": "previous probe still running"}
+                else:
+                    result = fut.result(timeout=max(0.0, deadline - time.time()))
+            except FutureTimeout:
+                result = {"ts": round(deadline - HEALTH_PROBE_TIMEOUT_SEC, 3), "ok": False,
+                          "ms": int(HEALTH_PROBE_TIMEOUT_SEC * 1000), "error": "timeout"}
+            with self._lock:
+                prev = self.history[name][-1] if self.history[name] else None
+                self.history[name].append(result)
+            if prev is None or prev["ok"] != result["ok"]:
+                print(f"[HEALTH] {name}: {'up' if result['ok'] else 'DOWN'} ({result.get('error', str(result['ms']) + ' ms')})")
+
+    def _loop(self):
+        while True:
+            try:
+                self.probe_all()
+            except Exception as e:
+                print("[HEALTH] probe round error:", e)
+            time.sleep(self.interval)
+
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="health-probes", daemon=True)
+                self._thread.start()
+
+    def _provider(self, name: str, now: float) -> dict:
+        hist = self.history[name]
+        last = hist[-1] if hist else None
+        fresh = last is not None and now - last["ts"] <= STALE_AFTER * self.interval + HEALTH_PROBE_TIMEOUT_SEC
+        ok_count = sum(1 for r in hist if r["ok"])
+        return {
+            "up": bool(last and last["ok"] and fresh),
+            "last": last,
+            "stale": last is not None and not fresh,
+            "success_rate": round(ok_count / len(hist), 3) if hist else None,
+            "avg_ms": int(sum(r["ms"] for r in hist) / len(hist)) if hist else None,
+        }
+
+    def readiness(self) -> dict:
+        """{"ready", "providers": {...}}; ready once every required provider's latest probe is fresh and ok."""
+        now = time.time()
+        with self._lock:
+            providers = {name: self._provider(name, now) for name in self.probes}
+        return {"ready": all(providers[n]["up"] for n in self.required), "required": self.required,
+                "providers": providers}
+
+    def recent(self, name: str) -> list:
+        with self._lock:
+            return list(self.history.get(name, ()))
+
+
+health_monitor = HealthMonitor(PROBES, HEALTH_PROBE_SEC, [p.strip() for p in HEALTH_REQUIRED.split(",") if p.strip()])
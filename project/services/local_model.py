@@ -0,0 +1,69 @@
+"""Deterministic stand-in for the Gemini client (GENAI_PROVIDER=local).
+
+Mirrors the small slice of ``google.genai`` that AIService uses, so batch jobs
+and local runs work end to end without credentials or network access.
+"""
+import hashlib
+import json
+import time
+from types import SimpleNamespace
+
+from config.settings import LOCAL_MODEL_LATENCY_MS
+from services.token_service import estimate_tokens
+
+
+class ClientError(Exception):
+    """Same role as google.genai.errors.ClientError."""
+
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class GenerateContentConfig(SimpleNamespace):
+    def __init__(self, temperature=None, max_output_tokens=None, **kwargs):
+        super().__init__(temperature=temperature, max_output_tokens=max_output_tokens,
+                         response_mime_type=None, **kwargs)
+
+
+types = SimpleNamespace(GenerateContentConfig=GenerateContentConfig)
+
+
+def _json_reply(seed: int) -> str:
+    """One object that satisfies every JSON shape the prompts ask for."""
+    score = 4 + seed % 6
+    return json.dumps({
+        "bullets": ["Explained past project work with concrete detail.",
+                    "Could quantify impact and trade-offs more clearly.",
+                    "Practice structuring answers as context, action, result."],
+        "positives": ["Answers stayed on topic.", "Used relevant technical vocabulary."],
+        "improvements": ["Give more specific examples.", "Discuss complexity and edge cases."],
+        "rating": score,
+        "rationale": "Local stand-in model; scores are deterministic per prompt.",
+        "topic": "general experience",
+        "communication": score,
+        "technical": max(1, score - 1),
+        "strengths": ["Clear structure."],
+        "gaps": ["Limited depth."],
+        "evidence": "Described a recent project.",
+    })
+
+
+class _Models:
+    def generate_content(self, model: str, contents, config=None):
+        if LOCAL_MODEL_LATENCY_MS > 0:
+            time.sleep(LOCAL_MODEL_LATENCY_MS / 1000.0)
+        prompt = contents if isinstance(contents, str) else json.dumps(contents, default=str)
+        seed = int(hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8], 16)
+        if config is not None and getattr(config, "response_mime_type", None) == "application/json":
+            text = _json_reply(seed)
+        else:
+            text = "Thanks. Can you walk me through a recent project and the hardest decision you made in it?"
+        usage = SimpleNamespace(prompt_token_count=estimate_tokens(prompt), candidates_token_count=estimate_tokens(text),
+                                total_token_count=estimate_tokens(prompt) + estimate_tokens(text))
+        return SimpleNamespace(text=text, candidates=[], prompt_feedback=None, usage_metadata=usage)
+
+
+class Client:
+    def __init__(self, **kwargs):
+        self.models = _Models()
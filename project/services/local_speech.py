@@ -0,0 +1,48 @@
+"""Deterministic stand-ins for Speech-to-Text and Text-to-Speech (SPEECH_PROVIDER=local).
+
+Used for load tests and offline runs: no credentials, network or ffmpeg needed.
+"""
+import base64
+import hashlib
+import io
+import time
+import wave
+
+from config.settings import LOCAL_SPEECH_LATENCY_MS
+
+ANSWERS = [
+    "I built a data pipeline in Python that ingested events from Kafka and wrote them to a warehouse.",
+    "The hardest part was handling late events, so we added watermarking and idempotent writes.",
+    "I would start by clarifying the requirements and then sketch the main components and their trade-offs.",
+    "We reduced latency by caching hot keys and moving the heavy work to a background queue.",
+    "I usually write tests around the edge cases first, then profile before optimizing anything.",
+    "In my last project I led the migration to containers and set up the deployment pipeline.",
+]
+
+SAMPLE_RATE = 8000
+SECONDS_PER_WORD = 0.35
+
+
+def _simulate():
+    if LOCAL_SPEECH_LATENCY_MS > 0:
+        time.sleep(LOCAL_SPEECH_LATENCY_MS / 1000.0)
+
+
+def transcribe(audio_bytes: bytes) -> str:
+    """One of ANSWERS, chosen by the audio content so a given recording always transcribes the same."""
+    _simulate()
+    seed = int(hashlib.sha1(audio_bytes).hexdigest()[:8], 16)
+    return ANSWERS[seed % len(ANSWERS)]
+
+
+def synthesize(text: str) -> str:
+    """Silent WAV data URI roughly as long as the spoken text."""
+    _simulate()
+    frames = int(SAMPLE_RATE * SECONDS_PER_WORD * max(1, len(text.split())))
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(1)
+        w.setframerate(SAMPLE_RATE)
+        w.writeframes(b"\x80" * frames)
+    return "data:audio/wav;base64," + base64.b64encode(buf.getvalue()).decode("utf-8")
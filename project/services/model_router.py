@@ -0,0 +1,159 @@
+"""Latency-aware model selection per call class."""
+import json
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Tuple
+
+from config.settings import (
+    GEMINI_MODEL, GEMINI_FEEDBACK_MODEL, MODEL_ROUTES, GEMINI_FALLBACK_MODELS, ROUTER_SLO_MS,
+    ROUTER_EWMA_ALPHA, ROUTER_MAX_ERROR_RATE, ROUTER_PROBE_SEC, ROUTER_LOG_PATH,
+)
+
+CALL_CLASSES = ("opening", "followup", "coding", "assessment", "feedback")
+
+MAX_DECISIONS = 500
+
+
+def _dedupe(models: List[str]) -> List[str]:
+    out = []
+    for m in models:
+        m = m.strip()
+        if m and m not in out:
+            out.append(m)
+    return out
+
+
+def _parse_routes(spec: str) -> Dict[str, List[str]]:
+    """"followup=a,b;feedback=c" -> {"followup": ["a", "b"], "feedback": ["c"]}"""
+    routes = {}
+    for part in (spec or "").split(";"):
+        if "=" in part:
+            cls, models = part.split("=", 1)
+            routes[cls.strip()] = _dedupe(models.split(","))
+    return routes
+
+
+def _parse_slos(spec: str) -> Dict[str, float]:
+    slos = {}
+    for part in (spec or "").split(","):
+        if "=" in part:
+            cls, ms = part.split("=", 1)
+            try:
+                slos[cls.strip()] = float(ms)
+            except ValueError:
+                pass
+    return slos
+
+
+def _default_routes() -> Dict[str, List[str]]:
+    fallbacks = GEMINI_FALLBACK_MODELS.split(",")
+    configured = _parse_routes(MODEL_ROUTES)
+    routes = {}
+    for cls in CALL_CLASSES:
+        primary = [GEMINI_FEEDBACK_MODEL, GEMINI_MODEL] if cls in ("assessment", "feedback") else [GEMINI_MODEL]
+        routes[cls] = _dedupe(configured.get(cls, primary) + fallbacks)
+    return routes
+
+
+class _Stats:
+    __slots__ = ("latency", "error", "calls", "errors", "last_used")
+
+    def __init__(self):
+        self.latency = None  # ms EWMA of successful calls
+        self.error = 0.0     # EWMA of failure indicator
+        self.calls = 0
+        self.errors = 0
+        self.last_used = 0.0
+
+
+class ModelRouter:
+    """Picks the first healthy model of a call class's preference list.
+
+    A model is demoted for a class while its latency EWMA exceeds the class
+    SLO or its error EWMA exceeds ROUTER_MAX_ERROR_RATE; a demoted model still
+    gets one probe call every ROUTER_PROBE_SEC, and a probe within the SLO
+    restores it.
+    """
+
+    def __init__(self, routes: Dict[str, List[str]], slos: Dict[str, float]):
+        self.routes = routes
+        self.slos = slos
+        self._stats = {}  # (model, call_class) -> _Stats
+        self._lock = threading.Lock()
+        self.decisions = deque(maxlen=MAX_DECISIONS)
+
+    def _get(self, model: str, call_class: str) -> _Stats:
+        st = self._stats.get((model, call_class))
+        if st is None:
+            st = self._stats[(model, call_class)] = _Stats()
+        return st
+
+    def _healthy(self, st: _Stats, call_class: str) -> bool:
+        if st.error > ROUTER_MAX_ERROR_RATE:
+            return False
+        slo = self.slos.get(call_class)
+        return st.latency is None or slo is None or st.latency <= slo
+
+    def candidates(self, call_class: str) -> List[str]:
+        return self.routes.get(call_class) or [GEMINI_MODEL]
+
+    def preferred(self, call_class: str) -> str:
+        return self.candidates(call_class)[0]
+
+    def choose(self, call_class: str, exclude=()) -> Tuple[str, str]:
+        """Returns (model, reason) with reason one of preferred/fallback/probe/least-bad."""
+        cands = [m for m in self.candidates(call_class) if m not in exclude] or self.candidates(call_class)
+        now = time.time()
+        with self._lock:
+            for i, model in enumerate(cands):
+                st = self._get(model, call_class)
+                if self._healthy(st, call_class):
+                    return model, "preferred" if i == 0 else "fallback"
+                if now - st.last_used >= ROUTER_PROBE_SEC:
+                    st.last_used = now  # one probe per window, even with concurrent callers
+                    return model, "probe"
+            best = min(cands, key=lambda m: (self._get(m, call_class).error,
+                                             self._get(m, call_class).latency or 0.0))
+            return best, "least-bad"
+
+    def record(self, call_class: str, model: str, latency_ms: float, ok: bool, reason: str = ""):
+        """Fold one call outcome into the EWMAs and the decision log."""
+        a = ROUTER_EWMA_ALPHA
+        with self._lock:
+            st = self._get(model, call_class)
+            st.calls += 1
+            st.last_used = time.time()
+            st.error = (1 - a) * st.error + a * (0.0 if ok else 1.0)
+            if ok:
+                st.latency = latency_ms if st.latency is None else (1 - a) * st.latency + a * latency_ms
+                slo = self.slos.get(call_class)
+                if reason == "probe" and (slo is None or latency_ms <= slo):
+                    # A good probe restores the model instead of waiting for the EWMAs to decay
+                    st.latency = latency_ms
+                    st.error = min(st.error, ROUTER_MAX_ERROR_RATE / 2)
+            else:
+                st.errors += 1
+            entry = {"ts": round(st.last_used, 3), "class": call_class, "model": model, "reason": reason,
+                     "ms": int(latency_ms), "ok": ok, "slo_ms": self.slos.get(call_class),
+                     "healthy_after": self._healthy(st, call_class)}
+            self.decisions.append(entry)
+            if ROUTER_LOG_PATH:
+                try:
+                    with open(ROUTER_LOG_PATH, "a", encoding="utf-8") as f:
+                        f.write(json.dumps(entry) + "\n")
+                except OSError as e:
+                    print("[ROUTER] log write error:", e)
+
+    def snapshot(self, recent: int = 100) -> dict:
+        """Routes, SLOs, per-model/class health and the latest decisions, for tuning."""
+        with self._lock:
+            stats = [{"model": m, "class": c, "latency_ewma_ms": round(st.latency, 1) if st.latency else None,
+                      "error_ewma": round(st.error, 3), "calls": st.calls, "errors": st.errors,
+                      "healthy": self._healthy(st, c)}
+                     for (m, c), st in sorted(self._stats.items())]
+            decisions = list(self.decisions)[-recent:] if recent else []
+        return {"routes": self.routes, "slo_ms": self.slos, "stats": stats, "recent": decisions}
+
+
+model_router = ModelRouter(_default_routes(), _parse_slos(ROUTER_SLO_MS))
@@ -0,0 +1,125 @@
+"""On-demand sampling CPU profiles and memory reports for a live worker."""
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Optional
+
+from config.settings import PROFILE_MAX_SEC
+
+TRACEMALLOC_FRAMES = 10
+
+_profile_lock = threading.Lock()
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}"
+
+
+def _thread_names() -> dict:
+    return {t.ident: t.name for t in threading.enumerate()}
+
+
+class ProfilerService:
+    """Stack sampling across all threads (sys._current_frames) plus tracemalloc and cache sizes."""
+
+    @staticmethod
+    def sample(seconds: float, interval_ms: float = 10.0) -> Optional[Counter]:
+        """Collapsed stacks ("thread;file:func;..." -> samples) over ``seconds``.
+        None if another profile is already running. Costs one stack walk per thread per interval.
+        """
+        if not _profile_lock.acquire(blocking=False):
+            return None
+        try:
+            seconds = max(0.1, min(float(seconds), PROFILE_MAX_SEC))
+            interval = max(1.0, float(interval_ms)) / 1000.0
+            me = threading.get_ident()
+            stacks = Counter()
+            names = _thread_names()
+            deadline = time.time() + seconds
+            while time.time() < deadline:
+                for ident, frame in sys._current_frames().items():
+                    if ident == me:
+                        continue
+                    labels = []
+                    while frame is not None:
+                        labels.append(_frame_label(frame))
+                        frame = frame.f_back
+                    if ident not in names:
+                        names = _thread_names()
+                    thread = names.get(ident, str(ident)).replace(";", "_")
+                    stacks[";".join([thread] + labels[::-1])] += 1
+                time.sleep(interval)
+            return stacks
+        finally:
+            _profile_lock.release()
+
+    @staticmethod
+    def collapsed(stacks: Counter) -> str:
+        """flamegraph.pl / speedscope input: one "stack count" line per distinct stack."""
+        return "".join(f"{stack} {n}\n" for stack, n in stacks.most_common())
+
+    @staticmethod
+    def top_functions(stacks: Counter, limit: int = 20) -> list:
+        """Self time per function (leaf frame), as share of all samples."""
+        total = sum(stacks.values()) or 1
+        leaves = Counter()
+        for stack, n in stacks.items():
+            leaves[stack.rsplit(";", 1)[-1]] += n
+        return [{"function": f, "samples": n, "share": round(n / total, 4)} for f, n in leaves.most_common(limit)]
+
+    @staticmethod
+    def tracemalloc_top(limit: int = 25, start: bool = False) -> dict:
+        """Top allocation sites by size; tracing starts on the first request with start=True."""
+        if not tracemalloc.is_tracing():
+            if not start:
+                return {"tracing": False, "hint": "call with start=1 to begin tracing, then again later"}
+            tracemalloc.start(TRACEMALLOC_FRAMES)
+            return {"tracing": True, "started": True, "top": []}
+        snapshot = tracemalloc.take_snapshot()
+        stats = snapshot.statistics("lineno")
+        current, peak = tracemalloc.get_traced_memory()
+        return {
+            "tracing": True,
+            "current_bytes": current,
+            "peak_bytes": peak,
+            "top": [{"where": f"{s.traceback[0].filename}:{s.traceback[0].lineno}", "bytes": s.size,
+                     "count": s.count} for s in stats[:limit]],
+        }
+
+    @staticmethod
+    def stop_tracemalloc():
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+
+    @staticmethod
+    def session_memory() -> dict:
+        """Sizes of the per-interview state and the in-process caches that grow with use."""
+        from models.interview_state import interview_state
+        from services import filler_service, speech_service
+        from services.model_router import model_router
+        from services.token_service import ledger
+
+        conv = list(interview_state.conversation)
+        with speech_service._tts_cache_lock:
+            tts_bytes = sum(len(v) for v in speech_service._tts_cache.values())
+            tts_items = len(speech_service._tts_cache)
+        with filler_service._lock:
+            filler_items = sum(len(v) for v in filler_service._clips.values())
+            filler_bytes = sum(len(a) for v in filler_service._clips.values() for a in v.values())
+        return {
+            "session_id": interview_state.session_id,
+            "conversation_turns": len(conv),
+            "conversation_chars": sum(len(t.get("text") or "") for t in conv),
+            "context_chars": len(interview_state.context or ""),
+            "pending_assessments": sum(1 for f in interview_state.assessment_futures if not f.done()),
+            "assessment_futures": len(interview_state.assessment_futures),
+            "tts_cache": {"items": tts_items, "bytes": tts_bytes},
+            "filler_clips": {"items": filler_items, "bytes": filler_bytes},
+            "token_ledger_sessions": len(ledger.sessions),
+            "router_decisions": len(model_router.decisions),
+            "threads": threading.active_count(),
+        }
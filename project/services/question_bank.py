@@ -0,0 +1,148 @@
+"""Role/skill-indexed local question bank for instant fallbacks."""
+import json
+import os
+import random
+import threading
+import time
+from typing import Iterable, List, Optional
+
+from prompts.question_bank import (
+    OPENING_QUESTIONS, GENERAL_QUESTIONS, CATEGORY_QUESTIONS, SKILL_QUESTIONS, SKILL_TEMPLATES, CODING_QUESTIONS,
+)
+
+_CATEGORIES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "static", "job_categories.json")
+
+
+def _load_role_index() -> dict:
+    """Map lowercased role name -> category name from static/job_categories.json."""
+    try:
+        with open(_CATEGORIES_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        print("[QBANK] could not load job categories:", e)
+        return {}
+    return {role.lower(): c["name"] for c in data.get("categories", []) for role in c.get("roles", [])}
+
+
+_role_index = _load_role_index()
+
+_warming = {}  # (voice, audio format) -> latest (category, skills) asked for while a run is in flight
+_lock = threading.Lock()
+
+
+def _greeting() -> str:
+    hour = time.localtime().tm_hour
+    if hour < 12:
+        return "Good morning"
+    if hour < 17:
+        return "Good afternoon"
+    return "Good evening"
+
+
+class QuestionBank:
+    """Picks varied, relevant questions without calling the model."""
+
+    @staticmethod
+    def resolve_category(role: Optional[str], job_text: str = "") -> Optional[str]:
+        """Category for an explicit role, else the first known role named in the JD."""
+        if role:
+            cat = _role_index.get(role.strip().lower())
+            if cat:
+                return cat
+            if role in CATEGORY_QUESTIONS:
+                return role
+        text = (job_text or "").lower()
+        hits = [(text.find(r), c) for r, c in _role_index.items() if r in text]
+        return min(hits)[1] if hits else None
+
+    @staticmethod
+    def _candidates(state, kind: str) -> List[str]:
+        """Ordered tiers: uncovered resume skills, role category, then general."""
+        if kind == "coding":
+            return list(CODING_QUESTIONS)
+        tiers = []
+        coverage = getattr(state, "coverage", None)
+        if coverage is not None:
+            skill_qs = []
+            for skill in coverage.uncovered()[:3]:
+                skill_qs.extend(SKILL_QUESTIONS.get(skill) or [t.format(skill=skill) for t in SKILL_TEMPLATES])
+            tiers.append(skill_qs)
+        tiers.append(list(CATEGORY_QUESTIONS.get(state.role_category or "", [])))
+        tiers.append(list(GENERAL_QUESTIONS))
+        out = []
+        for tier in tiers:
+            random.shuffle(tier)
+            out.extend(tier)
+        return out
+
+    @staticmethod
+    def pick(state, kind: str = "interview") -> str:
+        """Next unasked question for this session; repeats only once the bank is exhausted."""
+        asked = state.bank_asked
+        said = {t.get("text") for t in state.conversation if t.get("role") == "assistant"}
+        candidates = QuestionBank._candidates(state, kind)
+        for q in candidates:
+            if q not in asked and q not in said:
+                asked.add(q)
+                return q
+        return candidates[0]
+
+    @staticmethod
+    def opening(state) -> str:
+        """Greeting + introduction question with zero model latency."""
+        q = random.choice(OPENING_QUESTIONS).format(greeting=_greeting())
+        state.bank_asked.add(q)
+        return q
+
+    @staticmethod
+    def static_questions(category: Optional[str] = None, skills: Optional[Iterable[str]] = None) -> List[str]:
+        """Questions whose text is fixed ahead of time (safe to pre-synthesize).
+        Skill questions are limited to ``skills`` (the session's resume/JD skills); None means all.
+        """
+        qs = list(GENERAL_QUESTIONS) + list(CODING_QUESTIONS)
+        qs += CATEGORY_QUESTIONS.get(category or "", [])
+        groups = SKILL_QUESTIONS if skills is None else {s: SKILL_QUESTIONS[s] for s in skills if s in SKILL_QUESTIONS}
+        qs += [q for group in groups.values() for q in group]
+        qs += [q.format(greeting=g) for q in OPENING_QUESTIONS
+               for g in ("Good morning", "Good afternoon", "Good evening")]
+        return qs
+
+    @staticmethod
+    def presynthesize(category: Optional[str] = None, voice_name: Optional[str] = None,
+                      audio_format: Optional[str] = None, skills: Optional[Iterable[str]] = None) -> int:
+        """Warm the TTS cache for the session's fixed questions; returns clips rendered.
+        One run per (voice, format) at a time: a call while one is in flight hands its
+        category/skills to that run, which warms them next instead of duplicating the work.
+        """
+        from services.speech_service import SpeechService
+        from config import settings
+        key = (voice_name or settings.VOICE_NAME, audio_format)
+        job = (category, None if skills is None else tuple(skills))
+        with _lock:
+            if key in _warming:
+                _warming[key] = job
+                return 0
+            _warming[key] = None
+        done = 0
+        try:
+            while job is not None:
+                for q in QuestionBank.static_questions(*job):
+                    try:
+                        SpeechService.synthesize_speech(q, voice_name=key[0], audio_format=key[1])
+                        done += 1
+                    except Exception as e:
+                        print("[QBANK] presynthesis error:", e)
+                        break
+                with _lock:
+                    job, _warming[key] = _warming[key], None
+            return done
+        finally:
+            with _lock:
+                _warming.pop(key, None)
+
+    @staticmethod
+    def presynthesize_async(category: Optional[str] = None, voice_name: Optional[str] = None,
+                            audio_format: Optional[str] = None, skills: Optional[Iterable[str]] = None):
+        """Background presynthesize (new sessions)."""
+        threading.Thread(target=QuestionBank.presynthesize, args=(category, voice_name, audio_format, skills),
+                         daemon=True).start()
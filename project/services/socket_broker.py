@@ -0,0 +1,101 @@
+"""Message-queue backends for Socket.IO fan-out across processes.
+
+SOCKETIO_MESSAGE_QUEUE selects the broker:
+  ""                  in-process only (the default)
+  "redis://..."       Redis pub/sub, or any Redis-protocol server
+  "sqlite:///<path>"  a shared SQLite file; single-host stand-in, no extra service
+Other URLs are handed to Kombu by python-socketio.
+"""
+import json
+import os
+import sqlite3
+import time
+from typing import Optional
+
+import socketio as pysocketio
+
+from config.settings import SOCKETIO_MESSAGE_QUEUE, SOCKETIO_POLL_MS
+
+RETAIN_SEC = 60  # published rows kept this long; listeners only read new ones
+PRUNE_EVERY = 200  # publishes between prunes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS messages (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    channel TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+"""
+
+
+def _sqlite_path(url: str) -> str:
+    return url[len("sqlite:///"):]
+
+
+class SQLiteManager(pysocketio.PubSubManager):
+    """PubSubManager over a shared SQLite table: publish inserts a row, listeners poll for new ids."""
+
+    name = "sqlite"
+
+    def __init__(self, path: str, channel: str = "socketio", write_only: bool = False, logger=None):
+        super().__init__(channel=channel, write_only=write_only, logger=logger)
+        self.path = path
+        self._published = 0
+        self._connect().close()  # create the file/schema up front
+
+    def _connect(self) -> sqlite3.Connection:
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        conn = sqlite3.connect(self.path, timeout=5)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.executescript(_SCHEMA)
+        return conn
+
+    def _publish(self, data):
+        now = time.time()
+        conn = self._connect()
+        try:
+            with conn:
+                conn.execute("INSERT INTO messages (channel, created_at, payload) VALUES (?, ?, ?)",
+                             (self.channel, now, json.dumps(data)))
+                self._published += 1
+                if self._published % PRUNE_EVERY == 0:
+                    conn.execute("DELETE FROM messages WHERE created_at < ?", (now - RETAIN_SEC,))
+        finally:
+            conn.close()
+
+    def _listen(self):
+        conn = self._connect()
+        last = conn.execute("SELECT COALESCE(MAX(id), 0) FROM messages").fetchone()[0]
+        while True:
+            rows = conn.execute("SELECT id, payload FROM messages WHERE id > ? AND channel = ? ORDER BY id",
+                                (last, self.channel)).fetchall()
+            for row_id, payload in rows:
+                last = row_id
+                yield json.loads(payload)
+            if not rows:
+                time.sleep(SOCKETIO_POLL_MS / 1000.0)
+
+
+def init_options(url: str = SOCKETIO_MESSAGE_QUEUE) -> dict:
+    """Keyword arguments for socketio.init_app() that attach the configured broker."""
+    if not url:
+        return {}
+    print(f"[SOCKETIO] message queue: {url.split('://', 1)[0]}")
+    if url.startswith("sqlite:"):
+        return {"client_manager": SQLiteManager(_sqlite_path(url))}
+    return {"message_queue": url}
+
+
+def external_emitter(url: str = SOCKETIO_MESSAGE_QUEUE) -> Optional[pysocketio.PubSubManager]:
+    """Write-only handle for workers/scripts outside the server process:
+    ``external_emitter().emit("event", data, room=client_id, namespace="/")``.
+    None when there is no broker (events can only come from the server process).
+    """
+    if not url:
+        return None
+    if url.startswith("sqlite:"):
+        return SQLiteManager(_sqlite_path(url), write_only=True)
+    if url.startswith(("redis://", "rediss://")):
+        return pysocketio.RedisManager(url, write_only=True)
+    return pysocketio.KombuManager(url, write_only=True)
@@ -6,32 +6,82 @@ import io
 import logging
 import os
 import tempfile
+import threading
+from collections import OrderedDict
 from typing import Optional, List
-
-from google.cloud import speech_v2
-from google.cloud import texttospeech
-
-# Optional dependency used for robust transcoding
-try:
-    from pydub import AudioSegment
-except Exception:
-    AudioSegment = None
+from urllib.parse import unquote
 
 # Local project settings (your existing config)
-from config.settings import PROJECT_ID, LANG_STT, LANG_TTS, VOICE_NAME
+from config import settings
+from config.settings import (
+    PROJECT_ID, LANG_STT, LANG_TTS, TTS_CACHE_MAX_ITEMS, TTS_OPUS_SAMPLE_RATE, TTS_MP3_SAMPLE_RATE,
+)
+from utils.cancellation import check
+from services.turn_executor import turn_executor
 
-# Initialize clients
-stt_client = speech_v2.SpeechClient()
-tts_client = texttospeech.TextToSpeechClient()
+# STT/TTS clients and pydub (optional, used for robust transcoding) load lazily via services.clients
+from services import clients, local_speech
 
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
 
+# (voice, format, text) -> data URI; bounded LRU so repeated/pre-rendered lines skip the TTS call
+_tts_cache = OrderedDict()
+_tts_cache_lock = threading.Lock()
+
+# format -> (texttospeech.AudioEncoding name, data URI MIME type, sample rate Hz or 0 for the voice default)
+AUDIO_FORMATS = {
+    "opus": ("OGG_OPUS", "audio/ogg", TTS_OPUS_SAMPLE_RATE),
+    "mp3": ("MP3", "audio/mp3", TTS_MP3_SAMPLE_RATE),
+}
+
+# Accept-style media types the browser may list -> our format names
+_MEDIA_TYPES = {"audio/ogg": "opus", "audio/opus": "opus", "audio/mpeg": "mp3", "audio/mp3": "mp3"}
+
 
 class TranscodeError(RuntimeError):
     pass
 
 
+def negotiate_audio_format(accept: Optional[str]) -> Optional[str]:
+    """Best supported format from an Accept-style list, e.g. "audio/ogg;codecs=opus, audio/mpeg;q=0.8".
+    Ogg is only taken with an opus codec (or none given); None when nothing listed is supported.
+    """
+    best, best_q = None, 0.0
+    for item in (accept or "").split(","):
+        parts = [p.strip().lower() for p in item.split(";")]
+        params = dict(p.split("=", 1) for p in parts[1:] if "=" in p)
+        fmt = _MEDIA_TYPES.get(parts[0])
+        if fmt == "opus" and params.get("codecs", "opus").strip('"') != "opus":
+            continue
+        try:
+            q = float(params.get("q", 1))
+        except ValueError:
+            continue
+        if fmt and q > best_q:
+            best, best_q = fmt, q
+    return best
+
+
+def request_audio_format() -> Optional[str]:
+    """Format the current HTTP client asked for (X-Audio-Accept header or audio_accept cookie); None outside a request."""
+    try:
+        from flask import has_request_context, request
+    except ImportError:
+        return None
+    if not has_request_context():
+        return None
+    return negotiate_audio_format(request.headers.get("X-Audio-Accept")
+                                  or unquote(request.cookies.get("audio_accept", "")))
+
+
+def _cache_put(cache_key, uri: str):
+    with _tts_cache_lock:
+        _tts_cache[cache_key] = uri
+        while len(_tts_cache) > TTS_CACHE_MAX_ITEMS:
+            _tts_cache.popitem(last=False)
+
+
 def detect_audio_signature_prefix(b: bytes) -> str:
     if not b:
         return "empty"
@@ -64,7 +114,8 @@ def transcode_to_wav_bytes(
 
     Raises TranscodeError if conversion fails.
     """
-    if AudioSegment is None:
+    AudioSegment = clients.pydub.get()
+    if not AudioSegment:
         raise TranscodeError("pydub not installed; install pydub and ensure ffmpeg is on PATH")
 
     if not input_bytes:
@@ -73,47 +124,37 @@ def transcode_to_wav_bytes(
     # If this is a data URI, decode it first
     if input_bytes.startswith(b"data:"):
         try:
-            header, b64 = input_bytes.split(b",", 1)
-            input_bytes = base64.b64decode(b64)
+            comma = input_bytes.index(b",")
+            input_bytes = base64.b64decode(memoryview(input_bytes)[comma + 1:])
         except Exception as e:
             raise TranscodeError(f"Invalid data URI: {e}")
 
+    # BytesIO over bytes shares the buffer (no copy until written)
     buf = io.BytesIO(input_bytes)
     # Try autodetect; pydub uses ffmpeg to detect format.
     try:
         audio = AudioSegment.from_file(buf, format=format_hint)
-    except Exception:
-        last_exc = None
+    except Exception as first_exc:
+        # Write the upload to disk once and let ffmpeg read the path for every other format,
+        # instead of pydub spooling a fresh copy per attempt
+        last_exc = first_exc
         audio = None
-        fmt_candidates = [format_hint, "webm", "ogg", "mp3", "mp4", "wav"]
         ext_map = {"webm": ".webm", "ogg": ".ogg", "mp3": ".mp3", "mp4": ".mp4", "wav": ".wav"}
-        for fmt in fmt_candidates:
-            if not fmt:
-                continue
-            try:
-                audio = AudioSegment.from_file(io.BytesIO(input_bytes), format=fmt)
-                break
-            except Exception as e:
-                last_exc = e
-                audio = None
-        if audio is None:
-            try:
-                suffix = ext_map.get(format_hint or "", ".bin")
-                with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
-                    tmp.write(input_bytes)
-                    tmp_path = tmp.name
+        with tempfile.NamedTemporaryFile(delete=False, suffix=ext_map.get(format_hint or "", ".bin")) as tmp:
+            tmp.write(input_bytes)
+            tmp_path = tmp.name
+        try:
+            for fmt in dict.fromkeys([format_hint, None, "webm", "ogg", "mp3", "mp4", "wav"]):
                 try:
-                    if format_hint:
-                        audio = AudioSegment.from_file(tmp_path, format=format_hint)
-                    else:
-                        audio = AudioSegment.from_file(tmp_path)
-                finally:
-                    try:
-                        os.remove(tmp_path)
-                    except Exception:
-                        pass
-            except Exception as e:
-                last_exc = e
+                    audio = AudioSegment.from_file(tmp_path, format=fmt)
+                    break
+                except Exception as e:
+                    last_exc = e
+        finally:
+            try:
+                os.remove(tmp_path)
+            except Exception:
+                pass
         if audio is None:
             raise TranscodeError(f"Transcode autodetect failed: {last_exc}")
 
@@ -131,15 +172,23 @@ class SpeechService:
     MAX_IN_MEMORY_BYTES = 6 * 1024 * 1024  # 6 MB (adjust as needed)
 
     @staticmethod
-    def transcribe_audio(audio_bytes: bytes, filename_hint: Optional[str] = None) -> str:
+    def transcribe_audio(audio_bytes: bytes, filename_hint: Optional[str] = None, cancel=None) -> str:
         """
         Transcribe audio bytes to text using Google Speech-to-Text.
         - Accepts browser blobs (webm/ogg/opus) and will transcode them to WAV PCM first.
         - Returns trimmed transcript string.
         - Raises ValueError or TranscodeError with explanatory messages on failure.
+        - Raises Cancelled if ``cancel`` is set before or during the request.
+        - Raises Saturated if no "stt" bulkhead slot frees up in time.
         """
         if not audio_bytes:
             raise ValueError("Empty audio bytes provided to transcribe_audio")
+        check(cancel)
+        if settings.SPEECH_PROVIDER == "local":
+            with turn_executor.stage("stt", cancel):
+                transcript = local_speech.transcribe(audio_bytes)
+            check(cancel)
+            return transcript
 
         sig = detect_audio_signature_prefix(audio_bytes)
         logger.info("transcribe_audio: signature=%s filename_hint=%s size=%d", sig, filename_hint, len(audio_bytes))
@@ -179,7 +228,10 @@ class SpeechService:
             # Suggest using longrunning_recognize with GCS for large files
             raise ValueError("Audio too large for synchronous transcription; upload to GCS and use longrunning_recognize")
 
+        check(cancel)
+
         # Build STT request
+        from google.cloud import speech_v2
         recognizer_path = f"projects/{PROJECT_ID}/locations/global/recognizers/_"
         config = speech_v2.RecognitionConfig(
             # Given we provide WAV PCM, auto-detect is still safe; the API will adapt.
@@ -198,12 +250,14 @@ class SpeechService:
             content=wav_bytes,
         )
 
-        try:
-            stt_resp = stt_client.recognize(request=req)
-        except Exception as e:
-            logger.exception("STT API error")
-            # include a short, helpful message
-            raise RuntimeError(f"Speech-to-text request failed: {e}")
+        with turn_executor.stage("stt", cancel):
+            try:
+                stt_resp = clients.stt.get().recognize(request=req)
+            except Exception as e:
+                logger.exception("STT API error")
+                # include a short, helpful message
+                raise RuntimeError(f"Speech-to-text request failed: {e}")
+        check(cancel)
 
         if not stt_resp.results:
             raise ValueError("No speech detected (STT returned no results)")
@@ -213,10 +267,15 @@ class SpeechService:
         return transcript
 
     @staticmethod
-    def synthesize_speech(text: str, voice_name: str = VOICE_NAME, max_attempts: int = 3) -> str:
+    def synthesize_speech(text: str, voice_name: Optional[str] = None, max_attempts: int = 3, cancel=None,
+                          audio_format: Optional[str] = None) -> str:
         """
-        Synthesize text -> base64 MP3 data URI.
+        Synthesize text -> base64 data URI (Ogg Opus or MP3).
+        ``audio_format`` defaults to what the requesting browser advertised, else TTS_AUDIO_FORMAT.
         Retries a few times with fallback voice options.
+        Results are cached per (voice, format, text).
+        Raises Cancelled if ``cancel`` is set; fallback voices are not tried after that.
+        Raises Saturated if no "tts" bulkhead slot frees up in time (cache hits skip the bulkhead).
         """
         text = (text or "").strip()
         if not text:
@@ -225,13 +284,37 @@ class SpeechService:
         if len(text) > 3000:
             text = text[:3000]
 
+        voice_name = voice_name or settings.VOICE_NAME
+        audio_format = audio_format or request_audio_format() or settings.TTS_AUDIO_FORMAT
+        if audio_format not in AUDIO_FORMATS:
+            audio_format = "mp3"
+        cache_key = (voice_name, audio_format, text)
+        with _tts_cache_lock:
+            cached = _tts_cache.get(cache_key)
+            if cached is not None:
+                _tts_cache.move_to_end(cache_key)
+                return cached
+
+        check(cancel)
+
+        if settings.SPEECH_PROVIDER == "local":
+            with turn_executor.stage("tts", cancel):
+                uri = local_speech.synthesize(text)
+            _cache_put(cache_key, uri)
+            check(cancel)
+            return uri
+
         # Google TTS only
+        from google.cloud import texttospeech
+        tts_client = clients.tts.get()
 
+        encoding, mime, sample_rate = AUDIO_FORMATS[audio_format]
         input_text = texttospeech.SynthesisInput(text=text)
         audio_conf = texttospeech.AudioConfig(
-            audio_encoding=texttospeech.AudioEncoding.MP3,
+            audio_encoding=getattr(texttospeech.AudioEncoding, encoding),
             speaking_rate=1.0,
             pitch=0.0,
+            **({"sample_rate_hertz": sample_rate} if sample_rate else {}),
         )
 
         candidates = [
@@ -243,30 +326,39 @@ class SpeechService:
         for n in studio_names[:5]:
             candidates.append({"language_code": LANG_TTS, "name": n})
 
-        last_err = None
-        attempts = 0
-        for c in candidates:
-            attempts += 1
-            try:
-                voice = texttospeech.VoiceSelectionParams(
-                    language_code=c["language_code"], name=c["name"]
-                ) if c["name"] else texttospeech.VoiceSelectionParams(language_code=c["language_code"])
-                resp = tts_client.synthesize_speech(input=input_text, voice=voice, audio_config=audio_conf)
-                audio_content = getattr(resp, "audio_content", b"") or b""
-                if audio_content:
-                    b64 = base64.b64encode(audio_content).decode("utf-8")
-                    return f"data:audio/mp3;base64,{b64}"
-            except Exception as e:
-                last_err = e
-                if attempts < max_attempts:
-                    continue
+        # One slot covers the voice fallbacks: they are retries of the same stage
+        with turn_executor.stage("tts", cancel):
+            last_err = None
+            attempts = 0
+            for c in candidates:
+                check(cancel)
+                attempts += 1
+                try:
+                    voice = texttospeech.VoiceSelectionParams(
+                        language_code=c["language_code"], name=c["name"]
+                    ) if c["name"] else texttospeech.VoiceSelectionParams(language_code=c["language_code"])
+                    resp = tts_client.synthesize_speech(input=input_text, voice=voice, audio_config=audio_conf)
+                    audio_content = getattr(resp, "audio_content", b"") or b""
+                    if audio_content:
+                        b64 = base64.b64encode(audio_content).decode("utf-8")
+                        uri = f"data:{mime};base64,{b64}"
+                        _cache_put(cache_key, uri)
+                        # Audio stays cached for the next turn, but a superseded turn doesn't get it
+                        check(cancel)
+                        return uri
+                except Exception as e:
+                    last_err = e
+                    if attempts < max_attempts:
+                        continue
 
         raise RuntimeError(f"TTS produced no audio after tries. last_err={last_err}")
 
     @staticmethod
     def list_studio_voice_names() -> List[str]:
+        if settings.SPEECH_PROVIDER == "local":
+            return []
         try:
-            resp = tts_client.list_voices()
+            resp = clients.tts.get().list_voices()
             names = []
             for v in getattr(resp, "voices", []) or []:
                 name = getattr(v, "name", "") or ""
@@ -0,0 +1,148 @@
+"""Fingerprinted, precompressed static assets, built once at startup.
+
+JS/CSS/JSON files get content-hashed URLs under /assets/ that are cached as
+immutable; pages keep their URLs but are served with rewritten references
+and revalidate with an ETag. Each asset is gzipped (and brotli-compressed
+when the optional ``brotli`` package is installed) ahead of time.
+"""
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+import time
+from typing import Dict, Optional
+
+from flask import Response, request
+
+try:
+    import brotli  # optional: gzip only without it
+except ImportError:
+    brotli = None
+
+ASSET_PREFIX = "/assets/"
+FINGERPRINT_DIRS = ("css", "js")
+FINGERPRINT_FILES = ("job_categories.json",)
+MIN_COMPRESS_BYTES = 512
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+# Quoted absolute references such as "/js/app.js" or '/job_categories.json'
+_REF = re.compile(r"""(["'])(/[\w./-]+\.(?:js|css|json))\1""")
+
+
+class Asset:
+    __slots__ = ("url", "mimetype", "etag", "cache_control", "variants")
+
+    def __init__(self, url: str, data: bytes, mimetype: str, cache_control: str):
+        self.url = url
+        self.mimetype = mimetype
+        self.etag = hashlib.sha256(data).hexdigest()[:16]
+        self.cache_control = cache_control
+        self.variants = {"identity": data}
+        if len(data) >= MIN_COMPRESS_BYTES:
+            gz = gzip.compress(data, compresslevel=9, mtime=0)
+            if len(gz) < len(data):
+                self.variants["gzip"] = gz
+            if brotli is not None:
+                br = brotli.compress(data, quality=11)
+                if len(br) < len(gz):
+                    self.variants["br"] = br
+
+
+class StaticAssets:
+    """Content-hashed URLs, precompressed variants and conditional responses for static/."""
+
+    def __init__(self, static_dir: str):
+        self.static_dir = static_dir
+        self.urls: Dict[str, str] = {}      # "/js/app.js" -> "/assets/js/app.<hash>.js"
+        self.assets: Dict[str, Asset] = {}  # "/assets/js/app.<hash>.js" or "home.html" -> Asset
+        self.build_ms = None
+
+    def _sources(self):
+        """Leaf files first so scripts that reference them are hashed after rewriting."""
+        yield from FINGERPRINT_FILES
+        for ext in (".css", ".js"):
+            for d in FINGERPRINT_DIRS:
+                folder = os.path.join(self.static_dir, d)
+                if os.path.isdir(folder):
+                    yield from (f"{d}/{n}" for n in sorted(os.listdir(folder)) if n.endswith(ext))
+
+    def _read(self, rel: str) -> Optional[bytes]:
+        try:
+            with open(os.path.join(self.static_dir, rel), "rb") as f:
+                return f.read()
+        except OSError:
+            return None
+
+    @staticmethod
+    def rewrite(data: bytes, urls: Dict[str, str]) -> bytes:
+        """Point quoted /js, /css and JSON references at their fingerprinted URLs."""
+        text = data.decode("utf-8")
+        return _REF.sub(lambda m: f"{m.group(1)}{urls.get(m.group(2), m.group(2))}{m.group(1)}",
+                        text).encode("utf-8")
+
+    def build(self):
+        """Hash and compress every asset, then the pages that reference them."""
+        t0 = time.time()
+        urls, assets = {}, {}
+        for rel in self._sources():
+            data = self._read(rel)
+            if data is None:
+                continue
+            if rel.endswith(".js"):
+                data = self.rewrite(data, urls)
+            stem, ext = os.path.splitext(rel)
+            url = f"{ASSET_PREFIX}{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+            mimetype = mimetypes.guess_type(rel)[0] or "application/octet-stream"
+            urls["/" + rel] = url
+            assets[url] = Asset(url, data, mimetype, IMMUTABLE)
+        for name in sorted(os.listdir(self.static_dir)):
+            if name.endswith(".html"):
+                data = self.rewrite(self._read(name) or b"", urls)
+                assets[name] = Asset("/" + name, data, "text/html; charset=utf-8", REVALIDATE)
+        self.urls, self.assets = urls, assets
+        self.build_ms = int((time.time() - t0) * 1000)
+        compressed = sum(1 for a in assets.values() if len(a.variants) > 1)
+        print(f"[ASSETS] {len(assets)} assets ({compressed} precompressed"
+              f"{', brotli' if brotli is not None else ''}) in {self.build_ms} ms")
+
+    def export(self, out_dir: str):
+        """Write fingerprinted files plus .gz/.br siblings so a proxy/CDN can serve them without Python."""
+        suffix = {"gzip": ".gz", "br": ".br", "identity": ""}
+        for asset in self.assets.values():
+            rel = asset.url.lstrip("/")
+            path = os.path.join(out_dir, *rel.split("/"))
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            for enc, data in asset.variants.items():
+                with open(path + suffix[enc], "wb") as f:
+                    f.write(data)
+        print(f"[ASSETS] exported to {out_dir}")
+
+    @staticmethod
+    def _encoding(asset: Asset) -> str:
+        accepted = request.accept_encodings
+        for enc in ("br", "gzip"):
+            if enc in asset.variants and accepted[enc] > 0:
+                return enc
+        return "identity"
+
+    def respond(self, key: str) -> Optional[Response]:
+        """Response for an asset URL or page name; None if unknown. 304 when the ETag matches."""
+        asset = self.assets.get(key)
+        if asset is None:
+            return None
+        if request.if_none_match.contains_weak(asset.etag):
+            resp = Response(status=304)
+        else:
+            enc = self._encoding(asset)
+            resp = Response(asset.variants[enc], mimetype=asset.mimetype)
+            if enc != "identity":
+                resp.headers["Content-Encoding"] = enc
+        resp.set_etag(asset.etag, weak=True)
+        resp.headers["Cache-Control"] = asset.cache_control
+        resp.headers["Vary"] = "Accept-Encoding"
+        return resp
+
+
+assets = StaticAssets(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "static"))
@@ -0,0 +1,213 @@
+"""Token estimation, per-call prompt budgets and usage accounting."""
+import threading
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from config.settings import TOKEN_BUDGETS
+
+MAX_SESSIONS = 50
+TRIM_MARKER = "[... trimmed for length ...]"
+MIN_PARTIAL_TOKENS = 8  # room below this isn't worth a partial line
+
+
+def _parse_budgets(spec: str) -> dict:
+    budgets = {}
+    for part in (spec or "").split(","):
+        if "=" in part:
+            key, n = part.split("=", 1)
+            try:
+                budgets[key.strip()] = int(n)
+            except ValueError:
+                pass
+    return budgets
+
+
+BUDGETS = _parse_budgets(TOKEN_BUDGETS)
+
+
+def budget_for(call_class: str) -> int:
+    """Prompt token budget for a call class (0 = unlimited)."""
+    return BUDGETS.get(call_class, 0)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap local estimate: ~4 chars/token, floored by ~1.3 tokens/word for short-word text."""
+    if not text:
+        return 0
+    return max((len(text) + 3) // 4, int(len(text.split()) * 1.3))
+
+
+class Section:
+    """One named part of a prompt.
+
+    ``priority``: higher survives longer. ``trim``: "keep" (never touched),
+    "drop" (all or nothing), "head"/"tail" (keep the first/last lines).
+    ``header`` stays with the section unless the whole section is dropped.
+    """
+
+    __slots__ = ("name", "text", "priority", "trim", "header")
+
+    def __init__(self, name: str, text: str, priority: int = 0, trim: str = "drop", header: str = ""):
+        self.name = name
+        self.text = text or ""
+        self.priority = priority
+        self.trim = trim
+        self.header = header
+
+    def render(self) -> str:
+        if not self.text:
+            return ""
+        return f"{self.header}\n{self.text}" if self.header else self.text
+
+
+def _cut_chars(line: str, room: int, keep: str) -> str:
+    """Longest head/tail of one line whose estimate fits ``room``, cut at a word boundary when possible."""
+    n = min(len(line), room * 4)
+    while n > 0:
+        part = line[:n] if keep == "head" else line[len(line) - n:]
+        if n < len(line) and " " in part.strip():
+            part = part.rsplit(" ", 1)[0] if keep == "head" else part.split(" ", 1)[1]
+        if estimate_tokens(part) <= room:
+            return part
+        n -= max(1, n // 10)
+    return ""
+
+
+def _cut_lines(text: str, target: int, keep: str) -> str:
+    """Drop whole lines from the far end until the estimate fits ``target``; the first line
+    that doesn't fit is cut by characters, so one long paragraph isn't lost outright."""
+    lines = text.split("\n")
+    order = lines if keep == "head" else list(reversed(lines))
+    kept, used = [], estimate_tokens(TRIM_MARKER)
+    for line in order:
+        cost = estimate_tokens(line) + 1
+        if used + cost > target:
+            part = _cut_chars(line, target - used - 1, keep) if target - used > MIN_PARTIAL_TOKENS else ""
+            if part:
+                kept.append(part)
+            break
+        kept.append(line)
+        used += cost
+    if not kept:
+        return ""
+    if keep == "head":
+        return "\n".join(kept + [TRIM_MARKER])
+    return "\n".join([TRIM_MARKER] + list(reversed(kept)))
+
+
+def fit(sections: List[Section], budget: int) -> Tuple[str, dict]:
+    """Join sections, trimming the lowest-priority ones until the estimate fits ``budget``.
+    Returns (prompt, report) with report = {"est", "budget", "trimmed": [names]}.
+    """
+    costs = [estimate_tokens(s.render()) for s in sections]
+    total = sum(costs)
+    trimmed = []
+    if budget and total > budget:
+        for i in sorted(range(len(sections)), key=lambda i: sections[i].priority):
+            s = sections[i]
+            if total <= budget:
+                break
+            if s.trim == "keep" or not s.text:
+                continue
+            overflow = total - budget
+            if s.trim == "drop" or costs[i] <= overflow:
+                s.text = ""
+            else:
+                s.text = _cut_lines(s.text, costs[i] - overflow - estimate_tokens(s.header), s.trim)
+            new_cost = estimate_tokens(s.render())
+            total -= costs[i] - new_cost
+            costs[i] = new_cost
+            trimmed.append(s.name)
+    prompt = "\n".join(r for r in (s.render() for s in sections) if r)
+    return prompt, {"est": total, "budget": budget, "trimmed": trimmed}
+
+
+def build_prompt(sections: List[Section], call_class: str, reserve: int = 0) -> str:
+    """fit() against the call class budget, logging and counting any trimming.
+    ``reserve`` keeps room for text the caller adds around the result.
+    """
+    budget = budget_for(call_class)
+    prompt, report = fit(sections, max(1, budget - reserve) if budget else 0)
+    if report["trimmed"]:
+        print(f"[TOKENS] {call_class}: trimmed {', '.join(report['trimmed'])} to ~{report['est']}/{report['budget']}")
+    ledger.note_fit(call_class, report)
+    return prompt
+
+
+def _usage_counts(resp) -> Tuple[Optional[int], Optional[int]]:
+    """(prompt_tokens, output_tokens) from the provider's usage_metadata, if present."""
+    um = getattr(resp, "usage_metadata", None)
+    if um is None:
+        return None, None
+    return getattr(um, "prompt_token_count", None), getattr(um, "candidates_token_count", None)
+
+
+def _current_route(call_class: str) -> str:
+    try:
+        from flask import has_request_context, request
+        if has_request_context():
+            return request.path
+    except ImportError:
+        pass
+    return f"background:{call_class}"
+
+
+def _current_session() -> Optional[str]:
+    from models.interview_state import interview_state
+    return interview_state.session_id
+
+
+def _bucket() -> dict:
+    return {"calls": 0, "prompt_est": 0, "prompt_tokens": 0, "output_tokens": 0, "over_budget": 0, "trimmed": 0}
+
+
+class TokenLedger:
+    """Running token totals per session and per route (provider counts plus local estimates)."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.sessions = OrderedDict()
+        self.routes = {}
+
+    def _buckets(self, call_class: str):
+        """Session and route buckets for the current call (caller holds the lock)."""
+        session = _current_session()
+        if session not in self.sessions:
+            self.sessions[session] = _bucket()
+            while len(self.sessions) > MAX_SESSIONS:
+                self.sessions.popitem(last=False)
+        return self.sessions[session], self.routes.setdefault(_current_route(call_class), _bucket())
+
+    def record(self, call_class: str, prompt: str, resp=None):
+        """One provider call: local estimate of the prompt plus the provider's usage counts."""
+        est = estimate_tokens(prompt)
+        prompt_tokens, output_tokens = _usage_counts(resp)
+        with self._lock:
+            for b in self._buckets(call_class):
+                b["calls"] += 1
+                b["prompt_est"] += est
+                b["prompt_tokens"] += prompt_tokens or 0
+                b["output_tokens"] += output_tokens or 0
+
+    def note_fit(self, call_class: str, report: dict):
+        """Count a prompt that had to be trimmed (or still exceeds its budget)."""
+        if not report["trimmed"] and not (report["budget"] and report["est"] > report["budget"]):
+            return
+        with self._lock:
+            for b in self._buckets(call_class):
+                b["trimmed"] += 1 if report["trimmed"] else 0
+                b["over_budget"] += 1 if report["budget"] and report["est"] > report["budget"] else 0
+
+    def snapshot(self) -> dict:
+        session = _current_session()
+        with self._lock:
+            return {
+                "session_id": session,
+                "session": dict(self.sessions.get(session) or _bucket()),
+                "sessions": {k: dict(v) for k, v in self.sessions.items()},
+                "routes": {k: dict(v) for k, v in self.routes.items()},
+                "budgets": dict(BUDGETS),
+            }
+
+
+ledger = TokenLedger()
@@ -0,0 +1,263 @@
+"""Append-only per-session transcript journal for crash recovery.
+
+Each session gets ``<session_id>.jsonl`` (one event per line) and
+``<session_id>.idx``, a packed array of (offset, length) pairs, one per
+event, so the last event or the Nth one can be read without scanning the
+file. Callers only enqueue; a single writer thread appends and fsyncs in
+batches at most every JOURNAL_FSYNC_MS, so the response path never waits on disk.
+A session's files are deleted once its "end" record (feedback saved) is
+written; prune() clears abandoned ones past the recovery window at startup.
+"""
+import json
+import os
+import queue
+import struct
+import threading
+import time
+from typing import List, Optional
+
+from config.settings import JOURNAL_DIR, JOURNAL_FSYNC_MS
+
+_INDEX_ENTRY = struct.Struct("<QI")  # byte offset, length
+
+
+class _Session:
+    __slots__ = ("log", "index", "dirty")
+
+    def __init__(self, path: str):
+        for suffix in (".jsonl", ".idx"):
+            open(path + suffix, "ab").close()
+        self.log = open(path + ".jsonl", "r+b")
+        self.index = open(path + ".idx", "r+b")
+        self.dirty = False
+        self._repair()
+
+    def _repair(self):
+        """Cut a torn tail left by a crash so new entries stay aligned with the log."""
+        log_size = os.fstat(self.log.fileno()).st_size
+        raw = self.index.read()
+        n, end = 0, 0
+        for offset, length in _INDEX_ENTRY.iter_unpack(raw[:len(raw) - len(raw) % _INDEX_ENTRY.size]):
+            if offset != end or length == 0 or offset + length > log_size:
+                break
+            n, end = n + 1, offset + length
+        self.index.truncate(n * _INDEX_ENTRY.size)
+        self.log.truncate(end)
+        self.index.seek(0, os.SEEK_END)
+        self.log.seek(0, os.SEEK_END)
+
+    def sync(self):
+        for f in (self.log, self.index):
+            f.flush()
+            os.fsync(f.fileno())
+        self.dirty = False
+
+    def close(self):
+        self.log.close()
+        self.index.close()
+
+
+class TranscriptJournal:
+    """Background-written event log per interview session; see the module docstring for the format."""
+
+    def __init__(self, directory: str, fsync_ms: float):
+        self.directory = directory
+        self.interval = max(0.0, fsync_ms / 1000.0)
+        self._queue = queue.Queue()
+        self._open = {}  # session_id -> _Session (writer thread only)
+        self._thread = None
+        self._lock = threading.Lock()
+
+    # ---- write side ----
+    def start(self):
+        with self._lock:
+            if self._thread is None:
+                os.makedirs(self.directory, exist_ok=True)
+                self._thread = threading.Thread(target=self._writer, name="journal-writer", daemon=True)
+                self._thread.start()
+
+    def record(self, session_id: str, kind: str, fields: dict):
+        """Enqueue one event; never blocks on I/O."""
+        if self._thread is not None and session_id:
+            self._queue.put((session_id, {"t": kind, "ts": round(time.time(), 3), **fields}))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Block until everything enqueued so far is on disk (shutdown, tests)."""
+        if self._thread is None:
+            return True
+        done = threading.Event()
+        self._queue.put((None, done))
+        return done.wait(timeout)
+
+    def _path(self, session_id: str) -> str:
+        return os.path.join(self.directory, session_id)
+
+    def _append(self, session_id: str, event: dict):
+        s = self._open.get(session_id)
+        if s is None:
+            if event["t"] == "session":
+                # One live interview at a time: settle and close the previous session's files
+                for old in self._open.values():
+                    old.sync()
+                    old.close()
+                self._open.clear()
+            s = self._open[session_id] = _Session(self._path(session_id))
+        line = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+        offset = s.log.tell()
+        s.log.write(line)
+        s.index.write(_INDEX_ENTRY.pack(offset, len(line)))
+        s.dirty = True
+        if event["t"] == "end":
+            # Feedback is saved and the session can't be resumed any more: nothing left to recover
+            s.close()
+            del self._open[session_id]
+            self._remove(session_id)
+
+    def _remove(self, session_id: str):
+        for suffix in (".jsonl", ".idx"):
+            try:
+                os.remove(self._path(session_id) + suffix)
+            except FileNotFoundError:
+                pass
+
+    def _sync_dirty(self):
+        for s in self._open.values():
+            if s.dirty:
+                s.sync()
+
+    def _writer(self):
+        last_sync = time.time()
+        waiters = []
+        while True:
+            dirty = any(s.dirty for s in self._open.values())
+            timeout = max(0.0, last_sync + self.interval - time.time()) if dirty else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            while item is not None:
+                session_id, event = item
+                if session_id is None:
+                    waiters.append(event)
+                else:
+                    try:
+                        self._append(session_id, event)
+                    except OSError as e:
+                        print("[JOURNAL] write error:", e)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    item = None
+            if waiters or time.time() - last_sync >= self.interval:
+                try:
+                    self._sync_dirty()
+                except OSError as e:
+                    print("[JOURNAL] fsync error:", e)
+                last_sync = time.time()
+                for w in waiters:
+                    w.set()
+                waiters = []
+
+    def prune(self, max_age_sec: float) -> int:
+        """Delete sessions that ended or were last written more than ``max_age_sec`` ago; call before start()."""
+        try:
+            names = {n.rsplit(".", 1)[0] for n in os.listdir(self.directory) if n.endswith((".jsonl", ".idx"))}
+        except OSError:
+            return 0
+        now = time.time()
+        removed = 0
+        for sid in names:
+            try:
+                mtime = max(os.path.getmtime(self._path(sid) + suffix) for suffix in (".jsonl", ".idx")
+                            if os.path.exists(self._path(sid) + suffix))
+            except (OSError, ValueError):
+                continue
+            last = self.last_event(sid)
+            if now - mtime > max_age_sec or (last is not None and last.get("t") == "end"):
+                try:
+                    self._remove(sid)
+                    removed += 1
+                except OSError as e:
+                    print("[JOURNAL] prune error:", e)
+        return removed
+
+    # ---- read side ----
+    def _index(self, session_id: str) -> List[tuple]:
+        try:
+            with open(self._path(session_id) + ".idx", "rb") as f:
+                raw = f.read()
+        except OSError:
+            return []
+        usable = len(raw) - len(raw) % _INDEX_ENTRY.size  # a torn trailing entry is ignored
+        return [_INDEX_ENTRY.unpack_from(raw, i) for i in range(0, usable, _INDEX_ENTRY.size)]
+
+    def events(self, session_id: str, start: int = 0) -> List[dict]:
+        """Events from the ``start``-th on, stopping at the first torn or unindexed write."""
+        out = []
+        try:
+            with open(self._path(session_id) + ".jsonl", "rb") as f:
+                for offset, length in self._index(session_id)[start:]:
+                    f.seek(offset)
+                    line = f.read(length)
+                    if len(line) < length:
+                        break
+                    try:
+                        out.append(json.loads(line))
+                    except ValueError:
+                        break
+        except OSError:
+            pass
+        return out
+
+    def last_event(self, session_id: str) -> Optional[dict]:
+        """Last readable event; a torn final write falls back to the one before it."""
+        for i in range(len(self._index(session_id)) - 1, -1, -1):
+            events = self.events(session_id, i)
+            if events:
+                return events[-1]
+        return None
+
+    def in_flight(self, max_age_sec: float) -> List[str]:
+        """Sessions whose journal doesn't end with "end", newest first, touched within ``max_age_sec``."""
+        try:
+            names = [n[:-4] for n in os.listdir(self.directory) if n.endswith(".idx")]
+        except OSError:
+            return []
+        now = time.time()
+        found = []
+        for sid in names:
+            try:
+                mtime = os.path.getmtime(self._path(sid) + ".jsonl")
+            except OSError:
+                continue
+            last = self.last_event(sid)
+            if last is not None and last.get("t") != "end" and now - mtime <= max_age_sec:
+                found.append((mtime, sid))
+        return [sid for _, sid in sorted(found, reverse=True)]
+
+    def replay(self, session_id: str) -> Optional[dict]:
+        """Fold a session's events into {"session", "turns", "timer", "finished", "last_ts"}."""
+        state = {"session": None, "turns": [], "timer": None, "finished": False, "last_ts": None}
+        for e in self.events(session_id):
+            kind = e.get("t")
+            if kind == "session":
+                state.update(session=e, turns=[], timer=None, finished=False)
+            elif kind == "turn":
+                state["turns"].append(e.get("turn") or {})
+            elif kind == "drop":
+                idx = e.get("index", len(state["turns"]) - 1)
+                if 0 <= idx < len(state["turns"]):
+                    del state["turns"][idx]
+            elif kind == "edit":
+                idx = e.get("index", -1)
+                if 0 <= idx < len(state["turns"]):
+                    state["turns"][idx] = e.get("turn") or {}
+            elif kind == "timer":
+                state["timer"] = e
+            elif kind == "finished":
+                state["finished"] = True
+            state["last_ts"] = e.get("ts")
+        return state if state["session"] is not None else None
+
+
+transcript_journal = TranscriptJournal(JOURNAL_DIR, JOURNAL_FSYNC_MS)
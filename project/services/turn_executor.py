@@ -0,0 +1,173 @@
+"""Per-provider bulkheads and admission control for interview turns.
+
+A turn runs in stages (stt -> llm -> tts); each provider call takes a slot
+in its stage's bulkhead, so a slow provider ties up at most that stage's
+workers and the other stages keep serving. Background model calls
+(feedback sections, answer assessments) run in their own "llm_batch"
+bulkhead, so a feedback burst never queues ahead of a live turn and is not
+counted when turns are admitted. Before a turn starts, the
+estimated queueing delay across its stages decides whether to take it or to
+tell the client when to come back.
+"""
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Optional
+
+from config.settings import (
+    ADMISSION_CONTROL, STAGE_WORKERS, STAGE_QUEUE_MAX, STAGE_MAX_WAIT_MS, ADMISSION_MAX_WAIT_MS,
+)
+from utils.cancellation import check
+
+DEFAULT_SERVICE_MS = 1000.0  # assumed per-call time until a stage has measured one
+EWMA_ALPHA = 0.2
+
+TURN_STAGES = ("stt", "llm", "tts")
+QUESTION_STAGES = ("llm", "tts")
+BATCH_STAGE = "llm_batch"
+BATCH_CALL_CLASSES = frozenset({"feedback", "assessment"})
+
+
+class Saturated(Exception):
+    """A stage can't take the call in time; ``wait_ms`` is the estimated delay before it could."""
+
+    def __init__(self, stage: str, wait_ms: float):
+        super().__init__(f"{stage} saturated (~{int(wait_ms)} ms wait)")
+        self.stage = stage
+        self.wait_ms = wait_ms
+
+
+class Bulkhead:
+    """At most ``workers`` concurrent calls for one provider stage and at most ``queue_max`` waiting."""
+
+    def __init__(self, name: str, workers: int, queue_max: int):
+        self.name = name
+        self.workers = max(1, workers)
+        self.queue_max = max(0, queue_max)
+        self.active = 0
+        self.waiting = 0
+        self.service_ms = None  # EWMA of slot hold time
+        self._since = []  # start times of the calls holding a slot
+        self.completed = 0
+        self.rejected = 0
+        self._cond = threading.Condition()
+
+    def _wait_ms(self) -> float:
+        # Callers ahead of a new arrival, drained ``workers`` at a time
+        ahead = self.active + self.waiting - self.workers + 1
+        if ahead <= 0:
+            return 0.0
+        service_ms = self.service_ms
+        if service_ms is None:
+            # Nothing measured yet: the oldest call in flight has taken at least this long
+            oldest = min(self._since, default=None)
+            service_ms = max(DEFAULT_SERVICE_MS, (time.monotonic() - oldest) * 1000.0 if oldest else 0.0)
+        return ahead / self.workers * service_ms
+
+    def estimate(self) -> dict:
+        with self._cond:
+            return {"wait_ms": self._wait_ms(), "full": self.active >= self.workers and self.waiting >= self.queue_max}
+
+    @contextmanager
+    def slot(self, cancel=None, max_wait_ms: float = STAGE_MAX_WAIT_MS):
+        """Hold a worker slot for the body; raises Saturated when the queue is full or the wait runs out."""
+        with self._cond:
+            if self.active >= self.workers and self.waiting >= self.queue_max:
+                self.rejected += 1
+                raise Saturated(self.name, self._wait_ms())
+            deadline = time.monotonic() + max_wait_ms / 1000.0
+            self.waiting += 1
+            try:
+                while self.active >= self.workers:
+                    check(cancel)
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.rejected += 1
+                        raise Saturated(self.name, self._wait_ms())
+                    self._cond.wait(min(remaining, 0.1))  # short waits so a cancelled turn leaves promptly
+            finally:
+                self.waiting -= 1
+            self.active += 1
+            t0 = time.monotonic()
+            self._since.append(t0)
+        try:
+            yield
+        finally:
+            ms = (time.monotonic() - t0) * 1000.0
+            with self._cond:
+                self._since.remove(t0)
+                self.active -= 1
+                self.completed += 1
+                self.service_ms = ms if self.service_ms is None else EWMA_ALPHA * ms + (1 - EWMA_ALPHA) * self.service_ms
+                self._cond.notify()
+
+    def status(self) -> dict:
+        with self._cond:
+            return {"workers": self.workers, "active": self.active, "waiting": self.waiting,
+                    "queue_max": self.queue_max, "service_ms": round(self.service_ms or 0),
+                    "wait_ms": round(self._wait_ms()), "completed": self.completed, "rejected": self.rejected}
+
+
+def _parse_workers(spec: str) -> dict:
+    """'stt=8,llm=8,tts=8,llm_batch=8' -> {"stt": 8, ...}; stages not listed get 8."""
+    workers = {name: 8 for name in TURN_STAGES + (BATCH_STAGE,)}
+    for part in spec.split(","):
+        name, _, n = part.partition("=")
+        if name.strip() in workers and n.strip().isdigit():
+            workers[name.strip()] = int(n)
+    return workers
+
+
+class TurnExecutor:
+    """One bulkhead per provider stage plus the admission check in front of them."""
+
+    def __init__(self, workers: dict, queue_max: int, enabled: bool = True):
+        self.enabled = enabled
+        self.stages = {name: Bulkhead(name, n, queue_max) for name, n in workers.items()}
+        self.refused = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def llm_stage(call_class: str) -> str:
+        """Bulkhead for a model call: background classes get their own, live turns share "llm"."""
+        return BATCH_STAGE if call_class in BATCH_CALL_CLASSES else "llm"
+
+    def stage(self, name: str, cancel=None, max_wait_ms: Optional[float] = None):
+        """Context manager for one provider call in stage ``name``; waits up to ``max_wait_ms``
+        (default STAGE_MAX_WAIT_MS) for a slot.
+        """
+        if not self.enabled:
+            return nullcontext()
+        return self.stages[name].slot(cancel, STAGE_MAX_WAIT_MS if max_wait_ms is None else max_wait_ms)
+
+    def admit(self, stages=TURN_STAGES) -> Optional[dict]:
+        """None if a turn through ``stages`` can start now, else the queued-state payload for the client."""
+        if not self.enabled:
+            return None
+        estimates = {name: self.stages[name].estimate() for name in stages}
+        wait_ms = sum(e["wait_ms"] for e in estimates.values())
+        full = [name for name, e in estimates.items() if e["full"]]
+        if not full and wait_ms <= ADMISSION_MAX_WAIT_MS:
+            return None
+        bottleneck = full[0] if full else max(estimates, key=lambda n: estimates[n]["wait_ms"])
+        with self._lock:
+            self.refused += 1
+        return self.queued(bottleneck, wait_ms)
+
+    @staticmethod
+    def queued(stage: str, wait_ms: float) -> dict:
+        """Client payload: retry no sooner than ``retry_after_ms``."""
+        return {"ok": False, "stage": "queued", "queued": True, "bottleneck": stage,
+                "retry_after_ms": int(max(500, min(wait_ms, 30000)))}
+
+    @staticmethod
+    def retry_after_header(payload: dict) -> str:
+        return str(math.ceil(payload["retry_after_ms"] / 1000.0))
+
+    def status(self) -> dict:
+        return {"enabled": self.enabled, "refused_turns": self.refused,
+                "max_wait_ms": ADMISSION_MAX_WAIT_MS, "stages": {n: b.status() for n, b in self.stages.items()}}
+
+
+turn_executor = TurnExecutor(_parse_workers(STAGE_WORKERS), STAGE_QUEUE_MAX, ADMISSION_CONTROL == "1")
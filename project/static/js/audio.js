@@ -9,6 +9,18 @@ let vadActive = false;
 let vadProcessor = null;
 let vadInterval = null;
 
+// Tell the server which TTS encodings this browser plays (Opus is several times smaller than MP3).
+// A cookie rides along with every fetch, so no call site has to add a header.
+(function advertiseAudioFormats() {
+    const probe = document.createElement('audio');
+    const accept = [];
+    if (probe.canPlayType('audio/ogg; codecs="opus"')) accept.push('audio/ogg;codecs=opus');
+    if (probe.canPlayType('audio/mpeg')) accept.push('audio/mpeg;q=0.8');
+    if (accept.length) {
+        document.cookie = 'audio_accept=' + encodeURIComponent(accept.join(', ')) + '; path=/; SameSite=Lax';
+    }
+})();
+
 // Audio manager functions matching original app.js
 const AudioManager = {
     isPlaying: false,
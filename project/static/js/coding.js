@@ -22,6 +22,16 @@ document.addEventListener('DOMContentLoaded', function() {
     // Initialize coding panel
     initializeCodingPanel();
 
+    // Sandboxed run finished after /api/submit_code returned (relayed by interview_ws.js)
+    window.addEventListener('code_eval_result', (e) => {
+        const execution = e.detail.execution || {};
+        if (!execution.ran) return;
+        const msg = ('total' in execution)
+            ? `Your code ran: ${execution.passed}/${execution.total} tests passed.`
+            : 'Your code ran.';
+        showNotification(msg, 'info');
+    });
+
     function initializeCodingPanel() {
         console.log('Initializing coding panel...');
 
@@ -204,7 +214,8 @@ document.addEventListener('DOMContentLoaded', function() {
                 },
                 body: JSON.stringify({
                     code: code,
-                    lang: 'text' // Could be enhanced to detect language
+                    lang: 'text', // Could be enhanced to detect language
+                    client_id: window.INTERVIEW_CLIENT_ID // sandboxed run result arrives over Socket.IO
                 })
             });
 
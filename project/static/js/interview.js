@@ -168,6 +168,7 @@ document.addEventListener('DOMContentLoaded', function() {
                 // Set context directly using stored document content
                 const resumeText = docs.resume ? docs.resume.content : '';
                 const jobText = docs.job ? docs.job.content : '';
+                const storedSettings = JSON.parse(localStorage.getItem('interviewSettings') || '{}');
 
                 // Use the set_context API to directly set the interview context
                 const contextResponse = await fetch('/api/set_context', {
@@ -177,7 +178,8 @@ document.addEventListener('DOMContentLoaded', function() {
                     },
                     body: JSON.stringify({
                         resume: resumeText,
-                        job: jobText
+                        job: jobText,
+                        role: storedSettings.role || ''
                     })
                 });
 
@@ -303,16 +305,34 @@ document.addEventListener('DOMContentLoaded', function() {
         timeRemaining.textContent = `${minutes.toString().padStart(2, '0')}:${seconds.toString().padStart(2, '0')}`;
     }
 
+    // Under load the server refuses a turn before starting it (503, queued) and says when to retry.
+    // Resend once after that delay, plus jitter so refused clients don't come back in lockstep.
+    const MAX_QUEUED_RETRIES = 5;
+
+    function queuedDelay(data) {
+        const base = Math.max(500, data.retry_after_ms || 1000);
+        return base + Math.random() * base * 0.25;
+    }
+
+    async function waitQueued(data) {
+        const delay = queuedDelay(data);
+        console.log('Server busy (' + data.bottleneck + '), retrying in', Math.round(delay), 'ms');
+        statusText.textContent = `Server busy, retrying in ${Math.ceil(delay / 1000)}s…`;
+        await new Promise(r => setTimeout(r, delay));
+    }
+
     async function getNextQuestion() {
         try {
             statusText.textContent = 'AI thinking...';
 
-            const response = await fetch('/api/next_question', {
-                method: 'POST'
-            });
+            const data = await getNextQuestionData();
+            if (data.queued) {
+                statusText.textContent = 'Server busy, please wait a moment';
+                return;
+            }
 
-            if (response.ok) {
-                const data = await response.json();
+            if (data.ok) {
+                if (data.cancelled) return; // superseded by a newer turn
                 currentQuestion = data.question;
 
                 // Show sound visualization and update status
@@ -416,8 +436,12 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     async function getNextQuestionData() {
-        const response = await fetch('/api/next_question', { method: 'POST' });
-        return response.json();
+        for (let attempt = 0; ; attempt++) {
+            const response = await fetch('/api/next_question', { method: 'POST' });
+            const data = await response.json();
+            if (!data.queued || attempt >= MAX_QUEUED_RETRIES) return data;
+            await waitQueued(data);
+        }
     }
 
     async function listenTurn() {
@@ -518,8 +542,31 @@ document.addEventListener('DOMContentLoaded', function() {
             console.log('Processing user response...');
             statusText.textContent = 'AI thinking…';
 
-            // Send audio to backend for processing
-            const data = await submitVoiceTurn(audioBlob);
+            // Send audio to backend for processing (a filler clip may play meanwhile)
+            window.awaitingVoiceReply = true;
+            let data;
+            try {
+                data = await submitVoiceTurn(audioBlob);
+                // Refused before the turn started: the same recording is still the answer
+                for (let attempt = 0; data.queued && attempt < MAX_QUEUED_RETRIES; attempt++) {
+                    await waitQueued(data);
+                    data = await submitVoiceTurn(audioBlob);
+                }
+            } finally {
+                window.awaitingVoiceReply = false;
+            }
+
+            // A newer turn (or finish) superseded this one; its reply was dropped server-side
+            if (data.cancelled) {
+                console.log('Voice turn superseded:', data.reason);
+                return;
+            }
+
+            if (data.queued) {
+                statusText.textContent = 'Server busy, please answer again';
+                if (!AudioManager.isPlaying) setTimeout(listenTurn, 2000);
+                return;
+            }
 
             if (!data.ok) {
                 console.error('Voice turn failed:', data.error);
@@ -544,6 +591,11 @@ document.addEventListener('DOMContentLoaded', function() {
                 currentQuestion = data.assistant_text;
             }
 
+            // Let a filler clip finish rather than cutting it off mid-word
+            while (data.assistant_audio && AudioManager.isPlaying) {
+                await new Promise(r => setTimeout(r, 50));
+            }
+
             if (data.assistant_audio && !AudioManager.isPlaying) {
                 showSoundVisualization();
                 statusText.textContent = 'AI speaking…';
@@ -573,6 +625,7 @@ document.addEventListener('DOMContentLoaded', function() {
         const ext = (audioBlob.type || '').split('/')[1] || 'webm';
         const safeExt = ext.split(';')[0];
         formData.append('audio', audioBlob, 'turn.' + safeExt);
+        if (window.INTERVIEW_CLIENT_ID) formData.append('client_id', window.INTERVIEW_CLIENT_ID);
 
         console.log('📡 Sending voice turn request to backend...');
         try {
@@ -582,6 +635,11 @@ document.addEventListener('DOMContentLoaded', function() {
             });
             console.log('📡 Voice turn response status:', response.status);
 
+            if (response.status === 503) {
+                const busy = await response.clone().json().catch(() => ({}));
+                if (busy.queued) return busy;
+            }
+
             if (!response.ok) {
                 const errorText = await response.text();
                 console.error('Voice turn request failed:', response.status, errorText);
@@ -602,6 +660,9 @@ document.addEventListener('DOMContentLoaded', function() {
             clearInterval(timerInterval);
         }
 
+        // Abort any in-flight turn on the server
+        fetch('/api/finish', { method: 'POST', keepalive: true }).catch(() => {});
+
         // Stop camera
         if (interviewVideo.srcObject) {
             const tracks = interviewVideo.srcObject.getTracks();
@@ -4,6 +4,11 @@ let isRecording = false;
 let mediaRecorder = null;
 let audioChunks = [];
 
+// Per-tab id: the server addresses filler clips to this Socket.IO room
+window.INTERVIEW_CLIENT_ID = window.INTERVIEW_CLIENT_ID ||
+    ((window.crypto && crypto.randomUUID) ? crypto.randomUUID() : String(Date.now()) + Math.random().toString(16).slice(2));
+window.awaitingVoiceReply = false;
+
 document.addEventListener('DOMContentLoaded', function() {
     initializeWebSocket();
 });
@@ -14,6 +19,20 @@ function initializeWebSocket() {
 
     socket.on('connect', function() {
         console.log('Connected to server via Socket.IO');
+        socket.emit('join', { room: window.INTERVIEW_CLIENT_ID });
+    });
+
+    // Short acknowledgement while the real reply is still computing
+    socket.on('filler_audio', function(data) {
+        if (!window.awaitingVoiceReply || !data.audio || AudioManager.isPlaying) return;
+        console.log('Filler:', data.text);
+        AudioManager.playAudio(data.audio).catch(e => console.log('Filler playback failed:', e));
+    });
+
+    // Result of a code submission's sandboxed run; coding.js shows it
+    socket.on('code_eval_result', function(data) {
+        console.log('Code evaluation:', data.analysis);
+        window.dispatchEvent(new CustomEvent('code_eval_result', { detail: data }));
     });
 
     socket.on('disconnect', function() {
@@ -54,6 +54,12 @@ document.addEventListener('DOMContentLoaded', function() {
         return out.join('\n');
     }
 
+    // Structured sections from /api/feedback -> "- bullet" lines for renderSection
+    function bulletLines(section, ...keys) {
+        if (!section) return '';
+        return keys.flatMap(k => section[k] || []).map(b => `- ${b}`).join('\n');
+    }
+
     function renderSection(elId, content) {
         const el = document.getElementById(elId);
         const html = (content || '').trim() ? content.split('\n').map(line => {
@@ -80,10 +86,12 @@ document.addEventListener('DOMContentLoaded', function() {
 
             renderSummaryText(data.feedback || '');
 
-            const strengths = extractSection(data.feedback, 'Strengths');
-            const improvements = extractSection(data.feedback, 'Areas for Improvement');
-            const questions = extractSection(data.feedback, 'Question Analysis');
-            const coding = extractSection(data.feedback, 'Coding Assessment');
+            const sections = data.sections || {};
+            const hasSections = Object.keys(sections).length > 0;
+            const strengths = hasSections ? bulletLines(sections.strengths, 'positives') : extractSection(data.feedback, 'Strengths');
+            const improvements = hasSections ? bulletLines(sections.improvement, 'improvements') : extractSection(data.feedback, 'Areas for Improvement');
+            const questions = hasSections ? bulletLines(sections.follow_ups, 'bullets') : extractSection(data.feedback, 'Question Analysis');
+            const coding = hasSections ? bulletLines(sections.technical, 'positives', 'improvements') : extractSection(data.feedback, 'Coding Assessment');
             renderSection('strengthsContent', strengths);
             renderSection('improvementsContent', improvements);
             renderSection('questionsContent', questions);
@@ -169,6 +169,9 @@ document.addEventListener('DOMContentLoaded', function() {
             if (selectedJob) {
                 formData.append('job', selectedJob);
             }
+            if (jobRole.value) {
+                formData.append('role', jobRole.value);
+            }
 
             // Only upload if we have documents
             if (selectedResume || selectedJob) {
@@ -0,0 +1,56 @@
+"""Skill matching must not treat ordinary English words as skills."""
+from services.coverage_service import CoverageTracker, extract_skill_vocabulary
+
+PROSE_JD = ("We want people who express ideas clearly, go the extra mile and excel at communication. "
+            "Spring hiring; swift responses; rest of the team is remote; security-minded; testing assumptions.")
+
+
+def _tracker(resume="", job=""):
+    return CoverageTracker.build(resume, job)
+
+
+def test_prose_words_are_not_skills():
+    vocab = extract_skill_vocabulary("", PROSE_JD)
+    for word in ("go", "express", "excel", "spring", "swift", "rest", "security", "testing", "node", "ml", "js"):
+        assert word not in vocab
+
+
+def test_question_prose_matches_no_topics():
+    t = _tracker("Skills: Go, REST, Express, Spring, Excel", "Backend engineer")
+    assert t.topics_in("Can you go into more detail about the rest of your design?") == []
+    assert t.topics_in("How would you express that, and do you excel under a spring deadline?") == []
+
+
+def test_distinctive_forms_still_match():
+    t = _tracker("Built REST APIs in Golang and Express.js; Spring Boot services; reports in Microsoft Excel.", "")
+    assert t.topics_in("Tell me about your Golang and RESTful API work") == ["golang", "rest api"]
+    assert "spring boot" in t.vocabulary and "express.js" in t.vocabulary and "ms excel" in t.vocabulary
+
+
+def test_skill_list_short_names_map_to_distinctive_forms():
+    vocab = extract_skill_vocabulary("Skills: Go, REST, Node, ML, Swift", "")
+    assert {"golang", "rest api", "node.js", "machine learning"} <= set(vocab)
+    assert "swift" not in vocab and "go" not in vocab
+
+
+def test_sync_counts_turn_appended_after_a_drop():
+    t = _tracker("Skills: Python, Docker, Kafka", "")
+    conv, probed = [], set()
+    conv.append({"role": "assistant", "text": "How do you use Docker?"})
+    t.sync(conv, probed)
+    conv.pop()
+    conv.append({"role": "assistant", "text": "How do you use Kafka?"})
+    t.sync(conv, probed)
+    assert t.asked == {"kafka": 1}
+    assert probed == {"kafka"}
+
+
+def test_sync_recounts_turn_edited_in_place():
+    t = _tracker("Skills: Python, Docker", "")
+    turn = {"role": "user", "text": "[Coding submission attached: pending]"}
+    conv, probed = [turn], set()
+    t.sync(conv, probed)
+    assert t.mentioned == {}
+    turn["text"] = "[Coding submission attached: uses Python]"
+    t.sync(conv, probed)
+    assert t.mentioned == {"python": 1}
@@ -0,0 +1,41 @@
+"""A report with failed sections must not be memoized."""
+import routes.interview_routes as routes
+
+
+class _Store:
+    def __init__(self):
+        self.cached = []
+
+    def cache_get(self, key):
+        return None
+
+    def save(self, text, **kwargs):
+        return 7
+
+    def cache_put(self, key, feedback_id, spoken_summary):
+        self.cached.append((key, feedback_id))
+
+
+def _report(sections):
+    return {"text": "report", "scores": {}, "sections": sections}
+
+
+def _payload(monkeypatch, sections):
+    store = _Store()
+    monkeypatch.setattr(routes, "feedback_store", store)
+    monkeypatch.setattr(routes.FeedbackService, "generate_report", staticmethod(lambda *a: _report(sections)))
+    monkeypatch.setattr(routes.AssessmentService, "collect", staticmethod(lambda *a: []))
+    monkeypatch.setattr(routes.SpeechService, "synthesize_speech", staticmethod(lambda *a, **k: None))
+    payload = routes._feedback_payload("k", [])
+    return payload, store
+
+
+def test_partial_report_is_not_cached(monkeypatch):
+    payload, store = _payload(monkeypatch, {"overview": {"bullets": ["Solid."]}, "technical": None})
+    assert payload["feedback_id"] == 7
+    assert store.cached == []
+
+
+def test_complete_report_is_cached(monkeypatch):
+    _, store = _payload(monkeypatch, {"overview": {"bullets": ["Solid."]}, "technical": {"rating": 7}})
+    assert store.cached == [("k", 7)]
@@ -0,0 +1,77 @@
+"""Section shape validation, rendering and assembly of partial reports."""
+import json
+
+from prompts.system_prompts import FEEDBACK_SECTIONS
+from services.feedback_service import MAX_BULLET_WORDS, FeedbackService
+
+SPECS = {s["key"]: s for s in FEEDBACK_SECTIONS}
+CONVERSATION = [{"role": "assistant", "text": "Tell me about Kafka?"},
+                {"role": "user", "text": "I ran a Kafka pipeline at 20k msgs/sec."}]
+
+
+def _validate(key, data):
+    return FeedbackService._validate_section(SPECS[key], data if isinstance(data, str) else json.dumps(data))
+
+
+def test_overall_rating_must_be_in_range():
+    assert _validate("overall", {"rating": 7.4, "rationale": "Solid."}) == {"rating": 7, "rationale": "Solid."}
+    assert _validate("overall", {"rating": "8"})["rating"] == 8
+    for bad in (0, 11, "high", None):
+        assert _validate("overall", {"rating": bad, "rationale": "x"}) is None
+
+
+def test_rated_section_rating_rules():
+    assert _validate("technical", {"positives": ["Knows Kafka."], "improvements": [], "rating": None}) is None
+    assert _validate("technical", {"positives": ["Knows Kafka."], "rating": 12}) is None
+    strengths = _validate("strengths", {"positives": ["Clear."], "improvements": [], "rating": None})
+    assert strengths == {"positives": ["Clear."], "improvements": [], "rating": None}
+    assert _validate("communication", {"positives": [], "improvements": [], "rating": 6}) is None
+
+
+def test_bullet_counts_are_bounded():
+    assert _validate("next_steps", {"bullets": ["a", "b"]}) is None  # min 3
+    out = _validate("next_steps", {"bullets": [f"step {i}" for i in range(10)]})
+    assert len(out["bullets"]) == SPECS["next_steps"]["max"]
+    assert _validate("overview", {"bullets": ["", "  "]}) is None
+
+
+def test_non_list_bullets_and_long_bullets():
+    assert _validate("overview", {"bullets": "Strong backend answers."}) == {"bullets": ["Strong backend answers."]}
+    long = _validate("overview", {"bullets": [" ".join(["word"] * 60)]})
+    assert len(long["bullets"][0].split()) == MAX_BULLET_WORDS
+
+
+def test_unparseable_output_is_rejected():
+    assert _validate("overview", "no json here") is None
+    assert _validate("overview", "[1, 2]") is None
+    assert _validate("overview", "```json\n{\"bullets\": [\"Fenced.\"]}\n```") == {"bullets": ["Fenced."]}
+
+
+def test_render_marks_missing_sections():
+    sections = {s["key"]: None for s in FEEDBACK_SECTIONS}
+    sections["overview"] = {"bullets": ["Good pace."]}
+    sections["strengths"] = {"positives": [], "improvements": ["Quantify impact."], "rating": None}
+    text = FeedbackService.render(sections)
+    assert text.startswith("AI Feedback")
+    assert "- Good pace." in text
+    assert "Not observed in transcript." in text
+    assert text.count("- Not available (generation failed).") == len(FEEDBACK_SECTIONS) - 2
+    for spec in FEEDBACK_SECTIONS:
+        assert spec["heading"] in text
+
+
+def test_generate_report_keeps_failed_sections_as_none(monkeypatch):
+    good = {"overview": {"bullets": ["Good."]}, "overall": {"rating": 6, "rationale": "Fair."}}
+    monkeypatch.setattr(FeedbackService, "_generate_section", staticmethod(lambda spec, ev: good.get(spec["key"])))
+    report = FeedbackService.generate_report(CONVERSATION, "")
+    assert set(report["sections"]) == set(SPECS)
+    assert report["sections"]["technical"] is None
+    assert report["scores"]["overall"] == 6 and report["scores"]["technical"] is None
+    assert not all(report["sections"].values())
+
+
+def test_generate_report_with_no_sections(monkeypatch):
+    monkeypatch.setattr(FeedbackService, "_generate_section", staticmethod(lambda spec, ev: None))
+    report = FeedbackService.generate_report(CONVERSATION, "")
+    assert report["sections"] == {} and report["text"].startswith("Failed to generate feedback")
+    assert FeedbackService.generate_report([], "")["sections"] == {}
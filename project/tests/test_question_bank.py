@@ -0,0 +1,35 @@
+"""Presynthesis warms only the session's questions, once per voice and format."""
+import threading
+
+from prompts.question_bank import SKILL_QUESTIONS
+from services import speech_service
+from services.question_bank import QuestionBank
+
+
+def test_static_questions_limited_to_session_skills():
+    qs = set(QuestionBank.static_questions(None, ["python", "figma"]))
+    assert set(SKILL_QUESTIONS["python"]) <= qs
+    others = {q for skill, group in SKILL_QUESTIONS.items() if skill != "python" for q in group}
+    assert not qs & others
+    assert set(SKILL_QUESTIONS["kafka"]) <= set(QuestionBank.static_questions())
+
+
+def test_concurrent_presynthesis_is_not_duplicated(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    rendered = []
+
+    def synth(text, voice_name=None, audio_format=None):
+        started.set()
+        release.wait(5)
+        rendered.append(text)
+        return "data:"
+
+    monkeypatch.setattr(speech_service.SpeechService, "synthesize_speech", staticmethod(synth))
+    first = threading.Thread(target=QuestionBank.presynthesize, args=(None, "v", "mp3", ["python"]))
+    first.start()
+    assert started.wait(5)
+    assert QuestionBank.presynthesize(None, "v", "mp3", ["kafka"]) == 0  # handed to the running pass
+    release.set()
+    first.join(5)
+    expected = QuestionBank.static_questions(None, ["python"]) + QuestionBank.static_questions(None, ["kafka"])
+    assert rendered == expected
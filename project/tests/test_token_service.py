@@ -0,0 +1,41 @@
+"""Prompt fitting keeps as much of each section as the budget allows."""
+from services.token_service import TRIM_MARKER, Section, _cut_lines, estimate_tokens, fit
+
+
+def test_under_budget_is_untouched():
+    prompt, report = fit([Section("a", "short text", header="A:")], 100)
+    assert prompt == "A:\nshort text"
+    assert report["trimmed"] == []
+
+
+def test_cut_lines_keeps_whole_lines_from_the_right_end():
+    text = "\n".join(f"line {i} " + "w " * 10 for i in range(20))
+    head = _cut_lines(text, 60, "head")
+    tail = _cut_lines(text, 60, "tail")
+    assert head.startswith("line 0 ") and head.endswith(TRIM_MARKER)
+    assert tail.startswith(TRIM_MARKER) and tail.endswith("line 19 " + "w " * 10)
+    assert estimate_tokens(head) <= 60 and estimate_tokens(tail) <= 60
+
+
+def test_single_long_line_is_cut_by_characters():
+    prompt, report = fit([Section("a", "x" * 4000, trim="tail")], 200)
+    assert report["trimmed"] == ["a"]
+    assert 150 < report["est"] <= 200
+    assert prompt.startswith(TRIM_MARKER) and prompt.endswith("x")
+
+
+def test_long_paragraph_is_cut_at_a_word_boundary():
+    words = [f"word{i}" for i in range(800)]
+    prompt, report = fit([Section("a", " ".join(words), trim="head")], 200)
+    assert report["est"] <= 200
+    body = prompt.split("\n")[0]
+    assert body.startswith("word0 word1") and body.split()[-1] in words
+
+
+def test_lowest_priority_goes_first_and_keep_is_kept():
+    sections = [Section("rubric", "r " * 50, trim="keep"),
+                Section("context", "c " * 400, priority=0, trim="drop"),
+                Section("transcript", "t " * 100, priority=1, trim="tail")]
+    prompt, report = fit(sections, 200)
+    assert report["trimmed"] == ["context"]
+    assert "c c" not in prompt and "r r" in prompt and "t t" in prompt
@@ -0,0 +1,35 @@
+"""Journal files only live as long as their session can still be resumed."""
+import os
+import time
+
+from services.transcript_journal import TranscriptJournal
+
+
+def _journal(tmp_path):
+    j = TranscriptJournal(str(tmp_path), fsync_ms=0)
+    j.start()
+    return j
+
+
+def test_end_record_deletes_session_files(tmp_path):
+    j = _journal(tmp_path)
+    j.record("s1", "session", {"resume": ""})
+    j.record("s1", "turn", {"turn": {"role": "assistant", "text": "Hi?"}})
+    assert j.flush()
+    assert sorted(os.listdir(tmp_path)) == ["s1.idx", "s1.jsonl"]
+    assert j.in_flight(3600) == ["s1"]
+    j.record("s1", "end", {"feedback_id": 1})
+    assert j.flush()
+    assert os.listdir(tmp_path) == []
+
+
+def test_prune_drops_stale_and_ended_sessions(tmp_path):
+    j = TranscriptJournal(str(tmp_path), fsync_ms=0)
+    for sid in ("old", "fresh"):
+        for suffix in (".jsonl", ".idx"):
+            (tmp_path / (sid + suffix)).write_bytes(b"")
+    stale = time.time() - 7200
+    for suffix in (".jsonl", ".idx"):
+        os.utime(tmp_path / ("old" + suffix), (stale, stale))
+    assert j.prune(3600) == 1
+    assert sorted(os.listdir(tmp_path)) == ["fresh.idx", "fresh.jsonl"]
@@ -0,0 +1,68 @@
+"""Background model calls must not queue behind, or ahead of, live turns."""
+import threading
+import time
+
+from services.turn_executor import TurnExecutor, Saturated, _parse_workers, TURN_STAGES
+
+
+def _executor(**workers):
+    return TurnExecutor(_parse_workers(",".join(f"{k}={v}" for k, v in workers.items())), queue_max=0)
+
+
+def test_batch_classes_get_their_own_stage():
+    assert TurnExecutor.llm_stage("feedback") == "llm_batch"
+    assert TurnExecutor.llm_stage("assessment") == "llm_batch"
+    for call_class in ("opening", "followup", "coding"):
+        assert TurnExecutor.llm_stage(call_class) == "llm"
+
+
+def test_parse_workers_defaults_and_batch():
+    assert _parse_workers("") == {"stt": 8, "llm": 8, "tts": 8, "llm_batch": 8}
+    assert _parse_workers("llm=2,llm_batch=1,bogus=3")["llm_batch"] == 1
+
+
+def test_busy_batch_stage_does_not_refuse_turns():
+    ex = _executor(llm=1, llm_batch=1)
+    entered, release = threading.Event(), threading.Event()
+
+    def _feedback_call():
+        with ex.stage(ex.llm_stage("feedback")):
+            entered.set()
+            release.wait(5)
+
+    t = threading.Thread(target=_feedback_call)
+    t.start()
+    try:
+        assert entered.wait(5)
+        assert ex.admit(TURN_STAGES) is None
+        with ex.stage(ex.llm_stage("followup")):
+            pass
+    finally:
+        release.set()
+        t.join()
+
+
+def test_unmeasured_wait_uses_age_of_calls_in_flight(monkeypatch):
+    import services.turn_executor as te
+    monkeypatch.setattr(te, "DEFAULT_SERVICE_MS", 0.0)
+    ex = _executor(llm_batch=1)
+    with ex.stage("llm_batch"):
+        time.sleep(0.2)
+        assert ex.stages["llm_batch"].estimate()["wait_ms"] >= 200
+
+
+def test_feedback_section_retries_when_batch_stage_is_full(monkeypatch):
+    from prompts.system_prompts import FEEDBACK_SECTIONS
+    from services import feedback_service
+    calls = []
+
+    def complete(*args, **kwargs):
+        calls.append(1)
+        if len(calls) == 1:
+            raise Saturated("llm_batch", 10)
+        return '{"bullets": ["Clear answers."]}'
+
+    monkeypatch.setattr(feedback_service.AIService, "complete", staticmethod(complete))
+    spec = next(s for s in FEEDBACK_SECTIONS if s["key"] == "overview")
+    assert feedback_service.FeedbackService._generate_section(spec, "evidence") == {"bullets": ["Clear answers."]}
+    assert len(calls) == 2
@@ -0,0 +1,45 @@
+"""Turn-scoped cancellation tokens."""
+import threading
+from typing import Optional
+
+
+class Cancelled(BaseException):
+    """Raised when a turn was superseded or the session ended.
+
+    A BaseException (like asyncio.CancelledError) so the many broad
+    ``except Exception`` fallbacks don't turn a cancelled turn into a reply.
+    """
+
+
+class CancelToken:
+    """Set once by whoever supersedes the turn; checked between provider calls."""
+
+    def __init__(self, session_id: Optional[str] = None, turn: int = 0):
+        self.session_id = session_id
+        self.turn = turn
+        self.reason = None
+        self._event = threading.Event()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = "cancelled"):
+        if not self._event.is_set():
+            self.reason = reason
+            self._event.set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise Cancelled(self.reason)
+
+    def sleep(self, seconds: float):
+        """Backoff sleep that wakes (and raises) as soon as the token is cancelled."""
+        if self._event.wait(seconds):
+            raise Cancelled(self.reason)
+
+
+def check(token: Optional[CancelToken]):
+    """raise_if_cancelled() that tolerates callers without a token."""
+    if token is not None:
+        token.raise_if_cancelled()
@@ -0,0 +1,80 @@
+"""Small shared helpers."""
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+
+class SingleFlight:
+    """Collapse concurrent calls with the same key into one execution.
+
+    The first caller runs ``fn``; callers arriving while it is in flight
+    block on the same result instead of starting their own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn):
+        """Returns (result, shared) where ``shared`` is True for followers."""
+        with self._lock:
+            future = self._calls.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._calls[key] = future
+        if not leader:
+            return future.result(), True
+        try:
+            result = fn()
+            future.set_result(result)
+            return result, False
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+class RateLimiter:
+    """Blocking sliding-window limiter: at most ``max_calls`` per ``period`` seconds."""
+
+    def __init__(self, max_calls: int, period: float = 60.0):
+        self.max_calls = max_calls
+        self.period = period
+        self._lock = threading.Lock()
+        self._calls = deque()
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._calls and now - self._calls[0] >= self.period:
+                    self._calls.popleft()
+                if len(self._calls) < self.max_calls:
+                    self._calls.append(now)
+                    return
+                wait = self.period - (now - self._calls[0])
+            time.sleep(wait)
+
+
+class UploadTooLarge(ValueError):
+    """An upload went over its size cap."""
+
+
+def read_bounded(stream, limit: int, chunk_size: int = 64 * 1024) -> bytes:
+    """Read ``stream`` to EOF in chunks; raise UploadTooLarge as soon as more than ``limit`` bytes arrive.
+    Memory stays under ~2x ``limit`` however large the body claims or turns out to be.
+    """
+    chunks, size = [], 0
+    while True:
+        chunk = stream.read(min(chunk_size, limit + 1 - size))
+        if not chunk:
+            break
+        size += len(chunk)
+        if size > limit:
+            raise UploadTooLarge(f"upload exceeds {limit} bytes")
+        chunks.append(chunk)
+    return chunks[0] if len(chunks) == 1 else b"".join(chunks)